@@ -0,0 +1,142 @@
+# benchmarks/bench_search.py
+"""
+Latence de la recherche d'objets par libellé, hors HTTP :
+- "memory" : index inversé en mémoire (SEARCH_BACKEND=memory) puis lecture des objets trouvés par clé primaire ;
+- "like" : parcours de la table avec LIKE '%mot%' classé par longueur du libellé (ce que ferait une recherche sans index) ;
+- "like_unranked" : même parcours sans classement, interrompu dès que la page est pleine ;
+- "database" : recherche plein texte de la base (SEARCH_BACKEND=database), PostgreSQL et MySQL uniquement.
+Le temps de construction de l'index au démarrage est aussi mesuré.
+
+Exemple (depuis la racine du dépôt) :
+    python -m benchmarks.bench_search --objets 100000 --repeat 50
+"""
+import argparse  # Options de la ligne de commande
+import json  # Écriture des résultats
+import random  # Requêtes tirées de façon reproductible
+import statistics  # Médiane des mesures
+import time  # Mesure des durées
+from pathlib import Path  # Fichier de résultats
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from src.indexes import ensure_search_indexes
+from src.models import Objet
+from src.repositories.objets_repository import get_objet_rows_by_ids, like_search, search_objet_rows
+from src.services.objets_services import OBJET_LIST_COLUMNS, build_objet_search_index
+from src.services.search_index import objet_search_index, tokenize
+from benchmarks.seed import LIBELLES, seed_database
+
+RESULTS_DIR = Path(__file__).parent / "results"  # Dossier par défaut des résultats
+SEARCH_LIMIT = 20  # Nombre de résultats demandés, comme GET /objets/search par défaut
+
+
+def build_queries(rng: random.Random, objets: int, count: int) -> list[str]:
+    """
+    Requêtes représentatives d'une saisie dans la boutique : début d'un mot, mot complet, mot + numéro.
+    :return: Liste de requêtes
+    """
+    queries = []
+    for i in range(count):
+        word = tokenize(rng.choice(LIBELLES))[0]
+        kind = i % 3
+        if kind == 0:
+            queries.append(word[:3])
+        elif kind == 1:
+            queries.append(word)
+        else:
+            queries.append(f"{word[:4]} {rng.randint(0, objets - 1)}")
+    return queries
+
+
+def memory(db: Session, query: str):
+    """Index en mémoire, puis une requête par clé primaire (comme `search_objets`)."""
+    codobjs = objet_search_index.search(query, SEARCH_LIMIT)
+    rows = get_objet_rows_by_ids(db, codobjs, columns=OBJET_LIST_COLUMNS)
+    return [rows[codobj] for codobj in codobjs if codobj in rows]
+
+
+def like(db: Session, query: str):
+    """Parcours LIKE de la table, un motif par mot, classé comme la recherche (libellés les plus courts d'abord)."""
+    stmt = like_search(select(*OBJET_LIST_COLUMNS), tokenize(query))
+    return db.execute(stmt.order_by(func.length(Objet.libobj), Objet.codobj).limit(SEARCH_LIMIT)).all()
+
+
+def like_unranked(db: Session, query: str):
+    """Parcours LIKE sans classement : s'arrête dès `SEARCH_LIMIT` lignes trouvées."""
+    stmt = like_search(select(*OBJET_LIST_COLUMNS), tokenize(query)).limit(SEARCH_LIMIT)
+    return db.execute(stmt).all()
+
+
+def database(db: Session, query: str):
+    """Recherche plein texte de la base."""
+    return search_objet_rows(db, tokenize(query), SEARCH_LIMIT, columns=OBJET_LIST_COLUMNS)
+
+
+def measure(engine, path, queries: list[str], repeat: int) -> dict:
+    """
+    Exécute chaque requête `repeat` fois.
+    :return: Latences en millisecondes (médiane, p95) et nombre moyen de résultats
+    """
+    durations, results = [], []
+    with Session(engine) as db:
+        for _ in range(repeat):
+            for query in queries:
+                start = time.perf_counter()
+                found = path(db, query)
+                durations.append(time.perf_counter() - start)
+                results.append(len(found))
+    durations.sort()
+    return {
+        "p50_ms": round(statistics.median(durations) * 1000, 3),
+        "p95_ms": round(durations[int(len(durations) * 0.95) - 1] * 1000, 3),
+        "mean_results": round(statistics.mean(results), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latence de la recherche d'objets par libellé.")
+    parser.add_argument("--database-url", default="sqlite:///benchmarks/bench.db")
+    parser.add_argument("--objets", type=int, default=100000, help="Nombre d'objets dans la base")
+    parser.add_argument("--queries", type=int, default=30, help="Nombre de requêtes différentes")
+    parser.add_argument("--repeat", type=int, default=20, help="Nombre de passages sur les requêtes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Fichier de résultats (par défaut benchmarks/results/search-<date>.json)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    seed_database(engine, args.objets, 0)
+    start = time.perf_counter()
+    with Session(engine) as db:
+        documents = build_objet_search_index(db)
+    build_s = time.perf_counter() - start
+    print(f"Index construit en {build_s:.2f} s ({documents} objets, {objet_search_index.stats()['words']} mots)")
+
+    paths = {"memory": memory, "like": like, "like_unranked": like_unranked}
+    if ensure_search_indexes(engine):
+        paths["database"] = database
+    queries = build_queries(random.Random(args.seed), args.objets, args.queries)
+    results = {name: measure(engine, path, queries, args.repeat) for name, path in paths.items()}
+    engine.dispose()
+
+    for name, stats in results.items():
+        print(f"{name:13} p50 {stats['p50_ms']:>9} ms  p95 {stats['p95_ms']:>9} ms  {stats['mean_results']:>5} résultats en moyenne")
+    print(f"Index en mémoire : x{results['like']['p50_ms'] / results['memory']['p50_ms']:.1f} par rapport au parcours LIKE")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "database": engine.dialect.name,
+            "objets": documents,
+            "queries": queries,
+            "repeat": args.repeat,
+            "index_build_s": round(build_s, 3),
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"search-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Résultats enregistrés dans {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_serialization.py
+"""
+Coût par ligne de la sérialisation d'une page d'objets, hors HTTP :
+- "standard" : objets ORM -> validation du response_model (from_attributes) -> dict -> json.dumps,
+  comme le fait FastAPI avec include=condit (relation `condit` chargée selon CONDIT_LOADING) ;
+- "standard_sans_condit" : même chemin, `condit` non chargée (coût Pydantic seul) ;
+- "fast" : colonnes lues en tuples puis encodées directement (SERIALIZATION=fast).
+
+Exemple (depuis la racine du dépôt) :
+    python -m benchmarks.bench_serialization --objets 100000 --rows 1000 --repeat 20
+"""
+import argparse  # Options de la ligne de commande
+import json  # Encodage du chemin standard (JSONResponse) et écriture des résultats
+import statistics  # Médiane des mesures
+import time  # Mesure des durées
+from pathlib import Path  # Fichier de résultats
+from pydantic import TypeAdapter  # Validation et sérialisation du response_model, comme FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, noload
+from src.models import Objet
+from src.repositories.objets_repository import _filter_objets, get_objet_rows_page, get_objets_page
+from src.schemas.objet import ObjetResponse
+from src.services.serialization import dumps, orjson
+from benchmarks.seed import seed_database
+
+RESULTS_DIR = Path(__file__).parent / "results"  # Dossier par défaut des résultats
+RESPONSE_ADAPTER = TypeAdapter(list[ObjetResponse])  # Équivalent du response_model=list[ObjetResponse]
+
+
+def standard(db: Session, rows: int, load_condit: bool = True):
+    """
+    Chemin standard : objets ORM puis response_model.
+    :return: Tuple (secondes de lecture, secondes de sérialisation)
+    """
+    start = time.perf_counter()
+    if load_condit:
+        objets, _ = get_objets_page(db, rows)
+    else:
+        objets = db.execute(_filter_objets(select(Objet).options(noload(Objet.condit)), None, None, None, None).limit(rows)).scalars().all()
+    fetched = time.perf_counter()
+    validated = RESPONSE_ADAPTER.validate_python(objets, from_attributes=True)
+    content = RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    return fetched - start, time.perf_counter() - fetched
+
+
+def fast(db: Session, rows: int):
+    """
+    Chemin rapide : colonnes en tuples encodées directement.
+    :return: Tuple (secondes de lecture, secondes de sérialisation)
+    """
+    start = time.perf_counter()
+    page, _ = get_objet_rows_page(db, rows)
+    fetched = time.perf_counter()
+    dumps(page)
+    return fetched - start, time.perf_counter() - fetched
+
+
+def measure(engine, path, rows: int, repeat: int) -> dict:
+    """
+    Exécute un chemin `repeat` fois, chaque fois dans une nouvelle session (carte d'identité vide).
+    :return: Médianes par ligne, en microsecondes
+    """
+    fetch_times, encode_times = [], []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            fetch_s, encode_s = path(db, rows)
+        fetch_times.append(fetch_s)
+        encode_times.append(encode_s)
+    fetch_us = statistics.median(fetch_times) / rows * 1e6
+    encode_us = statistics.median(encode_times) / rows * 1e6
+    return {
+        "fetch_us_per_row": round(fetch_us, 3),
+        "serialize_us_per_row": round(encode_us, 3),
+        "total_us_per_row": round(fetch_us + encode_us, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coût par ligne de la sérialisation des listes d'objets.")
+    parser.add_argument("--database-url", default="sqlite:///benchmarks/bench.db")
+    parser.add_argument("--objets", type=int, default=100000, help="Nombre d'objets dans la base")
+    parser.add_argument("--rows", type=int, default=1000, help="Taille de la page sérialisée")
+    parser.add_argument("--repeat", type=int, default=20, help="Nombre de mesures par chemin")
+    parser.add_argument("--output", type=Path, help="Fichier de résultats (par défaut benchmarks/results/serialization-<date>.json)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    seed_database(engine, args.objets, 0)
+    paths = {
+        "standard": standard,
+        "standard_sans_condit": lambda db, rows: standard(db, rows, load_condit=False),
+        "fast": fast,
+    }
+    results = {name: measure(engine, path, args.rows, args.repeat) for name, path in paths.items()}
+    engine.dispose()
+
+    for name, stats in results.items():
+        print(f"{name:22} lecture {stats['fetch_us_per_row']:>8} µs/ligne  sérialisation {stats['serialize_us_per_row']:>8} µs/ligne  "
+              f"total {stats['total_us_per_row']:>8} µs/ligne")
+    speedup = results["standard"]["total_us_per_row"] / results["fast"]["total_us_per_row"]
+    print(f"Chemin rapide : x{speedup:.1f} par rapport au chemin standard")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "database": engine.dialect.name,
+            "rows": args.rows,
+            "repeat": args.repeat,
+            "encoder": "orjson" if orjson is not None else "json",
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"serialization-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Résultats enregistrés dans {output}")
+
+
+if __name__ == "__main__":
+    main()
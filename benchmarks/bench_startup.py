@@ -0,0 +1,134 @@
+# benchmarks/bench_startup.py
+"""
+Temps de démarrage de l'application, mesuré dans un nouvel interpréteur Python à chaque essai :
+- "import" : importation de src.main (l'application n'est créée qu'au premier accès à `src.main.app`) ;
+- "startup" : création de l'application (routers), puis lifespan (instrumentation, migration si AUTO_MIGRATE,
+  lancement de l'index de recherche) ;
+- "first_request" : temps écoulé de l'importation de src.main jusqu'à la première réponse.
+Deux configurations sont comparées :
+- "lazy" : démarrage par défaut (pas de schéma au démarrage, index de recherche en arrière-plan) ;
+- "eager" : ancien démarrage (AUTO_MIGRATE=1 et index de recherche construit avant de servir).
+La base utilisée est celle de l'application (src.database) : elle doit déjà exister (`python -m src.migrate`).
+
+Exemples (depuis la racine du dépôt) :
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 20 --path /objets/1 --importtime
+"""
+import argparse  # Options de la ligne de commande
+import json  # Échange des mesures avec les sous-processus et écriture des résultats
+import os  # Variables d'environnement des sous-processus
+import statistics  # Médiane des mesures
+import subprocess  # Un interpréteur neuf par essai (démarrage à froid)
+import sys  # Interpréteur courant
+import time  # Horodatage des résultats
+from pathlib import Path  # Fichier de résultats
+
+RESULTS_DIR = Path(__file__).parent / "results"  # Dossier par défaut des résultats
+ROOT = Path(__file__).parent.parent  # Racine du dépôt (répertoire de travail des sous-processus)
+MODES = {"lazy": {}, "eager": {"AUTO_MIGRATE": "1"}}  # Variables d'environnement de chaque configuration
+
+# Script exécuté dans chaque sous-processus ; le client de test (outil de mesure) n'est pas compté
+PROBE = """
+import json, sys, time
+from fastapi.testclient import TestClient
+client_ready = time.perf_counter()
+import src.main
+imported = time.perf_counter()
+with TestClient(src.main.app) as client:
+    if sys.argv[2] == "eager":
+        from src.database import engine
+        src.main.warm_up_search_index(engine)  # Attend l'index, comme l'ancien démarrage
+    started = time.perf_counter()
+    status = client.get(sys.argv[1]).status_code
+    answered = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - client_ready,
+    "startup_s": started - imported,
+    "first_request_s": answered - client_ready,
+    "status": status,
+}))
+"""
+
+
+def probe(path: str, mode: str) -> dict:
+    """
+    Lance un interpréteur neuf et mesure son démarrage.
+    :param path: Route appelée en premier
+    :param mode: "lazy" ou "eager"
+    :return: Durées (secondes) et statut de la première réponse
+    """
+    env = {**os.environ, **MODES[mode]}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, path, mode], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def import_profile(top: int) -> list[tuple[str, float]]:
+    """
+    Modules les plus coûteux à importer (python -X importtime -c "import src.main").
+    :param top: Nombre de modules retenus
+    :return: Liste (module, durée cumulée en millisecondes), du plus lent au plus rapide
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda module: module[1], reverse=True)[:top]
+
+
+def summarize(samples: list[dict]) -> dict:
+    """
+    :param samples: Mesures de chaque essai
+    :return: Médiane et maximum de chaque durée, en millisecondes
+    """
+    return {
+        f"{key[:-2]}_{stat}_ms": round(function(sample[key] for sample in samples) * 1000, 1)
+        for key in ("import_s", "startup_s", "first_request_s")
+        for stat, function in (("p50", lambda values: statistics.median(list(values))), ("max", max))
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temps de démarrage de l'application.")
+    parser.add_argument("--runs", type=int, default=10, help="Nombre d'interpréteurs lancés par configuration")
+    parser.add_argument("--path", default="/objets/1", help="Route appelée en premier (ouvre une connexion à la base)")
+    parser.add_argument("--importtime", action="store_true", help="Afficher les modules les plus longs à importer")
+    parser.add_argument("--output", type=Path, help="Fichier de résultats (par défaut benchmarks/results/startup-<date>.json)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in MODES:
+        samples = [probe(args.path, mode) for _ in range(args.runs)]
+        results[mode] = {**summarize(samples), "status": samples[-1]["status"]}
+        stats = results[mode]
+        print(
+            f"{mode:6} import p50 {stats['import_p50_ms']:>8} ms  démarrage p50 {stats['startup_p50_ms']:>8} ms  "
+            f"première réponse p50 {stats['first_request_p50_ms']:>8} ms (max {stats['first_request_max_ms']} ms)"
+        )
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "runs": args.runs,
+            "path": args.path,
+        },
+        "results": results,
+    }
+    if args.importtime:
+        report["import_profile"] = import_profile(15)
+        for name, duration in report["import_profile"]:
+            print(f"{duration:>9.1f} ms  {name}")
+
+    output = args.output or RESULTS_DIR / f"startup-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Résultats enregistrés dans {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/loadgen.py
+import asyncio  # Requêtes concurrentes dans une seule boucle d'événements
+import time  # Mesure des latences
+import httpx  # Client HTTP asynchrone, branché directement sur l'application ASGI
+from src.services.metrics import registry  # Nombre de requêtes SQL par requête HTTP (MetricsMiddleware)
+
+
+class Scenario:
+    """
+    Scénario de charge : une route appelée un nombre donné de fois.
+    `build(i)` renvoie la i-ème requête sous la forme (méthode, url, arguments httpx).
+    `check(i, response)` permet de conserver une information de la réponse (ex. identifiant créé).
+    `prepare()` est appelée avant le scénario, hors mesure (ex. relire les identifiants créés).
+    """
+
+    def __init__(self, name: str, build, requests: int, expected: tuple = (200,), check=None, prepare=None):
+        """
+        :param name: Nom du scénario dans les résultats
+        :param build: Fonction i -> (méthode, url, kwargs)
+        :param requests: Nombre de requêtes envoyées
+        :param expected: Codes de statut considérés comme des succès
+        :param check: Fonction (i, réponse) appelée après chaque requête, optionnelle
+        :param prepare: Fonction sans argument appelée avant le scénario, optionnelle
+        """
+        self.name = name
+        self.build = build
+        self.requests = requests
+        self.expected = expected
+        self.check = check
+        self.prepare = prepare
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """
+    Percentile par la méthode du rang le plus proche.
+    :param sorted_values: Valeurs triées
+    :param p: Percentile voulu (entre 0 et 100)
+    :return: Valeur du percentile, 0 si la liste est vide
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def client_for(app) -> httpx.AsyncClient:
+    """
+    :param app: Application ASGI
+    :return: Client HTTP qui appelle l'application dans le processus, sans réseau
+    """
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, concurrency: int) -> dict:
+    """
+    Exécute un scénario avec `concurrency` requêtes en vol au maximum.
+    :param client: Client HTTP (voir `client_for`)
+    :param scenario: Scénario à exécuter
+    :param concurrency: Nombre de requêtes simultanées
+    :return: Statistiques du scénario (latences en millisecondes)
+    """
+    latencies = []
+    errors = {}  # code de statut inattendu -> nombre
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < scenario.requests:
+            i = next_index
+            next_index += 1
+            method, url, kwargs = scenario.build(i)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            await response.aread()  # Les réponses en streaming sont lues jusqu'au bout
+            latencies.append(time.perf_counter() - start)
+            if response.status_code not in scenario.expected:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+            elif scenario.check is not None:
+                scenario.check(i, response)
+
+    if scenario.prepare is not None:
+        scenario.prepare()
+    registry.reset()  # Le nombre de requêtes SQL est relevé sur ce seul scénario
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, scenario.requests)))))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "queries_per_request": round(registry.queries_per_request(), 2),
+    }
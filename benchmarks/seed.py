@@ -0,0 +1,89 @@
+# benchmarks/seed.py
+import random  # Valeurs générées de façon reproductible
+from datetime import date, timedelta  # Dates d'inscription des utilisateurs
+from sqlalchemy import func, insert, select  # Insertions en masse et comptages
+from src.models import Base, Objet, Utilisateur  # Tables remplies pour les benchmarks
+from src.indexes import ensure_indexes  # Index ajoutés au schéma (base de benchmark déjà créée)
+
+SEED_BATCH_SIZE = 10000  # Nombre de lignes par INSERT multi-lignes
+TAILLES = ("XS", "S", "M", "L", "XL", None)  # Valeurs possibles de tailleobj
+LIBELLES = ("Bougie", "Carte", "Chope", "Coffret", "Écharpe", "Mug", "Porte-clés", "Stylo", "Tasse", "Tee-shirt")
+
+
+def _objet_rows(start: int, count: int, rng: random.Random):
+    """
+    Génère les lignes d'objets à insérer.
+    :param start: Numéro de la première ligne
+    :param count: Nombre de lignes
+    :param rng: Générateur pseudo-aléatoire
+    :return: Liste de dictionnaires colonne -> valeur
+    """
+    return [
+        {
+            "libobj": f"{rng.choice(LIBELLES)} {i}",
+            "tailleobj": rng.choice(TAILLES),
+            "puobj": round(rng.uniform(0.5, 200.0), 2),
+            "poidsobj": round(rng.uniform(0.01, 5.0), 3),
+            "indispobj": int(rng.random() < 0.1),
+            "o_imp": rng.randint(0, 1),
+            "o_aff": rng.randint(0, 1),
+            "o_cartp": rng.randint(0, 1),
+            "points": rng.randint(0, 500),
+            "o_ordre_aff": rng.randint(0, 100),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def _utilisateur_rows(start: int, count: int, rng: random.Random):
+    """
+    Génère les lignes d'utilisateurs à insérer (username unique).
+    :param start: Numéro de la première ligne
+    :param count: Nombre de lignes
+    :param rng: Générateur pseudo-aléatoire
+    :return: Liste de dictionnaires colonne -> valeur
+    """
+    first_day = date(2015, 1, 1)
+    return [
+        {
+            "nom_utilisateur": f"Nom{i}",
+            "prenom_utilisateur": f"Prenom{i}",
+            "username": f"user{i}",
+            "date_insc_utilisateur": first_day + timedelta(days=rng.randint(0, 3650)),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def _fill(engine, model, make_rows, total: int, rng: random.Random):
+    """
+    Complète une table jusqu'à `total` lignes, par lots de SEED_BATCH_SIZE.
+    :return: Nombre de lignes ajoutées
+    """
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(model)).scalar_one()
+        for start in range(existing, total, SEED_BATCH_SIZE):
+            conn.execute(insert(model), make_rows(start, min(SEED_BATCH_SIZE, total - start), rng))
+    return max(0, total - existing)
+
+
+def seed_database(engine, objets: int, utilisateurs: int, reset: bool = False, seed: int = 42) -> dict:
+    """
+    Crée les tables puis les remplit jusqu'aux volumes demandés.
+    Une base déjà remplie est réutilisée : seules les lignes manquantes sont ajoutées.
+    :param engine: Engine de la base de benchmark
+    :param objets: Nombre d'objets voulus
+    :param utilisateurs: Nombre d'utilisateurs voulus
+    :param reset: Supprime et recrée les tables avant de les remplir
+    :param seed: Graine du générateur (données reproductibles d'une exécution à l'autre)
+    :return: Nombre de lignes ajoutées par table
+    """
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    rng = random.Random(seed)
+    return {
+        "objets": _fill(engine, Objet, _objet_rows, objets, rng),
+        "utilisateurs": _fill(engine, Utilisateur, _utilisateur_rows, utilisateurs, rng),
+    }
@@ -0,0 +1,169 @@
+# config.py
+import os  # Lecture de la configuration depuis les variables d'environnement
+from functools import lru_cache  # La configuration n'est lue qu'une seule fois
+from pydantic import BaseModel
+
+
+# Configuration de l'application, lue depuis les variables d'environnement
+class Settings(BaseModel):
+    # db_mode: "sync" (Session et routes synchrones) ou "async" (AsyncSession et routes async)
+    db_mode: str = "sync"
+    # async_database_url: URL de connexion avec un pilote asynchrone (ex. postgresql+asyncpg://...)
+    # Si elle est absente, elle est déduite de l'URL de l'engine synchrone.
+    async_database_url: str | None = None
+    # Pool de connexions : connexions permanentes, connexions de débordement,
+    # recyclage (secondes), vérification avant emprunt et attente maximale (secondes).
+    # Appliqués par `pool_options()` à l'engine asynchrone et, via `create_pooled_engine` (database_engine.py),
+    # aux réplicas ; src/database.py doit créer l'engine principal avec `create_pooled_engine` pour en tenir compte
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_timeout: float = 30.0
+    # serialization: "standard" (response_model Pydantic) ou "fast" (colonnes lues en tuples,
+    # encodées directement en JSON par orjson, sans objets ORM ni validation Pydantic)
+    serialization: str = "standard"
+    # condit_loading: chargement anticipé de la relation Objet.condit, "selectin" (une requête IN
+    # supplémentaire par lot de 500 objets) ou "joined" (LEFT OUTER JOIN dans la même requête)
+    condit_loading: str = "selectin"
+    # search_backend: moteur de GET /objets/search, "memory" (index inversé en mémoire du processus,
+    # construit au démarrage) ou "database" (recherche plein texte de la base : PostgreSQL, MySQL)
+    search_backend: str = "memory"
+    # compression: encodages proposés pour compresser les réponses, par ordre de préférence
+    # ("zstd,br,gzip" ; br et zstd nécessitent les paquets brotli et zstandard, voir requirements-optional.txt), vide pour désactiver
+    compression: str = "zstd,br,gzip"
+    # compression_min_size: taille minimale (octets) d'une réponse pour être compressée
+    compression_min_size: int = 1024
+    # compression_cache_size: nombre de corps compressés conservés (réponses avec ETag)
+    compression_cache_size: int = 256
+    # auto_migrate: crée les tables et les index manquants au démarrage (lifespan), comme `python -m src.migrate` ;
+    # désactivé par défaut : le démarrage ne fait alors aucune requête de schéma
+    auto_migrate: bool = False
+    # Contrôle d'admission : limites de débit par client (clé d'API ou IP), à seaux de jetons.
+    # Deux budgets : "heavy" (listes, recherche, export) et "light" (une entité, écritures) ;
+    # débit en requêtes par seconde (0 : pas de limite) et capacité du seau (rafale autorisée)
+    rate_limit_heavy_rate: float = 0.0
+    rate_limit_heavy_burst: int = 10
+    rate_limit_light_rate: float = 0.0
+    rate_limit_light_burst: int = 50
+    # rate_limit_key_header: en-tête identifiant le client (authentifié en amont), vide pour compter par IP
+    rate_limit_key_header: str = "X-API-Key"
+    # rate_limit_backend: "memory" (seaux propres à chaque worker) ou "redis" (partagés entre les workers)
+    rate_limit_backend: str = "memory"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    # Plafonds de requêtes traitées en même temps par worker (0 : pas de plafond), toutes requêtes
+    # confondues et pour les seules requêtes "heavy", avec une file d'attente bornée (taille, attente en secondes)
+    max_concurrency: int = 0
+    max_heavy_concurrency: int = 0
+    admission_queue_size: int = 100
+    admission_queue_timeout: float = 2.0
+    # single_flight: les lectures identiques simultanées (même route, mêmes paramètres) partagent
+    # une seule requête SQL et une seule sérialisation
+    single_flight: bool = True
+    # Compteurs des objets (POST /objets/{codobj}/increment) : incréments cumulés en mémoire par objet,
+    # écrits en base par lots toutes les write_behind_interval secondes (0 : écriture immédiate, sans perte possible)
+    # ou dès que write_behind_max_pending objets sont en attente ; au-delà de write_behind_max_depth objets
+    # en attente (base indisponible), les incréments sont refusés (503)
+    write_behind_interval: float = 1.0
+    write_behind_max_pending: int = 1000
+    write_behind_max_depth: int = 100000
+    # Réplicas en lecture : URLs séparées par des virgules (vide : toutes les lectures sur la base principale).
+    # Les routes de lecture (listes, lecture par identifiant, recherche) y sont réparties selon replica_balancing,
+    # "round_robin" (chacun son tour) ou "least_busy" (le moins de sessions ouvertes) ; un réplica en échec
+    # est écarté jusqu'à ce que sa vérification (toutes les replica_health_interval secondes) réussisse à nouveau
+    database_replica_urls: list[str] = []
+    replica_balancing: str = "round_robin"
+    replica_health_interval: float = 5.0
+    # read_your_writes_seconds: après une écriture, les lectures du même client (clé d'API ou IP)
+    # sont servies par la base principale pendant ce délai (retard de réplication toléré)
+    read_your_writes_seconds: float = 5.0
+    # profiling_token: jeton à envoyer dans l'en-tête X-Profile pour profiler une requête (temps SQL, ORM,
+    # validation, sérialisation : en-tête Server-Timing et /profiles/{id}) ; vide : profilage désactivé
+    profiling_token: str = ""
+    # Journal des requêtes SQL lentes (toujours actif) : seuil en millisecondes (0 : désactivé),
+    # capture du plan d'exécution (EXPLAIN, requêtes SELECT) et nombre de requêtes lentes conservées
+    slow_query_ms: float = 200.0
+    slow_query_explain: bool = False
+    slow_query_log_size: int = 100
+    # Flux des modifications (GET /objets/changes, /utilisateurs/changes, SSE ou long-poll) : événements conservés
+    # pour la reprise après déconnexion, événements en attente au plus par abonné (au-delà, l'abonné trop lent
+    # est déconnecté et reprend au dernier numéro reçu), abonnés simultanés au plus par flux et par worker,
+    # et intervalle en secondes du battement de cœur des connexions SSE inactives
+    change_feed_history: int = 1000
+    change_feed_buffer: int = 100
+    change_feed_max_subscribers: int = 10000
+    change_feed_heartbeat: float = 15.0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Construit la configuration à partir des variables d'environnement.
+        :return: Instance de Settings
+        """
+        return cls(
+            db_mode=os.getenv("DB_MODE", "sync"),
+            async_database_url=os.getenv("ASYNC_DATABASE_URL"),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            serialization=os.getenv("SERIALIZATION", "standard"),
+            condit_loading=os.getenv("CONDIT_LOADING", "selectin"),
+            search_backend=os.getenv("SEARCH_BACKEND", "memory"),
+            compression=os.getenv("COMPRESSION", "zstd,br,gzip"),
+            compression_min_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+            compression_cache_size=int(os.getenv("COMPRESSION_CACHE_SIZE", "256")),
+            auto_migrate=os.getenv("AUTO_MIGRATE", "false").lower() in ("1", "true", "yes"),
+            rate_limit_heavy_rate=float(os.getenv("RATE_LIMIT_HEAVY_RATE", "0")),
+            rate_limit_heavy_burst=int(os.getenv("RATE_LIMIT_HEAVY_BURST", "10")),
+            rate_limit_light_rate=float(os.getenv("RATE_LIMIT_LIGHT_RATE", "0")),
+            rate_limit_light_burst=int(os.getenv("RATE_LIMIT_LIGHT_BURST", "50")),
+            rate_limit_key_header=os.getenv("RATE_LIMIT_KEY_HEADER", "X-API-Key"),
+            rate_limit_backend=os.getenv("RATE_LIMIT_BACKEND", "memory"),
+            rate_limit_redis_url=os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"),
+            max_concurrency=int(os.getenv("MAX_CONCURRENCY", "0")),
+            max_heavy_concurrency=int(os.getenv("MAX_HEAVY_CONCURRENCY", "0")),
+            admission_queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", "100")),
+            admission_queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2")),
+            single_flight=os.getenv("SINGLE_FLIGHT", "true").lower() in ("1", "true", "yes"),
+            write_behind_interval=float(os.getenv("WRITE_BEHIND_INTERVAL", "1")),
+            write_behind_max_pending=int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000")),
+            write_behind_max_depth=int(os.getenv("WRITE_BEHIND_MAX_DEPTH", "100000")),
+            database_replica_urls=[url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()],
+            replica_balancing=os.getenv("REPLICA_BALANCING", "round_robin"),
+            replica_health_interval=float(os.getenv("REPLICA_HEALTH_INTERVAL", "5")),
+            read_your_writes_seconds=float(os.getenv("READ_YOUR_WRITES_SECONDS", "5")),
+            profiling_token=os.getenv("PROFILING_TOKEN", ""),
+            slow_query_ms=float(os.getenv("SLOW_QUERY_MS", "200")),
+            slow_query_explain=os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() in ("1", "true", "yes"),
+            slow_query_log_size=int(os.getenv("SLOW_QUERY_LOG_SIZE", "100")),
+            change_feed_history=int(os.getenv("CHANGE_FEED_HISTORY", "1000")),
+            change_feed_buffer=int(os.getenv("CHANGE_FEED_BUFFER", "100")),
+            change_feed_max_subscribers=int(os.getenv("CHANGE_FEED_MAX_SUBSCRIBERS", "10000")),
+            change_feed_heartbeat=float(os.getenv("CHANGE_FEED_HEARTBEAT", "15")),
+        )
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    :return: La configuration de l'application
+    """
+    return Settings.from_env()
+
+
+def pool_options() -> dict:
+    """
+    Paramètres du pool à passer à `create_engine` / `create_async_engine`.
+    Utilisés par database_async.py et `create_pooled_engine` (database_engine.py).
+    :return: Dictionnaire des options du pool
+    """
+    settings = get_settings()
+    return {
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_recycle": settings.pool_recycle,
+        "pool_pre_ping": settings.pool_pre_ping,
+        "pool_timeout": settings.pool_timeout,
+    }
@@ -0,0 +1,62 @@
+# database_async.py
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # Outils SQLAlchemy asynchrones
+from src.config import get_settings, pool_options  # Configuration de l'application et du pool
+from src.services.pool_metrics import instrument_pool  # Instrumentation du pool de connexions
+
+# Pilotes asynchrones utilisés lorsque l'URL asynchrone est déduite de l'URL synchrone
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None  # Engine asynchrone (créé à la première utilisation)
+_async_session_factory = None  # Fabrique de sessions asynchrones
+
+
+def _async_url():
+    """
+    Retourne l'URL de connexion asynchrone : ASYNC_DATABASE_URL si elle est définie,
+    sinon l'URL de l'engine synchrone avec le pilote asynchrone correspondant.
+    :return: URL de connexion
+    """
+    settings = get_settings()
+    if settings.async_database_url:
+        return settings.async_database_url
+    from src.database import engine  # Import local : l'engine synchrone n'est utile que pour déduire l'URL
+    backend = engine.url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"Aucun pilote asynchrone connu pour '{backend}', définissez ASYNC_DATABASE_URL.")
+    return engine.url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def get_async_engine():
+    """
+    :return: L'engine asynchrone (AsyncEngine), créé à la première utilisation
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(_async_url(), **pool_options())
+        instrument_pool(_async_engine.sync_engine, name="async")  # Compteurs exposés sur /pool/stats
+        # expire_on_commit=False : les objets restent lisibles après le commit sans nouvelle requête
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    """
+    Ferme les connexions de l'engine asynchrone s'il a été créé (arrêt de l'application).
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
+
+
+async def get_async_db():
+    """
+    Dépendance FastAPI : fournit une AsyncSession par requête et la ferme à la fin.
+    """
+    get_async_engine()
+    async with _async_session_factory() as session:
+        yield session
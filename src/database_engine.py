@@ -0,0 +1,16 @@
+# database_engine.py
+from sqlalchemy import create_engine  # Engine synchrone
+from src.config import pool_options  # Options du pool (DB_POOL_SIZE, DB_MAX_OVERFLOW, ...)
+
+
+def create_pooled_engine(url, **options):
+    """
+    Crée un engine synchrone avec les options du pool de la configuration : DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE et DB_POOL_PRE_PING.
+    Utilisé pour les réplicas ; l'engine principal de src/database.py doit être créé de la même façon
+    (`engine = create_pooled_engine(DATABASE_URL)`) pour que ces variables s'y appliquent.
+    :param url: URL de connexion
+    :param options: Autres arguments de `create_engine` (prioritaires sur la configuration)
+    :return: Engine SQLAlchemy
+    """
+    return create_engine(url, **{**pool_options(), **options})
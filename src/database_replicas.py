@@ -0,0 +1,279 @@
+# database_replicas.py
+import itertools  # Répartition chacun son tour (round-robin)
+import threading  # Vérification des réplicas en arrière-plan, compteurs partagés entre threads
+import time  # Durée de l'épinglage sur la base principale
+from collections import OrderedDict  # Clients épinglés, les plus anciens oubliés en premier
+from fastapi import Depends, Request
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, sessionmaker
+from src.config import get_settings  # URLs des réplicas et répartition
+from src.database import get_db  # Session de la base principale (lectures sans réplica)
+from src.database_engine import create_pooled_engine  # Engine avec les options du pool de la configuration
+from src.services.admission import client_key  # Identification du client (clé d'API ou IP)
+from src.services.pool_metrics import instrument_pool  # Compteurs des pools exposés sur /pool/stats
+
+BALANCING = ("round_robin", "least_busy")
+MAX_PINNED_CLIENTS = 10000  # Clients épinglés conservés en mémoire
+
+
+class Replica:
+    """
+    Réplica en lecture : engine, fabrique de sessions, état de santé et compteurs.
+    """
+
+    def __init__(self, name: str, engine):
+        """
+        :param name: Nom du réplica (compteurs, /replicas/stats)
+        :param engine: Engine SQLAlchemy du réplica
+        """
+        self.name = name
+        self.engine = engine
+        self.session_factory = sessionmaker(bind=engine)
+        self.healthy = True  # Supposé disponible jusqu'au premier échec
+        self.in_use = 0  # Sessions ouvertes sur ce réplica
+        self.reads = 0  # Sessions servies
+        self.failures = 0  # Vérifications ou connexions en échec
+        self.last_error = None
+
+        # Une connexion perdue pendant une requête écarte le réplica sans attendre la prochaine vérification
+        @event.listens_for(engine, "handle_error")
+        def on_error(context):
+            if context.is_disconnect:
+                self.mark_down(context.original_exception)
+
+    def mark_down(self, error: BaseException):
+        """
+        Écarte le réplica jusqu'à la prochaine vérification réussie.
+        :param error: Erreur observée
+        """
+        self.healthy = False
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+
+    def stats(self) -> dict:
+        return {"healthy": int(self.healthy), "in_use": self.in_use, "reads": self.reads, "failures": self.failures}
+
+
+class ReplicaRouter:
+    """
+    Répartition des lectures entre les réplicas, avec cohérence « lire ses propres écritures » :
+    - les sessions de lecture (`get_read_db`) sont ouvertes sur un réplica disponible, choisi chacun son tour
+      ("round_robin") ou selon le moins de sessions ouvertes ("least_busy") ;
+    - après une écriture, le client est épinglé sur la base principale pendant `pin_seconds` secondes,
+      le temps que la réplication rattrape son retard ;
+    - sans réplica disponible, les lectures vont sur la base principale.
+    Les épinglages sont propres à chaque processus (worker) : derrière un répartiteur de charge sans affinité,
+    une lecture peut arriver sur un autre worker que l'écriture.
+    Les lectures faites sur un réplica ne sont ni mises en cache ni partagées avec celles de la base principale
+    (voir `replica_name`) : le cache ne contient que des données de la base principale, invalidées à chaque écriture,
+    et un client épinglé ne reçoit jamais une valeur lue sur un réplica en retard.
+    """
+
+    def __init__(self, replicas: list[Replica], balancing: str = "round_robin", pin_seconds: float = 5.0,
+                 clock=time.monotonic):
+        """
+        :param replicas: Réplicas en lecture
+        :param balancing: "round_robin" ou "least_busy"
+        :param pin_seconds: Durée de l'épinglage sur la base principale après une écriture
+        :param clock: Horloge en secondes (remplaçable dans les tests)
+        """
+        if balancing not in BALANCING:
+            raise ValueError(f"Répartition inconnue : {balancing} (attendu : {', '.join(BALANCING)})")
+        self.replicas = replicas
+        self.balancing = balancing
+        self.pin_seconds = pin_seconds
+        self.clock = clock
+        self._turn = itertools.count()
+        self._pins = OrderedDict()  # clé du client -> fin de l'épinglage
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self.primary_reads = 0  # Sessions de lecture ouvertes sur la base principale
+        self.pinned_reads = 0  # ... dont celles d'un client épinglé après une écriture
+
+    def pin(self, key: str):
+        """
+        Épingle un client sur la base principale (appelé après chacune de ses écritures).
+        :param key: Clé du client
+        """
+        with self._lock:
+            self._pins[key] = self.clock() + self.pin_seconds
+            self._pins.move_to_end(key)
+            while len(self._pins) > MAX_PINNED_CLIENTS:
+                self._pins.popitem(last=False)
+
+    def is_pinned(self, key: str) -> bool:
+        """
+        :param key: Clé du client
+        :return: True si le client a écrit il y a moins de `pin_seconds` secondes
+        """
+        with self._lock:
+            until = self._pins.get(key)
+            if until is None:
+                return False
+            if until <= self.clock():
+                del self._pins[key]
+                return False
+            return True
+
+    def acquire(self, key: str | None = None) -> Replica | None:
+        """
+        Choisit où ouvrir une session de lecture ; appeler `release` une fois la session fermée.
+        :param key: Clé du client (None : pas d'épinglage)
+        :return: Réplica choisi, ou None pour la base principale
+        """
+        if key is not None and self.is_pinned(key):
+            with self._lock:
+                self.primary_reads += 1
+                self.pinned_reads += 1
+            return None
+        with self._lock:
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            if not healthy:
+                self.primary_reads += 1
+                return None
+            start = next(self._turn) % len(healthy)
+            candidates = healthy[start:] + healthy[:start]  # Ex aequo départagés chacun son tour
+            replica = min(candidates, key=lambda r: r.in_use) if self.balancing == "least_busy" else candidates[0]
+            replica.in_use += 1
+            replica.reads += 1
+            return replica
+
+    def release(self, replica: Replica):
+        """
+        :param replica: Réplica renvoyé par `acquire`
+        """
+        with self._lock:
+            replica.in_use -= 1
+
+    def check_health(self):
+        """
+        Vérifie chaque réplica (SELECT 1) : un réplica en échec est écarté, un réplica rétabli est réintégré.
+        """
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as e:
+                replica.mark_down(e)
+            else:
+                replica.healthy = True
+
+    def start(self, interval: float):
+        """
+        Démarre la vérification périodique des réplicas (lifespan).
+        :param interval: Secondes entre deux vérifications (0 : pas de vérification périodique)
+        """
+        if not self.replicas or interval <= 0 or self._thread is not None:
+            return
+        self._stopping.clear()
+
+        def run():
+            while not self._stopping.wait(interval):
+                self.check_health()
+
+        self._thread = threading.Thread(target=run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Arrête la vérification périodique et ferme les connexions des réplicas (arrêt de l'application).
+        """
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    def stats(self) -> dict:
+        """
+        :return: Lectures sur la base principale et état de chaque réplica
+        """
+        with self._lock:
+            pinned_clients = len(self._pins)
+        return {
+            "balancing": self.balancing,
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "pinned_clients": pinned_clients,
+            "replicas": {replica.name: replica.stats() for replica in self.replicas},
+        }
+
+
+_replica_router = None  # Répartiteur des lectures (créé à la première utilisation)
+
+
+def create_replica(url: str, name: str) -> Replica:
+    """
+    Crée l'engine d'un réplica, avec les mêmes options de pool que la base principale.
+    :param url: URL de connexion du réplica
+    :param name: Nom du réplica
+    :return: Réplica
+    """
+    engine = create_pooled_engine(url)
+    instrument_pool(engine, name=name)  # Compteurs exposés sur /pool/stats
+    return Replica(name, engine)
+
+
+def get_replica_router() -> ReplicaRouter:
+    """
+    Construit (une seule fois) le répartiteur à partir de DATABASE_REPLICA_URLS.
+    :return: Répartiteur des lectures (sans réplica si aucune URL n'est configurée)
+    """
+    global _replica_router
+    if _replica_router is None:
+        settings = get_settings()
+        replicas = [create_replica(url, f"replica{i}") for i, url in enumerate(settings.database_replica_urls, 1)]
+        _replica_router = ReplicaRouter(replicas, settings.replica_balancing, settings.read_your_writes_seconds)
+    return _replica_router
+
+
+def set_replica_router(router: ReplicaRouter | None):
+    """
+    Remplace le répartiteur (par exemple par des réplicas SQLite dans les tests) ; None pour le reconstruire.
+    :param router: Nouvelle instance
+    """
+    global _replica_router
+    _replica_router = router
+
+
+def read_client_key(scope) -> str:
+    """
+    :param scope: Scope ASGI
+    :return: Clé du client pour l'épinglage (même identification que la limite de débit)
+    """
+    return client_key(scope, get_settings().rate_limit_key_header.lower() or None)
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Dépendance FastAPI des routes en lecture seule : session sur un réplica, ou sur la base principale
+    si aucun réplica n'est disponible ou si le client vient d'écrire.
+    La session de la base principale est une sous-dépendance (`get_db`) : elle suit `app.dependency_overrides`
+    et n'ouvre de connexion que si elle est utilisée.
+    :param request: Requête HTTP (clé du client, pour l'épinglage)
+    :param db: Session de la base principale
+    """
+    router = get_replica_router()
+    replica = router.acquire(read_client_key(request.scope)) if router.replicas else None
+    if replica is None:
+        yield db
+        return
+    replica_db = replica.session_factory(info={"replica": replica.name})
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+        router.release(replica)
+
+
+def replica_name(db: Session) -> str | None:
+    """
+    Indique si une session de lecture a été ouverte sur un réplica. Les services ne mettent pas en cache
+    ce qu'ils y lisent (le réplica peut être en retard sur une écriture déjà invalidée) et ne regroupent
+    ces lectures qu'avec celles du même réplica (single-flight).
+    :param db: Session de base de données
+    :return: Nom du réplica, ou None pour la base principale
+    """
+    return db.info.get("replica")
@@ -0,0 +1,84 @@
+# indexes.py
+from sqlalchemy import Index, inspect, text
+from sqlalchemy.exc import IntegrityError
+from src.models import Objet, Utilisateur  # Tables indexées
+
+# Index unique sur le username : recherche par username sans parcours de table
+# et unicité garantie par la base (y compris entre deux créations concurrentes).
+# Déclaré sur la colonne, il fait partie des métadonnées : `create_all` le crée avec une table neuve.
+UTILISATEUR_USERNAME_INDEX = Index(f"ux_{Utilisateur.__tablename__}_username", Utilisateur.username, unique=True)
+
+INDEXES = (UTILISATEUR_USERNAME_INDEX,)  # Index ajoutés au schéma d'origine
+
+# Index plein texte des libellés d'objets (SEARCH_BACKEND=database), propre à chaque base
+OBJET_FTS_INDEX = f"ix_{Objet.__tablename__}_libobj_fts"
+# PostgreSQL : unaccent() n'est pas IMMUTABLE et ne peut pas servir dans un index, d'où cette enveloppe
+POSTGRES_UNACCENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+"""
+
+
+def ensure_indexes(engine):
+    """
+    Crée les index manquants sur une base existante (`create_all` ne modifie pas les tables déjà créées).
+    :param engine: Engine de la base de données
+    :return: Noms des index créés
+    :raises RuntimeError: Si un index unique ne peut pas être créé (doublons déjà présents en base)
+    """
+    created = []
+    for index in INDEXES:
+        existing = {existing_index["name"] for existing_index in inspect(engine).get_indexes(index.table.name)}
+        if index.name in existing:
+            continue
+        try:
+            index.create(engine)
+        except IntegrityError as e:
+            raise RuntimeError(
+                f"Impossible de créer l'index {index.name} : supprimez d'abord les doublons ({e.orig})"
+            ) from e
+        created.append(index.name)
+    return created
+
+
+def ensure_search_indexes(engine):
+    """
+    Crée l'index plein texte utilisé par SEARCH_BACKEND=database.
+    - PostgreSQL : extension unaccent et index GIN sur to_tsvector('simple', f_unaccent(libobj)) ;
+    - MySQL / MariaDB : index FULLTEXT sur libobj (les collations *_ci ignorent déjà les accents).
+    Les autres bases n'ont pas d'index plein texte : la recherche y reste un parcours LIKE.
+    :param engine: Engine de la base de données
+    :return: True si la base dispose d'une recherche plein texte
+    """
+    table = Objet.__tablename__
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+            conn.execute(text(POSTGRES_UNACCENT_FUNCTION))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {OBJET_FTS_INDEX} ON {table} "
+                f"USING gin (to_tsvector('simple', f_unaccent(libobj)))"
+            ))
+        return True
+    if dialect in ("mysql", "mariadb"):
+        existing = {existing_index["name"] for existing_index in inspect(engine).get_indexes(table)}
+        if OBJET_FTS_INDEX not in existing:
+            with engine.begin() as conn:
+                conn.execute(text(f"CREATE FULLTEXT INDEX {OBJET_FTS_INDEX} ON {table} (libobj)"))
+        return True
+    return False
+
+
+def is_unique_violation(error: IntegrityError, column) -> bool:
+    """
+    Indique si une IntegrityError provient d'une contrainte d'unicité sur `column`.
+    Le message du pilote cite le nom de l'index (PostgreSQL, MySQL) ou celui de la colonne (SQLite).
+    Les autres violations (NOT NULL, clé étrangère...) ne sont pas concernées.
+    :param error: Erreur levée par l'INSERT / UPDATE
+    :param column: Colonne de la contrainte (ex. Utilisateur.username)
+    :return: True si la violation concerne cette colonne
+    """
+    message = str(error.orig).lower()
+    return column.key.lower() in message and ("unique" in message or "duplicate" in message)
@@ -1,30 +1,130 @@
 # Importation des modules nécessaires
+import asyncio  # Construction de l'index de recherche en arrière-plan (thread) pendant le démarrage
+from contextlib import asynccontextmanager  # Importation du décorateur du lifespan (démarrage / arrêt)
+from importlib import import_module  # Importation des routers à la création de l'application
 from fastapi import FastAPI  # Importation de la classe FastAPI pour créer l'application
-from src.router.clients_router import router_client  # Importation du router des clients
-from src.router.departements_router import router_departement  # Importation du router des départements
-from src.router.conditionnements_router import router_conditionnement  # Importation du router des conditionnements
-from src.router.commandes_router import router_commande  # Importation du router des commandes
-from src.router.communes_router import router_commune  # Importation du router des communes
-from src.router.utilisateurs_router import router_utilisateur  # Importation du router des utilisateurs
-from src.router.objets_router import router_objet  # Importation du router des objets
-from src.database import engine  # Importation de l'engine de la base de données (connexion à la BDD)
-from src.models import Base  # Importation de la classe Base pour la création des tables
+from src.config import get_settings  # Importation de la configuration (mode synchrone ou asynchrone)
+from src.middlewares.metrics_middleware import MetricsMiddleware  # Importation du middleware de métriques
+from src.middlewares.compression_middleware import CompressionMiddleware  # Importation du middleware de compression
+from src.middlewares.admission_middleware import AdmissionMiddleware  # Importation du contrôle d'admission
+from src.middlewares.read_your_writes_middleware import ReadYourWritesMiddleware  # Importation de l'épinglage après écriture
+from src.middlewares.profiling_middleware import ProfilingMiddleware  # Importation du profilage à la demande
 
+# Routers montés dans l'application : (module, nom du router, préfixe, tag).
+# Ils sont importés par `create_app`, pas à l'importation de ce module.
+# Chaque routeur correspond à un domaine spécifique (clients, départements, conditionnements, etc.)
+ROUTERS = (
+    ("src.router.clients_router", "router_client", "/clients", "Clients"),
+    ("src.router.departements_router", "router_departement", "/departements", "Départements"),
+    ("src.router.conditionnements_router", "router_conditionnement", "/conditionnements", "Conditionnements"),
+    ("src.router.communes_router", "router_commune", "/communes", "Communes"),
+    ("src.router.commandes_router", "router_commande", "/commandes", "Commandes"),
+    ("src.router.utilisateurs_router", "router_utilisateur", "/utilisateurs", "Utilisateurs"),
+    ("src.router.objets_router", "router_objet", "/objets", "Objets"),
+    ("src.router.monitoring_router", "router_monitoring", "", "Supervision"),  # Cache, métriques
+)
+# En mode asynchrone (DB_MODE=async), les routeurs asynchrones sont montés avant les routeurs synchrones :
+# ils remplacent les routes CRUD, les autres routes restent servies par les routeurs synchrones.
+ASYNC_ROUTERS = (
+    ("src.router.utilisateurs_router_async", "router_utilisateur_async", "/utilisateurs", "Utilisateurs"),
+    ("src.router.objets_router_async", "router_objet_async", "/objets", "Objets"),
+)
 
-# Création de l'application FastAPI
-app = FastAPI()
 
-# Inclusion des routers dans l'application FastAPI
-# Chaque routeur correspond à un domaine spécifique (clients, départements, conditionnements, etc.)
+def warm_up_search_index(engine):
+    """
+    Construit l'index de recherche en mémoire des objets (SEARCH_BACKEND=memory).
+    Exécuté dans un thread au démarrage : l'application répond déjà aux autres routes pendant la construction,
+    et une recherche arrivée avant la fin attend l'index au lieu d'en construire un second.
+    :param engine: Engine de la base de données
+    """
+    from sqlalchemy.orm import Session  # Imports locaux : seulement si l'index est construit
+    from src.services.objets_services import ensure_objet_search_index
+    with Session(engine) as db:
+        ensure_objet_search_index(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Démarrage et arrêt de l'application (un passage par processus / worker).
+    Au démarrage : instrumentation du pool, migration si AUTO_MIGRATE, index de recherche en arrière-plan,
+    thread d'écriture des compteurs des objets, vérification périodique des réplicas en lecture.
+    Le schéma n'est plus créé ici par défaut : voir `python -m src.migrate`.
+    À l'arrêt : écriture des derniers incréments des compteurs, puis fermeture des connexions des engines
+    (base principale et réplicas).
+    """
+    from src.database import engine  # Import local : l'engine n'est utilisé qu'une fois l'application démarrée
+    from src.services.pool_metrics import instrument_pool
+    from src.services.write_behind import get_objet_counters
+    from src.database_replicas import get_replica_router
+    settings = get_settings()
+    # Instrumentation du pool de connexions de l'engine principal (compteurs exposés sur /pool/stats)
+    instrument_pool(engine)
+    if settings.auto_migrate:
+        from src.migrate import migrate
+        await asyncio.to_thread(migrate, engine)
+    warm_up = None
+    if settings.search_backend == "memory":
+        warm_up = asyncio.create_task(asyncio.to_thread(warm_up_search_index, engine))
+    counters = get_objet_counters()
+    counters.start(engine)  # Écriture des compteurs des objets par lots, en arrière-plan
+    replicas = get_replica_router()
+    replicas.start(settings.replica_health_interval)  # Réplicas en échec écartés, puis réintégrés
+    yield
+    await asyncio.to_thread(counters.stop)  # Aucun incrément accepté n'est perdu à l'arrêt normal
+    if warm_up is not None and not warm_up.done():
+        await asyncio.wait([warm_up])  # Un thread ne s'interrompt pas : on attend la fin avant de fermer le pool
+    replicas.stop()
+    engine.dispose()
+    if settings.db_mode == "async":
+        from src.database_async import dispose_async_engine
+        await dispose_async_engine()
+
+
+def create_app() -> FastAPI:
+    """
+    Fabrique de l'application : middlewares, routers et lifespan.
+    Aucune connexion à la base n'est ouverte ici ; `uvicorn --factory src.main:create_app` crée l'application
+    au lancement du worker (`uvicorn src.main:app` aussi, voir `__getattr__`).
+    :return: Application FastAPI
+    """
+    # Création de l'application FastAPI
+    app = FastAPI(lifespan=lifespan)
+
+    # Compression des réponses (gzip, br, zstd) selon Accept-Encoding, au-delà de COMPRESSION_MIN_SIZE octets
+    app.add_middleware(CompressionMiddleware)
+
+    # Après une écriture, les lectures du même client vont sur la base principale (réplicas en retard)
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    # Contrôle d'admission (limites de débit par client, plafond de requêtes en cours) : 429 / 503 avant tout accès à la base
+    app.add_middleware(AdmissionMiddleware)
+
+    # Profilage à la demande (en-tête X-Profile avec PROFILING_TOKEN) : Server-Timing et détail sur /profiles/{id}
+    app.add_middleware(ProfilingMiddleware)
+
+    # Mesure de chaque requête (latence, statut, requêtes SQL), exposée sur /metrics
+    # Ajouté en dernier, il englobe les autres middlewares : la latence mesurée inclut la compression et les refus
+    app.add_middleware(MetricsMiddleware)
+
+    # Inclusion des routers dans l'application FastAPI
+    routers = (ASYNC_ROUTERS if get_settings().db_mode == "async" else ()) + ROUTERS
+    for module, name, prefix, tag in routers:
+        app.include_router(getattr(import_module(module), name), prefix=prefix, tags=[tag])
+    return app
+
 
-app.include_router(router_client, prefix="/clients", tags=["Clients"])  # Routes pour la gestion des clients
-app.include_router(router_departement, prefix="/departements", tags=["Départements"])  # Routes pour la gestion des départements
-app.include_router(router_conditionnement, prefix="/conditionnements", tags=["Conditionnements"])  # Routes pour la gestion des conditionnements
-app.include_router(router_commune, prefix="/communes", tags=["Communes"])  # Routes pour la gestion des communes
-app.include_router(router_commande, prefix="/commandes", tags=["Commandes"])  # Routes pour la gestion des commandes
-app.include_router(router_utilisateur, prefix="/utilisateurs", tags=["Utilisateurs"])  # Routes pour la gestion des utilisateurs
-app.include_router(router_objet, prefix="/objets", tags=["Objets"])  # Routes pour la gestion des utilisateurs
-
-# Commande pour créer toutes les tables définies dans les modèles (models.py) si elles n'existent pas déjà dans la base de données.
-# Cette commande est exécutée lors du démarrage de l'application pour s'assurer que la structure de la base est à jour.
-Base.metadata.create_all(engine)
+def __getattr__(name: str):
+    """
+    Application utilisée par `uvicorn src.main:app` et par les tests (`from src.main import app`),
+    créée au premier accès : importer ce module (ex. pour `create_app` ou `warm_up_search_index`)
+    n'importe ni les routers ni les modèles, services et repositories qu'ils utilisent (seuls les middlewares le sont).
+    :param name: Attribut demandé au module
+    :return: L'application FastAPI, créée une seule fois
+    """
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    app = create_app()
+    globals()["app"] = app  # Les accès suivants ne passent plus par __getattr__
+    return app
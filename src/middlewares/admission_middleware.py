@@ -0,0 +1,115 @@
+# middlewares/admission_middleware.py
+import asyncio  # Appel du limiteur partagé dans un thread
+import json  # Corps des réponses de refus
+from src.config import get_settings  # Budgets et plafonds par défaut
+from src.services.admission import (  # Limiteurs, classes de budget et compteurs
+    ConcurrencyLimiter,
+    admission_stats,
+    budgets as configured_budgets,
+    client_key,
+    get_rate_limiter,
+    request_class,
+    retry_after_header,
+)
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI de contrôle d'admission, avant tout accès à la base :
+    - limite de débit par client et par classe de budget ("heavy" : listes, recherche, export ;
+      "light" : une entité, écritures) : au-delà, 429 Too Many Requests avec Retry-After ;
+    - plafond de requêtes en cours (global, et pour les seules requêtes "heavy") : les requêtes en surnombre
+      attendent dans une file bornée, puis sont refusées en 503 Service Unavailable (file pleine ou attente trop longue).
+    Un client qui sature les listes ne consomme ainsi ni le budget des lectures unitaires, ni toutes les places.
+    Les flux des modifications ("stream") restent ouverts longtemps : ils sont limités en débit de connexion,
+    pas en concurrence (plafond propre : CHANGE_FEED_MAX_SUBSCRIBERS).
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter=None,
+        budgets: dict | None = None,
+        max_concurrency: int | None = None,
+        max_heavy_concurrency: int | None = None,
+        queue_size: int | None = None,
+        queue_timeout: float | None = None,
+    ):
+        """
+        :param app: Application ASGI
+        :param limiter: Limiteur de débit (par défaut : RATE_LIMIT_BACKEND)
+        :param budgets: Classe -> (requêtes par seconde, rafale) (par défaut : RATE_LIMIT_*)
+        :param max_concurrency: Requêtes en cours au plus (par défaut : MAX_CONCURRENCY, 0 : sans plafond)
+        :param max_heavy_concurrency: Requêtes "heavy" en cours au plus (par défaut : MAX_HEAVY_CONCURRENCY)
+        :param queue_size: Requêtes en attente au plus, par plafond (par défaut : ADMISSION_QUEUE_SIZE)
+        :param queue_timeout: Attente maximale en secondes (par défaut : ADMISSION_QUEUE_TIMEOUT)
+        """
+        settings = get_settings()
+        self.app = app
+        self.limiter = limiter
+        self.budgets = configured_budgets() if budgets is None else budgets
+        self.key_header = settings.rate_limit_key_header.lower() or None
+        queue_size = settings.admission_queue_size if queue_size is None else queue_size
+        queue_timeout = settings.admission_queue_timeout if queue_timeout is None else queue_timeout
+        max_concurrency = settings.max_concurrency if max_concurrency is None else max_concurrency
+        max_heavy_concurrency = settings.max_heavy_concurrency if max_heavy_concurrency is None else max_heavy_concurrency
+        self.slots = ConcurrencyLimiter(max_concurrency, queue_size, queue_timeout) if max_concurrency else None
+        self.heavy_slots = ConcurrencyLimiter(max_heavy_concurrency, queue_size, queue_timeout) if max_heavy_concurrency else None
+        for name, slots in (("global", self.slots), ("heavy", self.heavy_slots)):
+            if slots is not None:
+                admission_stats.concurrency[name] = slots  # Exposés sur /admission/stats
+
+    async def __call__(self, scope, receive, send):
+        kind = request_class(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if kind is None:
+            await self.app(scope, receive, send)  # Lifespan, supervision : non limités
+            return
+
+        rate, burst = self.budgets.get(kind, (0, 0))
+        if rate > 0:
+            limiter = self.limiter or get_rate_limiter()
+            key = f"{kind}:{client_key(scope, self.key_header)}"
+            if limiter.local:
+                retry_after = limiter.acquire(key, rate, burst)
+            else:
+                retry_after = await asyncio.to_thread(limiter.acquire, key, rate, burst)
+            if retry_after:
+                admission_stats.rate_limited[kind] += 1
+                await self._reject(send, 429, retry_after, "Trop de requêtes : réessayez plus tard.")
+                return
+
+        acquired = []
+        try:
+            for slots in (self.heavy_slots if kind == "heavy" else None, self.slots if kind != "stream" else None):
+                if slots is None:
+                    continue
+                if not await slots.acquire():
+                    await self._reject(send, 503, 1, "Serveur saturé : réessayez plus tard.")
+                    return
+                acquired.append(slots)
+            admission_stats.admitted += 1
+            await self.app(scope, receive, send)
+        finally:
+            for slots in acquired:
+                slots.release()
+
+    @staticmethod
+    async def _reject(send, status: int, retry_after: float, detail: str):
+        """
+        Répond sans appeler l'application (même format d'erreur que HTTPException).
+        :param send: Fonction d'envoi ASGI
+        :param status: 429 ou 503
+        :param retry_after: Délai conseillé avant de réessayer (secondes)
+        :param detail: Message d'erreur
+        """
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry_after_header(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,172 @@
+# middlewares/compression_middleware.py
+from starlette.datastructures import Headers, MutableHeaders  # Lecture et modification des en-têtes ASGI
+from src.config import get_settings  # Seuil de compression
+from src.services.compression import (  # Négociation, compresseurs et cache des corps compressés
+    StreamCompressor,
+    available_encodings,
+    compress,
+    compression_stats,
+    get_compressed_cache,
+    is_compressible,
+    negotiate,
+)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    :param etag: ETag de la réponse non compressée (fort ou faible : W/"...")
+    :param encoding: Encodage de la réponse compressée
+    :return: ETag de la réponse compressée ("abc" devient "abc-gzip")
+    """
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI qui compresse les réponses (gzip, br ou zstd selon Accept-Encoding).
+    - Les réponses complètes sous COMPRESSION_MIN_SIZE octets sont envoyées telles quelles ;
+    - les réponses portant un ETag sont compressées une seule fois : le corps compressé est conservé
+      et réutilisé tant que l'ETag (donc le contenu) ne change pas ;
+    - les réponses en streaming (exports) sont compressées morceau par morceau.
+    Une réponse compressée est une autre représentation que la réponse d'origine : son ETag reçoit le suffixe
+    de l'encodage ("abc" devient "abc-gzip"), retiré des en-têtes If-None-Match et If-Match avant l'application,
+    qui compare donc toujours ses propres ETags. `Vary: Accept-Encoding` est ajouté aux réponses compressées.
+    """
+
+    def __init__(self, app, encodings: tuple[str, ...] | None = None, minimum_size: int | None = None):
+        """
+        :param app: Application ASGI
+        :param encodings: Encodages proposés, par ordre de préférence (par défaut : COMPRESSION)
+        :param minimum_size: Taille minimale compressée (par défaut : COMPRESSION_MIN_SIZE)
+        """
+        self.app = app
+        self.encodings = available_encodings() if encodings is None else encodings
+        self.minimum_size = get_settings().compression_min_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        scope, etag_encoding = self._strip_etag_suffixes(scope)
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)  # Le client n'accepte aucun encodage proposé
+            return
+
+        start_message = None
+        mode = None  # None (en attente du premier morceau), "identity" ou "stream"
+        compressor = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, mode, compressor
+            if message["type"] == "http.response.start":
+                start_message = message  # Envoyé avec le premier morceau, une fois la décision prise
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if mode == "identity":
+                await send(message)
+                return
+            if mode == "stream":
+                body = compressor.compress(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body += compressor.finish()
+                await send({"type": "http.response.body", "body": body, "more_body": message.get("more_body", False)})
+                return
+
+            # Premier morceau : compresser ou non
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if (
+                start_message["status"] < 200 or start_message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+            ):
+                mode = "identity"
+            elif not more_body and len(body) < self.minimum_size:
+                compression_stats.skipped_small += 1
+                mode = "identity"
+            if mode == "identity":
+                if start_message["status"] == 304 and etag_encoding and "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], etag_encoding)  # ETag de la représentation du client
+                await send(start_message)
+                await send(message)
+                return
+
+            etag = headers.get("etag")
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if etag is not None:
+                headers["ETag"] = encoded_etag(etag, encoding)
+            if more_body:
+                # Réponse en streaming : taille inconnue, compressée au fil de l'eau
+                mode = "stream"
+                del headers["Content-Length"]
+                compressor = StreamCompressor(encoding)
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressor.compress(body), "more_body": True})
+                return
+
+            compressed = self._compress_body(encoding, scope, etag, body)
+            headers["Content-Length"] = str(len(compressed))
+            compression_stats.responses += 1
+            compression_stats.bytes_in += len(body)
+            compression_stats.bytes_out += len(compressed)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _strip_etag_suffixes(self, scope) -> tuple[dict, str | None]:
+        """
+        Retire le suffixe d'encodage des ETags de If-None-Match et If-Match.
+        :param scope: Scope ASGI de la requête
+        :return: Tuple (scope, éventuellement copié avec ses en-têtes modifiés ; encodage trouvé dans If-None-Match)
+        """
+        found = None
+        changed = False
+        headers = []
+        for name, value in scope["headers"]:
+            if name in (b"if-none-match", b"if-match"):
+                tags = []
+                for tag in value.decode("latin-1").split(","):
+                    tag = tag.strip()
+                    for encoding in self.encodings:
+                        suffix = f'-{encoding}"'
+                        if tag.endswith(suffix):
+                            tag = tag[:-len(suffix)] + '"'
+                            changed = True
+                            if name == b"if-none-match":
+                                found = encoding
+                            break
+                    tags.append(tag)
+                value = ", ".join(tags).encode("latin-1")
+            headers.append((name, value))
+        if not changed:
+            return scope, None
+        return {**scope, "headers": headers}, found
+
+    @staticmethod
+    def _compress_body(encoding: str, scope, etag: str | None, body: bytes) -> bytes:
+        """
+        Compresse un corps complet, en réutilisant le résultat déjà calculé pour le même ETag.
+        :param encoding: Encodage retenu
+        :param scope: Scope ASGI de la requête (chemin)
+        :param etag: ETag de la réponse, ou None
+        :param body: Corps à compresser
+        :return: Corps compressé
+        """
+        if etag is None:
+            return compress(encoding, body)
+        cache = get_compressed_cache()
+        key = f"{encoding}|{scope['path']}|{etag}"
+        cached = cache.get(key)
+        if cached is not None and cached[0] == len(body):  # Même ETag et même taille : même contenu
+            return cached[1]
+        compressed = compress(encoding, body)
+        cache.set(key, (len(body), compressed))
+        return compressed
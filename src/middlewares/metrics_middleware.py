@@ -0,0 +1,64 @@
+# middlewares/metrics_middleware.py
+import time  # Mesure de la durée des requêtes
+from src.services.metrics import QueryStats, current_query_stats, registry  # Registre des métriques
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI qui mesure chaque requête HTTP : nombre, statut, latence,
+    ainsi que le nombre de requêtes SQL et le temps SQL (via les événements SQLAlchemy).
+    Les métriques sont indexées par modèle de route (ex. /objets/{codobj}).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)  # WebSocket, lifespan : non mesurés
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status_code = 500  # Valeur retenue si l'application lève une exception avant de répondre
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            registry.observe_request(
+                scope["method"], route_template(scope), status_code, time.perf_counter() - start, stats.count, stats.duration
+            )
+
+
+def route_template(scope) -> str:
+    """
+    Modèle complet de la route d'une requête (ex. /objets/{codobj}).
+    `scope["route"].path` ne contient pas toujours le préfixe du routeur (routeurs inclus par FastAPI sans
+    recopier leurs routes) : le préfixe est retrouvé dans le chemin, devant la partie reconnue par la route.
+    :param scope: Scope ASGI de la requête, après le routage
+    :return: Modèle de la route, ou "unmatched" si aucune route n'a été trouvée (chemins inconnus regroupés)
+    """
+    route = scope.get("route")  # Renseignée par le routeur une fois la route trouvée
+    route_path = getattr(route, "path", None)
+    path_regex = getattr(route, "path_regex", None)
+    if not route_path or path_regex is None:
+        return "unmatched"
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]  # Préfixe de déploiement (proxy) : hors du modèle
+    # Préfixe le plus court : la route reconnaît le reste du chemin
+    start = 0
+    while start != -1:
+        if path_regex.match(path[start:]):
+            return path[:start] + route_path
+        start = path.find("/", start + 1)
+    return route_path
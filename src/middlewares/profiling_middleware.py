@@ -0,0 +1,51 @@
+# middlewares/profiling_middleware.py
+import time  # Durée totale de la requête profilée
+from src.services.profiling import Profile, current_profile, profile_store, profiling_allowed  # Profils des requêtes
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI de profilage à la demande : une requête portant l'en-tête `X-Profile: <PROFILING_TOKEN>`
+    est profilée (temps SQL, chargement ORM, validation, sérialisation) ; la réponse porte l'en-tête
+    standard Server-Timing et `X-Profile-Id`, qui donne le détail (requêtes SQL et durées) sur /profiles/{id}.
+    Sans l'en-tête ou avec un jeton incorrect, la requête est traitée normalement.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                token = value.decode("latin-1")
+                break
+        if token is None or not profiling_allowed(token):
+            await self.app(scope, receive, send)  # Cas normal : une boucle sur les en-têtes, rien d'autre
+            return
+
+        profile = Profile(scope["method"], scope["path"])
+        profile.id = profile_store.new_id()
+        context_token = current_profile.set(profile)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                profile.total = time.perf_counter() - start  # Réponse prête : le reste n'est que de l'envoi
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"{profile.server_timing()}, total;dur={profile.total * 1000:.3f}".encode()))
+                headers.append((b"x-profile-id", profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(context_token)
+            if profile.status is None:
+                profile.total = time.perf_counter() - start
+            profile_store.save(profile)
@@ -0,0 +1,38 @@
+# middlewares/read_your_writes_middleware.py
+from src.database_replicas import get_replica_router, read_client_key  # Épinglage des clients sur la base principale
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))  # Méthodes sans écriture
+READ_ONLY_SUFFIXES = ("/batch-get",)  # Lectures envoyées en POST (liste d'identifiants dans le corps)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI : après une écriture réussie (POST, PUT, PATCH, DELETE et statut < 400),
+    épingle le client sur la base principale pendant READ_YOUR_WRITES_SECONDS, pour que ses lectures
+    suivantes voient son écriture même si les réplicas ont du retard. Sans réplica configuré, ne fait rien.
+    """
+
+    def __init__(self, app, router=None):
+        """
+        :param app: Application ASGI
+        :param router: Répartiteur des lectures (par défaut : celui de DATABASE_REPLICA_URLS)
+        """
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or scope["path"].endswith(READ_ONLY_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+        router = self.router or get_replica_router()
+        if not router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            # L'écriture est validée avant l'envoi de la réponse : le client est épinglé avant de pouvoir relire
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                router.pin(read_client_key(scope))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,44 @@
+# migrate.py
+"""
+Création et mise à jour du schéma de la base, en étape explicite (déploiement, CI, premier lancement) :
+l'application ne crée plus les tables ni les index à son démarrage.
+
+Exemple (depuis la racine du dépôt) :
+    python -m src.migrate
+"""
+import argparse  # Options de la ligne de commande
+from src.config import get_settings  # Moteur de recherche configuré (index plein texte)
+from src.indexes import ensure_indexes, ensure_search_indexes  # Index ajoutés au schéma d'origine
+from src.models import Base  # Métadonnées des tables
+
+
+def migrate(engine, search: bool | None = None) -> list[str]:
+    """
+    Crée les tables manquantes, puis les index ajoutés depuis sur les tables existantes.
+    Sans effet sur une base déjà à jour : peut être relancée à chaque déploiement.
+    :param engine: Engine de la base de données
+    :param search: Créer aussi l'index plein texte (par défaut : si SEARCH_BACKEND=database)
+    :return: Noms des index créés
+    """
+    Base.metadata.create_all(engine)  # Ne modifie pas les tables déjà créées
+    created = ensure_indexes(engine)
+    if search is None:
+        search = get_settings().search_backend == "database"
+    if search and ensure_search_indexes(engine):
+        created.append("plein texte (libobj)")
+    return created
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crée ou met à jour le schéma de la base de données.")
+    parser.add_argument("--search", action="store_true", help="Créer l'index plein texte quel que soit SEARCH_BACKEND")
+    args = parser.parse_args(argv)
+
+    from src.database import engine  # Import local : l'engine n'est créé que pour la migration
+    created = migrate(engine, search=True if args.search else None)
+    engine.dispose()
+    print(f"Schéma à jour ({', '.join(created) if created else 'aucun index créé'}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,64 @@
 # repositories/objets_repositories.py
-from sqlalchemy.orm import Session  # Importation de Session pour interagir avec la base de données
-from models import Objet  # Importation du modèle Objet depuis le module models
+from sqlalchemy import delete, func, literal_column, select, update  # Requêtes par colonnes ; écritures sur les conditionnements
+from sqlalchemy.dialects.mysql import match  # MATCH ... AGAINST (recherche plein texte MySQL)
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload  # Session, chargement partiel et anticipé
+from src.config import get_settings  # Stratégie de chargement de la relation `condit`
+from src.models import Objet  # Importation du modèle Objet depuis le module models
+from src.services.profiling import profiled  # Temps de chargement (ORM) des requêtes profilées
+
+# Colonnes exportées pour un objet (la relation `condit` n'est pas incluse)
+OBJET_COLUMNS = (
+    Objet.codobj, Objet.libobj, Objet.tailleobj, Objet.puobj, Objet.poidsobj, Objet.indispobj,
+    Objet.o_imp, Objet.o_aff, Objet.o_cartp, Objet.points, Objet.o_ordre_aff,
+)
+OBJET_COLUMNS_BY_NAME = {column.key: column for column in OBJET_COLUMNS}  # Champ de l'API -> colonne
+
+
+def condit_loader():
+    """
+    Option de chargement anticipé de la relation `condit`, selon CONDIT_LOADING :
+    "selectin" (une requête IN par lot de 500 objets) ou "joined" (jointure dans la requête principale).
+    Dans les deux cas, le nombre de requêtes ne dépend plus du nombre d'objets (pas de N+1).
+    :return: Option à passer à `select(Objet).options(...)`
+    """
+    if get_settings().condit_loading == "joined":
+        return joinedload(Objet.condit)
+    return selectinload(Objet.condit)
+
+
+def _condit_foreign_key():
+    """
+    :return: Colonne des conditionnements qui référence l'objet (clé étrangère de la relation `condit`)
+    """
+    ((_, column),) = Objet.condit.property.synchronize_pairs
+    return column
+
+
+def select_condit(codobj: int):
+    """
+    Requête des colonnes des conditionnements d'un objet (relation `condit`), lues sans objets ORM :
+    les lignes restent lisibles après le commit, qui expire les objets de la session.
+    :param codobj: Identifiant de l'objet
+    :return: Requête à exécuter (`.mappings().all()`)
+    """
+    return select(*Objet.condit.property.mapper.columns).where(_condit_foreign_key() == codobj)
+
+
+def release_condit(codobjs: list[int]):
+    """
+    Requête à exécuter avant un DELETE en une seule requête sur les objets, qui ne passe pas par l'ORM :
+    reproduit ce que `db.delete(objet)` faisait pour la relation `condit`. Les conditionnements sont supprimés
+    si la relation a la cascade "delete", sinon détachés (clé étrangère à NULL).
+    :param codobjs: Identifiants des objets supprimés
+    :return: Requête DELETE ou UPDATE, ou None si la base s'en charge (passive_deletes, ON DELETE)
+    """
+    relationship = Objet.condit.property
+    if relationship.passive_deletes:
+        return None
+    column = _condit_foreign_key()
+    if relationship.cascade.delete:
+        return delete(column.table).where(column.in_(codobjs))
+    return update(column.table).where(column.in_(codobjs)).values({column.name: None})
 
 
 # Créer un objet
@@ -19,6 +77,7 @@ def create_objet(db: Session, objet_data: dict):
 
 
 # Récupérer un objet par son ID
+@profiled("orm")
 def get_objet_by_id(db: Session, codobj: int):
     """
     Récupère un objet en fonction de son ID.
@@ -26,17 +85,32 @@ def get_objet_by_id(db: Session, codobj: int):
     :param codobj: Identifiant de l'objet à récupérer
     :return: L'objet correspondante ou None si l'objet n'existe pas
     """
-    return db.query(Objet).filter(Objet.codobj == codobj).first()  # Recherche l'objet par ID
+    stmt = select(Objet).options(condit_loader()).where(Objet.codobj == codobj)
+    return db.execute(stmt).unique().scalars().first()  # Recherche l'objet par ID, avec sa relation `condit`
+
+
+# Récupérer plusieurs objets par leurs ID
+@profiled("orm")
+def get_objets_by_ids(db: Session, codobjs: list[int]):
+    """
+    Récupère plusieurs objets en une seule requête (WHERE codobj IN (...)), avec leur relation `condit`.
+    :param db: Session de base de données
+    :param codobjs: Identifiants des objets
+    :return: Liste des objets existants (dans un ordre quelconque)
+    """
+    stmt = select(Objet).options(condit_loader()).where(Objet.codobj.in_(codobjs))
+    return db.execute(stmt).unique().scalars().all()
 
 
 # Récupérer tous les objets
+@profiled("orm")
 def get_all_objets(db: Session):
     """
     Récupère tous les objets depuis la base de données.
     :param db: Session de base de données
     :return: Liste de tous les objets
     """
-    return db.query(Objet).all()  # Récupère tous les objets
+    return db.execute(select(Objet).options(condit_loader())).unique().scalars().all()  # Récupère tous les objets
 
 
 # Supprimer un objet
@@ -70,3 +144,168 @@ def update_objet(db: Session, codobj: int, updated_data: dict):
         db.refresh(objet)  # Rafraîchit l'objet pour obtenir l'état mis à jour
         return objet  # Retourne l'objet mis à jour
     return None  # Retourne None si l'objet n'a pas été trouvé
+
+
+# Récupérer une page d'objets (pagination par curseur)
+@profiled("orm")
+def get_objets_page(db: Session, limit: int, after: int | None = None, libobj: str | None = None,
+                    indispobj: int | None = None, o_aff: int | None = None, fields: tuple[str, ...] | None = None):
+    """
+    Récupère une page d'objets triés par `codobj` (pagination par curseur / keyset).
+    Les filtres sont appliqués directement dans la requête SQL.
+    :param db: Session de base de données
+    :param limit: Nombre maximal d'objets à retourner
+    :param after: Dernier `codobj` de la page précédente (None pour la première page)
+    :param libobj: Préfixe du libellé recherché
+    :param indispobj: Filtre sur l'indicateur d'indisponibilité
+    :param o_aff: Filtre sur l'indicateur d'affichage
+    :param fields: Champs demandés : seules ces colonnes sont chargées (`load_only`), None pour toutes
+    :return: Tuple (liste des objets, curseur de la page suivante ou None)
+    """
+    stmt = select(Objet).options(condit_loader())  # Relation `condit` chargée pour toute la page (voir condit_loader)
+    if fields is not None:
+        stmt = stmt.options(load_only(*(OBJET_COLUMNS_BY_NAME[name] for name in fields if name in OBJET_COLUMNS_BY_NAME)))
+    stmt = _filter_objets(stmt, after, libobj, indispobj, o_aff)
+    # On lit une ligne de plus que demandé pour savoir s'il existe une page suivante
+    objets = db.execute(stmt.limit(limit + 1)).unique().scalars().all()
+    if len(objets) > limit:
+        objets = objets[:limit]  # Retire la ligne supplémentaire
+        return objets, objets[-1].codobj  # Le curseur suivant est le dernier codobj de la page
+    return objets, None  # Dernière page : pas de curseur suivant
+
+
+# Récupérer une page d'objets sous forme de colonnes (sérialisation rapide)
+@profiled("orm")
+def get_objet_rows_page(db: Session, limit: int, after: int | None = None, libobj: str | None = None,
+                        indispobj: int | None = None, o_aff: int | None = None, columns: tuple = OBJET_COLUMNS):
+    """
+    Variante de `get_objets_page` qui lit les colonnes en tuples, sans construire d'objets ORM.
+    Les lignes sont prêtes à être encodées en JSON (la relation `condit` n'est pas incluse).
+    :param db: Session de base de données
+    :param limit: Nombre maximal d'objets à retourner
+    :param after: Dernier `codobj` de la page précédente (None pour la première page)
+    :param libobj: Préfixe du libellé recherché
+    :param indispobj: Filtre sur l'indicateur d'indisponibilité
+    :param o_aff: Filtre sur l'indicateur d'affichage
+    :param columns: Colonnes à lire (toutes par défaut)
+    :return: Tuple (liste de dictionnaires colonne -> valeur, curseur de la page suivante ou None)
+    """
+    # codobj est toujours lu, sous un autre nom, pour le curseur (même s'il n'est pas demandé)
+    stmt = _filter_objets(select(Objet.codobj.label("cursor"), *columns), after, libobj, indispobj, o_aff)
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]  # Retire la ligne supplémentaire
+        next_cursor = rows[-1][0]
+    keys = [column.key for column in columns]
+    return [dict(zip(keys, row[1:])) for row in rows], next_cursor
+
+
+def _filter_objets(stmt, after: int | None, libobj: str | None, indispobj: int | None, o_aff: int | None):
+    """
+    Applique le curseur, les filtres et le tri d'une page d'objets à une requête.
+    :param stmt: Requête `select` sur les objets (entités ou colonnes)
+    :return: Requête filtrée et triée par `codobj`
+    """
+    if after is not None:
+        stmt = stmt.where(Objet.codobj > after)  # Reprend juste après le dernier objet déjà lu
+    if libobj:
+        stmt = stmt.where(Objet.libobj.like(f"{_escape_like(libobj)}%", escape="\\"))  # Filtre sur le préfixe du libellé
+    if indispobj is not None:
+        stmt = stmt.where(Objet.indispobj == indispobj)  # Filtre sur l'indisponibilité
+    if o_aff is not None:
+        stmt = stmt.where(Objet.o_aff == o_aff)  # Filtre sur l'affichage
+    return stmt.order_by(Objet.codobj)
+
+
+def _escape_like(value: str) -> str:
+    """
+    Échappe les caractères spéciaux d'un motif LIKE.
+    :param value: Valeur saisie par l'utilisateur
+    :return: Valeur utilisable comme préfixe dans un LIKE
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Parcourir tous les objets avec un curseur côté serveur
+def iter_objets(db: Session, batch_size: int = 1000):
+    """
+    Parcourt tous les objets, triés par `codobj`, sans les charger tous en mémoire.
+    Les lignes sont lues par lots de `batch_size` (curseur côté serveur, `yield_per`).
+    :param db: Session de base de données
+    :param batch_size: Nombre de lignes lues par aller-retour
+    :return: Itérateur de dictionnaires (une entrée par colonne)
+    """
+    stmt = select(*OBJET_COLUMNS).order_by(Objet.codobj).execution_options(yield_per=batch_size)
+    return db.execute(stmt).mappings()  # Chaque ligne est un mapping colonne -> valeur
+
+
+# Parcourir les libellés de tous les objets (construction de l'index de recherche)
+def iter_objet_labels(db: Session, batch_size: int = 10000):
+    """
+    Parcourt les couples (codobj, libobj) de tous les objets, par lots de `batch_size`.
+    :param db: Session de base de données
+    :param batch_size: Nombre de lignes lues par aller-retour
+    :return: Itérateur de tuples (codobj, libobj)
+    """
+    stmt = select(Objet.codobj, Objet.libobj).execution_options(yield_per=batch_size)
+    return db.execute(stmt)  # Chaque ligne se déballe comme un tuple (codobj, libobj)
+
+
+@profiled("orm")
+def get_objet_rows_by_ids(db: Session, codobjs: list[int], columns: tuple = OBJET_COLUMNS) -> dict:
+    """
+    Lit les colonnes demandées de plusieurs objets en une seule requête (WHERE codobj IN (...)).
+    :param db: Session de base de données
+    :param codobjs: Identifiants des objets
+    :param columns: Colonnes à lire
+    :return: Dictionnaire codobj -> dictionnaire colonne -> valeur (objets inexistants absents)
+    """
+    if not codobjs:
+        return {}
+    stmt = select(Objet.codobj.label("id"), *columns).where(Objet.codobj.in_(codobjs))
+    keys = [column.key for column in columns]
+    return {row[0]: dict(zip(keys, row[1:])) for row in db.execute(stmt)}
+
+
+@profiled("orm")
+def search_objet_rows(db: Session, terms: list[str], limit: int, columns: tuple = OBJET_COLUMNS) -> list[dict]:
+    """
+    Recherche plein texte de la base sur `libobj` (SEARCH_BACKEND=database) : chaque mot est un préfixe.
+    Nécessite l'index créé par `ensure_search_indexes` ; sans recherche plein texte (SQLite...),
+    se rabat sur un parcours LIKE (sensible aux accents).
+    :param db: Session de base de données
+    :param terms: Mots normalisés de la requête (voir `tokenize`)
+    :param limit: Nombre maximal de résultats
+    :param columns: Colonnes à lire
+    :return: Liste de dictionnaires colonne -> valeur, du plus pertinent au moins pertinent
+    """
+    if not terms:
+        return []
+    dialect = db.get_bind().dialect.name
+    stmt = select(*columns)
+    if dialect == "postgresql":
+        config = literal_column("'simple'::regconfig")
+        vector = func.to_tsvector(config, func.f_unaccent(Objet.libobj))  # Même expression que l'index GIN
+        query = func.to_tsquery(config, " & ".join(f"{term}:*" for term in terms))
+        stmt = stmt.where(vector.op("@@")(query)).order_by(func.ts_rank(vector, query).desc())
+    elif dialect in ("mysql", "mariadb"):
+        relevance = match(Objet.libobj, against=" ".join(f"+{term}*" for term in terms)).in_boolean_mode()
+        stmt = stmt.where(relevance).order_by(relevance.desc())
+    else:
+        stmt = like_search(stmt, terms)
+    stmt = stmt.order_by(func.length(Objet.libobj), Objet.codobj).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def like_search(stmt, terms: list[str]):
+    """
+    Recherche par parcours LIKE '%mot%' sur `libobj` (sans index utilisable).
+    :param stmt: Requête `select` sur les objets
+    :param terms: Mots recherchés
+    :return: Requête filtrée
+    """
+    for term in terms:
+        stmt = stmt.where(func.lower(Objet.libobj).like(f"%{_escape_like(term)}%", escape="\\"))
+    return stmt
+
@@ -0,0 +1,80 @@
+# repositories/objets_repository_async.py
+from sqlalchemy import select  # Construction des requêtes
+from sqlalchemy.ext.asyncio import AsyncSession  # Session asynchrone
+from sqlalchemy.orm import load_only  # Chargement partiel des colonnes
+from src.models import Objet  # Importation du modèle Objet depuis le module models
+from src.repositories.objets_repository import OBJET_COLUMNS, OBJET_COLUMNS_BY_NAME, _filter_objets, condit_loader  # Colonnes, filtres et chargement de `condit`
+from src.services.profiling import profiled  # Temps de chargement (ORM) des requêtes profilées
+
+
+# Récupérer un objet par son ID
+@profiled("orm")
+async def get_objet_by_id(db: AsyncSession, codobj: int):
+    """
+    Version asynchrone de `get_objet_by_id`.
+    La relation `condit` est chargée immédiatement : un chargement paresseux est impossible en asynchrone.
+    :param db: Session asynchrone
+    :param codobj: Identifiant de l'objet à récupérer
+    :return: L'objet correspondant ou None si l'objet n'existe pas
+    """
+    result = await db.execute(select(Objet).options(condit_loader()).where(Objet.codobj == codobj))
+    return result.unique().scalars().first()
+
+
+# Récupérer plusieurs objets par leurs ID
+@profiled("orm")
+async def get_objets_by_ids(db: AsyncSession, codobjs: list[int]):
+    """
+    Version asynchrone de `get_objets_by_ids` (une seule requête IN, relation `condit` chargée).
+    :param db: Session asynchrone
+    :param codobjs: Identifiants des objets
+    :return: Liste des objets existants
+    """
+    result = await db.execute(select(Objet).options(condit_loader()).where(Objet.codobj.in_(codobjs)))
+    return result.unique().scalars().all()
+
+
+# Récupérer une page d'objets (pagination par curseur)
+@profiled("orm")
+async def get_objets_page(db: AsyncSession, limit: int, after: int | None = None, libobj: str | None = None,
+                          indispobj: int | None = None, o_aff: int | None = None, fields: tuple[str, ...] | None = None):
+    """
+    Version asynchrone de `get_objets_page` (pagination par curseur sur `codobj`).
+    :param db: Session asynchrone
+    :param limit: Nombre maximal d'objets à retourner
+    :param after: Dernier `codobj` de la page précédente
+    :param libobj: Préfixe du libellé recherché
+    :param indispobj: Filtre sur l'indicateur d'indisponibilité
+    :param o_aff: Filtre sur l'indicateur d'affichage
+    :param fields: Champs demandés : seules ces colonnes sont chargées (`load_only`), None pour toutes
+    :return: Tuple (liste des objets, curseur de la page suivante ou None)
+    """
+    stmt = select(Objet).options(condit_loader())
+    if fields is not None:
+        stmt = stmt.options(load_only(*(OBJET_COLUMNS_BY_NAME[name] for name in fields if name in OBJET_COLUMNS_BY_NAME)))
+    stmt = _filter_objets(stmt, after, libobj, indispobj, o_aff)
+    # On lit une ligne de plus que demandé pour savoir s'il existe une page suivante
+    result = await db.execute(stmt.limit(limit + 1))
+    objets = list(result.unique().scalars().all())
+    if len(objets) > limit:
+        objets = objets[:limit]
+        return objets, objets[-1].codobj
+    return objets, None
+
+
+# Récupérer une page d'objets sous forme de colonnes (sérialisation rapide)
+@profiled("orm")
+async def get_objet_rows_page(db: AsyncSession, limit: int, after: int | None = None, libobj: str | None = None,
+                              indispobj: int | None = None, o_aff: int | None = None, columns: tuple = OBJET_COLUMNS):
+    """
+    Version asynchrone de `get_objet_rows_page` (colonnes lues en tuples, sans objets ORM).
+    :return: Tuple (liste de dictionnaires colonne -> valeur, curseur de la page suivante ou None)
+    """
+    stmt = _filter_objets(select(Objet.codobj.label("cursor"), *columns), after, libobj, indispobj, o_aff)
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1][0]
+    keys = [column.key for column in columns]
+    return [dict(zip(keys, row[1:])) for row in rows], next_cursor
@@ -1,8 +1,50 @@
 from src.models import Utilisateur  # Importation du modèle utilisateur depuis le module models
+from sqlalchemy import delete, insert, select, update  # Importation des constructeurs de requêtes SQL
+from sqlalchemy.exc import IntegrityError  # Violation de contrainte (ex. username déjà utilisé)
 from sqlalchemy.orm import Session  # Importation de la classe Session pour interagir avec la base de données
 from datetime import date
 from fastapi import HTTPException, status
+from src.services.cache import etag_cache_key, invalidate  # Invalidation du cache (entités et ETags) après une écriture
+from src.services.versions import bump_version, entity_etag, etag_matches  # Versions et ETags (ETag / If-Match)
+from src.schemas.utilisateur import UtilisateurResponse  # Représentation JSON d'un utilisateur (ETag)
+from src.services.serialization import entity_json  # Validation et sérialisation d'une entité (profilées)
+from src.indexes import is_unique_violation  # Unicité du username garantie par un index unique
+from src.services.change_feed import utilisateur_changes  # Flux des modifications (GET /utilisateurs/changes)
+from src.services.profiling import profiled  # Temps de chargement (ORM) des requêtes profilées
 
+# Colonnes d'un utilisateur renvoyées par les exports et les écritures (RETURNING)
+UTILISATEUR_COLUMNS = (
+    Utilisateur.code_utilisateur,
+    Utilisateur.nom_utilisateur,
+    Utilisateur.prenom_utilisateur,
+    Utilisateur.username,
+    Utilisateur.date_insc_utilisateur,
+)
+# Colonnes exposées par l'API (UtilisateurResponse ne contient pas code_utilisateur)
+UTILISATEUR_RESPONSE_COLUMNS = UTILISATEUR_COLUMNS[1:]
+UTILISATEUR_COLUMNS_BY_NAME = {column.key: column for column in UTILISATEUR_RESPONSE_COLUMNS}  # Champ de l'API -> colonne
+
+
+def utilisateur_cache_key(id: int) -> str:
+    """
+    :param id: Identifiant de l'utilisateur
+    :return: La clé de l'utilisateur dans le cache
+    """
+    return f"utilisateur:{id}"
+
+
+def utilisateurs_changed(*ids: int):
+    """
+    À appeler après chaque écriture validée sur les utilisateurs :
+    incrémente la version de la table et invalide les utilisateurs concernés (et leurs ETags) dans le cache.
+    :param ids: Identifiants des utilisateurs modifiés ou supprimés
+    """
+    bump_version("utilisateurs")  # Avant l'invalidation : une lecture en cours ne remet pas l'ancienne valeur en cache
+    keys = [utilisateur_cache_key(id) for id in ids]
+    invalidate(*keys, *(etag_cache_key(key) for key in keys))
+
+
+@profiled("orm")
 def get_all_utilisateurs(db: Session):
     """
     Récupère tous les utilisateurs depuis la base de données.
@@ -12,6 +54,73 @@ def get_all_utilisateurs(db: Session):
     return list(db.query(Utilisateur).all())  # Exécution de la requête pour récupérer tous les utilisateurs
 
 
+@profiled("orm")
+def get_utilisateurs_page(db: Session, limit: int, after: int | None = None, username: str | None = None):
+    """
+    Récupère une page d'utilisateurs triés par `code_utilisateur` (pagination par curseur / keyset).
+    :param db: Session de base de données
+    :param limit: Nombre maximal d'utilisateurs à retourner
+    :param after: Dernier `code_utilisateur` de la page précédente (None pour la première page)
+    :param username: Filtre exact sur le username
+    :return: Tuple (liste des utilisateurs, curseur de la page suivante ou None)
+    """
+    stmt = _filter_utilisateurs(select(Utilisateur), after, username)
+    # On lit une ligne de plus que demandé pour savoir s'il existe une page suivante
+    utilisateurs = db.execute(stmt.limit(limit + 1)).scalars().all()
+    if len(utilisateurs) > limit:
+        utilisateurs = utilisateurs[:limit]  # Retire la ligne supplémentaire
+        return utilisateurs, utilisateurs[-1].code_utilisateur  # Curseur de la page suivante
+    return utilisateurs, None  # Dernière page : pas de curseur suivant
+
+
+@profiled("orm")
+def get_utilisateur_rows_page(db: Session, limit: int, after: int | None = None, username: str | None = None,
+                              columns: tuple = UTILISATEUR_RESPONSE_COLUMNS):
+    """
+    Variante de `get_utilisateurs_page` qui lit les colonnes en tuples, sans construire d'objets ORM.
+    Les lignes ont la forme de UtilisateurResponse et sont prêtes à être encodées en JSON.
+    :param db: Session de base de données
+    :param limit: Nombre maximal d'utilisateurs à retourner
+    :param after: Dernier `code_utilisateur` de la page précédente (None pour la première page)
+    :param username: Filtre exact sur le username
+    :param columns: Colonnes à lire (toutes les colonnes exposées par défaut)
+    :return: Tuple (liste de dictionnaires colonne -> valeur, curseur de la page suivante ou None)
+    """
+    stmt = _filter_utilisateurs(select(Utilisateur.code_utilisateur, *columns), after, username)
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]  # Retire la ligne supplémentaire
+        next_cursor = rows[-1][0]  # code_utilisateur sert uniquement de curseur
+    keys = [column.key for column in columns]
+    return [dict(zip(keys, row[1:])) for row in rows], next_cursor
+
+
+def _filter_utilisateurs(stmt, after: int | None, username: str | None):
+    """
+    Applique le curseur, le filtre et le tri d'une page d'utilisateurs à une requête.
+    :param stmt: Requête `select` sur les utilisateurs (entités ou colonnes)
+    :return: Requête filtrée et triée par `code_utilisateur`
+    """
+    if after is not None:
+        stmt = stmt.where(Utilisateur.code_utilisateur > after)  # Reprend après le dernier utilisateur lu
+    if username:
+        stmt = stmt.where(Utilisateur.username == username)  # Filtre sur le username
+    return stmt.order_by(Utilisateur.code_utilisateur)
+
+
+def iter_utilisateurs(db: Session, batch_size: int = 1000):
+    """
+    Parcourt tous les utilisateurs, triés par `code_utilisateur`, sans les charger tous en mémoire.
+    :param db: Session de base de données
+    :param batch_size: Nombre de lignes lues par aller-retour (curseur côté serveur)
+    :return: Itérateur de dictionnaires (une entrée par colonne)
+    """
+    stmt = select(*UTILISATEUR_COLUMNS).order_by(Utilisateur.code_utilisateur).execution_options(yield_per=batch_size)
+    return db.execute(stmt).mappings()  # Chaque ligne est un mapping colonne -> valeur
+
+
+@profiled("orm")
 def get_utilisateur_by_id(db: Session, id: int):
     """
     Récupère un utilisateur en fonction de son ID.
@@ -31,84 +140,185 @@ def get_utilisateur_by_id(db: Session, id: int):
         raise RuntimeError(f"Erreur lors de la récupération du utilisateur: {str(e)}")
 
 
+@profiled("orm")
+def find_utilisateur_by_id(db: Session, id: int):
+    """
+    Récupère un utilisateur en fonction de son ID, sans lever d'exception s'il n'existe pas.
+    :param db: Session de base de données
+    :param id: Identifiant du utilisateur
+    :return: utilisateur correspondant à l'ID ou None
+    """
+    return db.get(Utilisateur, id)
+
+
+@profiled("orm")
+def find_utilisateurs_by_ids(db: Session, ids: list[int]):
+    """
+    Récupère plusieurs utilisateurs en une seule requête (WHERE code_utilisateur IN (...)).
+    :param db: Session de base de données
+    :param ids: Identifiants des utilisateurs
+    :return: Liste des utilisateurs existants (dans un ordre quelconque)
+    """
+    return db.execute(select(Utilisateur).where(Utilisateur.code_utilisateur.in_(ids))).scalars().all()
+
+
+@profiled("orm")
+def find_utilisateur_by_username(db: Session, username: str):
+    """
+    Récupère un utilisateur par son username (recherche sur l'index unique du username).
+    :param db: Session de base de données
+    :param username: Username recherché
+    :return: utilisateur correspondant ou None
+    """
+    return db.execute(select(Utilisateur).where(Utilisateur.username == username)).scalars().first()
+
+
+def username_taken(username: str) -> HTTPException:
+    """
+    :param username: Username déjà utilisé
+    :return: L'erreur 400 renvoyée quand l'index unique du username refuse une écriture
+    """
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"L'utilisateur avec le username '{username}' existe déjà."
+    )
+
+
 def create_utilisateur(db: Session, utilisateur_data: dict):
     """
-    Crée un nouvel utilisateur dans la base de données.
-    Vérifie si le `username` existe déjà avant de procéder à la création.
-    
+    Crée un nouvel utilisateur avec une seule requête INSERT ... RETURNING.
+    L'unicité du `username` est garantie par l'index unique de la base (voir src/indexes.py) :
+    un doublon est refusé par l'INSERT lui-même, sans SELECT préalable ni course entre deux créations.
+
     :param db: Session de base de données
     :param utilisateur_data: Dictionnaire des données de l'utilisateur (par exemple, nom, prénom, username)
-    :return: L'utilisateur nouvellement créé
-    :raises HTTPException: Si le `username` existe déjà ou en cas d'autres erreurs
+    :return: Les colonnes de l'utilisateur nouvellement créé
+    :raises HTTPException: 400 si le `username` existe déjà, 500 en cas d'autres erreurs
     """
+    # Ajoute une date d'inscription par défaut si elle n'est pas fournie
+    if not utilisateur_data.get("date_insc_utilisateur"):
+        utilisateur_data["date_insc_utilisateur"] = date.today()
+
+    stmt = insert(Utilisateur).values(**utilisateur_data).returning(*UTILISATEUR_COLUMNS)
     try:
-        # Vérifie si un utilisateur avec le même username existe déjà
-        existing_user = db.query(Utilisateur).filter(Utilisateur.username == utilisateur_data.get("username")).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"L'utilisateur avec le username '{utilisateur_data['username']}' existe déjà."
-            )
-
-        # Ajoute une date d'inscription par défaut si elle n'est pas fournie
-        if not utilisateur_data.get("date_insc_utilisateur"):
-            utilisateur_data["date_insc_utilisateur"] = date.today()
-
-        # Crée un nouvel utilisateur avec les données fournies
-        new_utilisateur = Utilisateur(**utilisateur_data)
-        db.add(new_utilisateur)  # Ajoute l'utilisateur à la session
+        utilisateur = db.execute(stmt).mappings().one()
         db.commit()  # Effectue la transaction
-        db.refresh(new_utilisateur)  # Rafraîchit l'objet pour obtenir l'état mis à jour
-
-        return new_utilisateur  # Retourne l'utilisateur créé
-    except HTTPException:
-        raise  # Relève l'exception pour la gérer plus haut
     except Exception as e:
         db.rollback()  # Annule la transaction en cas d'erreur
+        if isinstance(e, IntegrityError) and is_unique_violation(e, Utilisateur.username):
+            raise username_taken(utilisateur_data.get("username"))  # Doublon refusé par l'index unique
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de la création de l'utilisateur : {str(e)}"
         )
-
-
+    utilisateurs_changed()  # Les listes d'utilisateurs ont changé
+    utilisateur_changes.publish("created", utilisateur["code_utilisateur"])
+    return dict(utilisateur)  # Retourne l'utilisateur créé
 
 
 def update_utilisateur(db: Session, utilisateur_id: int, utilisateur_data: dict):
-    utilisateur = db.query(Utilisateur).filter(Utilisateur.code_utilisateur == utilisateur_id).first()
-    
-    if utilisateur is None:
-        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    
-    for key, value in utilisateur_data.items():
-        setattr(utilisateur, key, value)
-    
+    """
+    Met à jour un utilisateur avec une seule requête UPDATE ... RETURNING.
+    :param db: Session de base de données
+    :param utilisateur_id: ID de l'utilisateur à mettre à jour
+    :param utilisateur_data: Nouvelles données de l'utilisateur
+    :return: Les colonnes de l'utilisateur mis à jour, ou None s'il n'existe pas
+    :raises HTTPException: 400 si le username est déjà pris, 500 en cas d'erreur lors de la mise à jour
+    """
+    stmt = (
+        update(Utilisateur)
+        .where(Utilisateur.code_utilisateur == utilisateur_id)
+        .values(**utilisateur_data)
+        .returning(*UTILISATEUR_COLUMNS)
+        .execution_options(synchronize_session=False)  # Pas de synchronisation (ni de SELECT) avec la session
+    )
     try:
+        utilisateur = db.execute(stmt).mappings().first()  # Aucune ligne renvoyée si l'utilisateur n'existe pas
         db.commit()  # Effectuer la mise à jour
-        db.refresh(utilisateur)  # Rafraîchir les données de l'instance
     except Exception as e:
         db.rollback()  # Annuler en cas d'erreur
+        if isinstance(e, IntegrityError) and is_unique_violation(e, Utilisateur.username):
+            raise username_taken(utilisateur_data.get("username"))  # Username déjà pris par un autre utilisateur
         raise HTTPException(status_code=500, detail=f"Erreur lors de la mise à jour du utilisateur: {str(e)}")
-    return utilisateur
-def delete_utilisateur(db: Session, utilisateur_id: int):
+    if utilisateur is None:
+        return None
+    utilisateurs_changed(utilisateur_id)  # La version en cache est désormais obsolète
+    utilisateur_changes.publish("updated", utilisateur_id)
+    return dict(utilisateur)
+
+
+def patch_utilisateur(db: Session, utilisateur_id: int, changes: dict, if_match: str | None = None):
     """
-    Supprime un utilisateur de la base de données.
+    Met à jour uniquement les champs fournis d'un utilisateur.
+    L'ORM n'émet un UPDATE que pour les colonnes dont la valeur change réellement.
+    Si `if_match` est fourni, la ligne est verrouillée (SELECT ... FOR UPDATE) et son ETag comparé avant la modification.
+    Si rien ne change (corps vide, valeurs identiques), l'utilisateur courant est renvoyé sans invalider le cache
+    ni publier d'événement.
     :param db: Session de base de données
-    :param utilisateur_id: ID de l'utilisateur à supprimer
-    :raises HTTPException: Si l'utilisateur n'existe pas
+    :param utilisateur_id: ID de l'utilisateur à modifier
+    :param changes: Champs à modifier (`model_dump(exclude_unset=True)`)
+    :param if_match: Valeur de l'en-tête If-Match, ou None
+    :return: Le JSON de l'utilisateur modifié, ou None s'il n'existe pas
+    :raises HTTPException: 400 si le username est déjà pris, 412 si l'utilisateur a été modifié entre-temps, 500 en cas d'erreur
     """
-    # Chercher l'utilisateur dans la base de données
-    utilisateur = db.query(Utilisateur).filter(Utilisateur.code_utilisateur == utilisateur_id).first()
+    query = db.query(Utilisateur).filter(Utilisateur.code_utilisateur == utilisateur_id)
+    if if_match is not None:
+        query = query.with_for_update()  # Verrouille la ligne jusqu'au commit
+    try:
+        utilisateur = query.first()
+        if utilisateur is None:
+            db.rollback()
+            return None
+        if if_match is not None:
+            current_etag = entity_etag(entity_json(UtilisateurResponse, utilisateur))
+            if not etag_matches(if_match, current_etag):
+                db.rollback()  # Libère le verrou
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail="Utilisateur modifié par une autre requête",
+                    headers={"ETag": current_etag},
+                )
+        for key, value in changes.items():
+            setattr(utilisateur, key, value)
+        modified = db.is_modified(utilisateur)
+        db.flush()  # UPDATE limité aux colonnes modifiées (aucun UPDATE si rien ne change)
+        payload = entity_json(UtilisateurResponse, utilisateur)  # Sérialisé avant le commit
+        db.commit()
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()  # Annuler en cas d'erreur
+        if isinstance(e, IntegrityError) and is_unique_violation(e, Utilisateur.username):
+            raise username_taken(changes.get("username"))  # Username déjà pris par un autre utilisateur
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la mise à jour du utilisateur: {str(e)}")
+    if not modified:
+        return payload  # Aucune écriture : version de la table et flux inchangés
+    utilisateurs_changed(utilisateur_id)  # La version en cache est désormais obsolète
+    utilisateur_changes.publish("updated", utilisateur_id)
+    return payload
 
-    # Vérifier si l'utilisateur existe
-    if utilisateur is None:
-        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
 
-    # Essayer de supprimer l'utilisateur
+def delete_utilisateur(db: Session, utilisateur_id: int):
+    """
+    Supprime un utilisateur avec une seule requête DELETE.
+    :param db: Session de base de données
+    :param utilisateur_id: ID de l'utilisateur à supprimer
+    :return: True si l'utilisateur a été supprimé, False s'il n'existe pas
+    :raises HTTPException: En cas d'erreur lors de la suppression
+    """
+    stmt = (
+        delete(Utilisateur)
+        .where(Utilisateur.code_utilisateur == utilisateur_id)
+        .execution_options(synchronize_session=False)
+    )
     try:
-        db.delete(utilisateur)  # Supprime l'utilisateur
+        deleted = db.execute(stmt).rowcount  # Nombre de lignes supprimées (0 si l'utilisateur n'existe pas)
         db.commit()  # Valide la transaction
     except Exception as e:
         db.rollback()  # Annule la transaction en cas d'erreur
         raise HTTPException(status_code=500, detail=f"Erreur lors de la suppression du utilisateur: {str(e)}")
-
-    return {"detail": "Utilisateur supprimé avec succès"}
\ No newline at end of file
+    if not deleted:
+        return False
+    utilisateurs_changed(utilisateur_id)  # L'utilisateur ne doit plus être servi depuis le cache
+    utilisateur_changes.publish("deleted", utilisateur_id)
+    return True
@@ -0,0 +1,173 @@
+# repositories/utilisateurs_repository_async.py
+from datetime import date
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select, update  # Construction des requêtes
+from sqlalchemy.exc import IntegrityError  # Violation de contrainte (ex. username déjà utilisé)
+from sqlalchemy.ext.asyncio import AsyncSession  # Session asynchrone
+from src.models import Utilisateur  # Importation du modèle utilisateur depuis le module models
+from src.indexes import is_unique_violation  # Unicité du username garantie par un index unique
+from src.repositories.utilisateurs_repository import (  # Colonnes, filtres communs et invalidation du cache / des ETags
+    UTILISATEUR_COLUMNS,
+    UTILISATEUR_RESPONSE_COLUMNS,
+    _filter_utilisateurs,
+    username_taken,
+    utilisateurs_changed,
+)
+from src.services.change_feed import utilisateur_changes  # Flux des modifications (GET /utilisateurs/changes)
+from src.services.profiling import profiled  # Temps de chargement (ORM) des requêtes profilées
+
+
+@profiled("orm")
+async def get_utilisateurs_page(db: AsyncSession, limit: int, after: int | None = None, username: str | None = None):
+    """
+    Version asynchrone de `get_utilisateurs_page` (pagination par curseur sur `code_utilisateur`).
+    :param db: Session asynchrone
+    :param limit: Nombre maximal d'utilisateurs à retourner
+    :param after: Dernier `code_utilisateur` de la page précédente
+    :param username: Filtre exact sur le username
+    :return: Tuple (liste des utilisateurs, curseur de la page suivante ou None)
+    """
+    stmt = _filter_utilisateurs(select(Utilisateur), after, username)
+    # On lit une ligne de plus que demandé pour savoir s'il existe une page suivante
+    result = await db.execute(stmt.limit(limit + 1))
+    utilisateurs = list(result.scalars().all())
+    if len(utilisateurs) > limit:
+        utilisateurs = utilisateurs[:limit]
+        return utilisateurs, utilisateurs[-1].code_utilisateur
+    return utilisateurs, None
+
+
+@profiled("orm")
+async def get_utilisateur_rows_page(db: AsyncSession, limit: int, after: int | None = None, username: str | None = None,
+                                    columns: tuple = UTILISATEUR_RESPONSE_COLUMNS):
+    """
+    Version asynchrone de `get_utilisateur_rows_page` (colonnes lues en tuples, sans objets ORM).
+    :return: Tuple (liste de dictionnaires colonne -> valeur, curseur de la page suivante ou None)
+    """
+    stmt = _filter_utilisateurs(select(Utilisateur.code_utilisateur, *columns), after, username)
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1][0]
+    keys = [column.key for column in columns]
+    return [dict(zip(keys, row[1:])) for row in rows], next_cursor
+
+
+@profiled("orm")
+async def find_utilisateur_by_id(db: AsyncSession, id: int):
+    """
+    Version asynchrone de `find_utilisateur_by_id`.
+    :param db: Session asynchrone
+    :param id: Identifiant du utilisateur
+    :return: utilisateur correspondant à l'ID ou None
+    """
+    return await db.get(Utilisateur, id)
+
+
+@profiled("orm")
+async def find_utilisateurs_by_ids(db: AsyncSession, ids: list[int]):
+    """
+    Version asynchrone de `find_utilisateurs_by_ids` (une seule requête IN).
+    :param db: Session asynchrone
+    :param ids: Identifiants des utilisateurs
+    :return: Liste des utilisateurs existants
+    """
+    return (await db.execute(select(Utilisateur).where(Utilisateur.code_utilisateur.in_(ids)))).scalars().all()
+
+
+@profiled("orm")
+async def find_utilisateur_by_username(db: AsyncSession, username: str):
+    """
+    Version asynchrone de `find_utilisateur_by_username` (index unique du username).
+    :param db: Session asynchrone
+    :param username: Username recherché
+    :return: utilisateur correspondant ou None
+    """
+    return (await db.execute(select(Utilisateur).where(Utilisateur.username == username))).scalars().first()
+
+
+async def create_utilisateur(db: AsyncSession, utilisateur_data: dict):
+    """
+    Version asynchrone de `create_utilisateur` (une seule requête INSERT ... RETURNING).
+    :param db: Session asynchrone
+    :param utilisateur_data: Dictionnaire des données de l'utilisateur
+    :return: Les colonnes de l'utilisateur nouvellement créé
+    :raises HTTPException: 400 si le `username` existe déjà, 500 en cas d'autres erreurs
+    """
+    # Ajoute une date d'inscription par défaut si elle n'est pas fournie
+    if not utilisateur_data.get("date_insc_utilisateur"):
+        utilisateur_data["date_insc_utilisateur"] = date.today()
+
+    stmt = insert(Utilisateur).values(**utilisateur_data).returning(*UTILISATEUR_COLUMNS)
+    try:
+        utilisateur = (await db.execute(stmt)).mappings().one()
+        await db.commit()  # Effectue la transaction
+    except Exception as e:
+        await db.rollback()  # Annule la transaction en cas d'erreur
+        if isinstance(e, IntegrityError) and is_unique_violation(e, Utilisateur.username):
+            raise username_taken(utilisateur_data.get("username"))  # Doublon refusé par l'index unique
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la création de l'utilisateur : {str(e)}"
+        )
+    utilisateurs_changed()  # Les listes d'utilisateurs ont changé
+    utilisateur_changes.publish("created", utilisateur["code_utilisateur"])
+    return dict(utilisateur)
+
+
+async def update_utilisateur(db: AsyncSession, utilisateur_id: int, utilisateur_data: dict):
+    """
+    Version asynchrone de `update_utilisateur` (une seule requête UPDATE ... RETURNING).
+    :param db: Session asynchrone
+    :param utilisateur_id: ID de l'utilisateur à mettre à jour
+    :param utilisateur_data: Nouvelles données
+    :return: Les colonnes de l'utilisateur mis à jour, ou None s'il n'existe pas
+    :raises HTTPException: 400 si le username est déjà pris, 500 en cas d'erreur lors de la mise à jour
+    """
+    stmt = (
+        update(Utilisateur)
+        .where(Utilisateur.code_utilisateur == utilisateur_id)
+        .values(**utilisateur_data)
+        .returning(*UTILISATEUR_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        utilisateur = (await db.execute(stmt)).mappings().first()
+        await db.commit()  # Effectuer la mise à jour
+    except Exception as e:
+        await db.rollback()  # Annuler en cas d'erreur
+        if isinstance(e, IntegrityError) and is_unique_violation(e, Utilisateur.username):
+            raise username_taken(utilisateur_data.get("username"))  # Username déjà pris par un autre utilisateur
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la mise à jour du utilisateur: {str(e)}")
+    if utilisateur is None:
+        return None
+    utilisateurs_changed(utilisateur_id)  # La version en cache est désormais obsolète
+    utilisateur_changes.publish("updated", utilisateur_id)
+    return dict(utilisateur)
+
+
+async def delete_utilisateur(db: AsyncSession, utilisateur_id: int):
+    """
+    Version asynchrone de `delete_utilisateur` (une seule requête DELETE).
+    :param db: Session asynchrone
+    :param utilisateur_id: ID de l'utilisateur à supprimer
+    :return: True si l'utilisateur a été supprimé, False s'il n'existe pas
+    :raises HTTPException: En cas d'erreur lors de la suppression
+    """
+    stmt = (
+        delete(Utilisateur)
+        .where(Utilisateur.code_utilisateur == utilisateur_id)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        deleted = (await db.execute(stmt)).rowcount
+        await db.commit()  # Valide la transaction
+    except Exception as e:
+        await db.rollback()  # Annule la transaction en cas d'erreur
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la suppression du utilisateur: {str(e)}")
+    if not deleted:
+        return False
+    utilisateurs_changed(utilisateur_id)  # L'utilisateur ne doit plus être servi depuis le cache
+    utilisateur_changes.publish("deleted", utilisateur_id)
+    return True
@@ -0,0 +1,177 @@
+# routers/monitoring_router.py
+from fastapi import APIRouter, Header, HTTPException, status  # Importation de FastAPI
+from fastapi.responses import PlainTextResponse  # Réponse texte (format Prometheus)
+from src.services.cache import get_cache  # Importation du cache partagé par les services
+from src.services.pool_metrics import pool_stats  # Importation des compteurs des pools de connexions
+from src.services.metrics import registry  # Importation du registre des métriques HTTP et SQL
+from src.services.search_index import objet_search_index  # Importation de l'index de recherche des objets
+from src.services.compression import compression_stats  # Importation des compteurs de la compression des réponses
+from src.services.admission import admission_stats  # Importation des compteurs du contrôle d'admission
+from src.services.single_flight import single_flight  # Importation des compteurs du regroupement des lectures
+from src.services.write_behind import get_objet_counters  # Importation du tampon des compteurs des objets
+from src.database_replicas import get_replica_router  # Importation du répartiteur des lectures entre réplicas
+from src.services.profiling import profile_store, profiling_allowed, slow_query_log  # Importation des profils et des requêtes lentes
+from src.services.change_feed import objet_changes, utilisateur_changes  # Importation des flux des modifications
+
+router_monitoring = APIRouter()  # Création d'un routeur pour les routes de supervision
+
+
+# Route pour consulter les compteurs du cache
+@router_monitoring.get("/cache/stats")
+def get_cache_stats():
+    """
+    Retourne les compteurs du cache (hits, misses, évictions).
+    :return: Dictionnaire des compteurs
+    """
+    return get_cache().stats()  # Compteurs du backend de cache configuré
+
+
+# Route pour consulter l'état des pools de connexions
+@router_monitoring.get("/pool/stats")
+def get_pool_stats():
+    """
+    Retourne l'état et les compteurs des pools de connexions (attente, connexions utilisées, débordements).
+    :return: Dictionnaire des compteurs, par engine
+    """
+    return pool_stats()  # Compteurs de chaque engine instrumenté
+
+
+# Route pour consulter l'état de l'index de recherche
+@router_monitoring.get("/search/stats")
+def get_search_stats():
+    """
+    Retourne la taille et les compteurs de l'index de recherche des objets en mémoire.
+    :return: Dictionnaire des compteurs
+    """
+    return objet_search_index.stats()
+
+
+# Route pour consulter les compteurs de la compression des réponses
+@router_monitoring.get("/compression/stats")
+def get_compression_stats():
+    """
+    Retourne les compteurs de la compression (réponses compressées, octets avant / après, cache des corps compressés).
+    :return: Dictionnaire des compteurs
+    """
+    return compression_stats.as_dict()
+
+
+# Route pour consulter les compteurs du contrôle d'admission
+@router_monitoring.get("/admission/stats")
+def get_admission_stats():
+    """
+    Retourne les compteurs du contrôle d'admission (requêtes admises, refus 429 par budget, plafonds de concurrence).
+    :return: Dictionnaire des compteurs
+    """
+    return admission_stats.as_dict()
+
+
+# Route pour consulter les compteurs du regroupement des lectures identiques (single-flight)
+@router_monitoring.get("/coalescing/stats")
+def get_coalescing_stats():
+    """
+    Retourne les compteurs du regroupement des lectures (lectures exécutées, requêtes servies par la lecture
+    d'une autre, erreurs, lectures en cours).
+    :return: Dictionnaire des compteurs
+    """
+    return single_flight.stats()
+
+
+# Route pour consulter l'état du tampon d'écriture différée des compteurs des objets
+@router_monitoring.get("/write-behind/stats")
+def get_write_behind_stats():
+    """
+    Retourne la profondeur du tampon (objets en attente, ancienneté du plus vieil incrément)
+    et les compteurs des écritures (nombre, lignes, erreurs, durées).
+    :return: Dictionnaire des compteurs
+    """
+    return get_objet_counters().stats()
+
+
+# Route pour consulter la répartition des lectures entre les réplicas
+@router_monitoring.get("/replicas/stats")
+def get_replicas_stats():
+    """
+    Retourne la répartition des lectures (base principale, clients épinglés après une écriture)
+    et l'état de chaque réplica (disponible, sessions ouvertes, lectures, échecs).
+    :return: Dictionnaire des compteurs
+    """
+    return get_replica_router().stats()
+
+
+# Route pour consulter l'état des flux des modifications
+@router_monitoring.get("/changes/stats")
+def get_changes_stats():
+    """
+    Retourne, pour chaque flux des modifications, le dernier numéro publié, les événements conservés
+    pour la reprise, les abonnés connectés et les abonnés déconnectés car trop lents.
+    :return: Dictionnaire des compteurs, par flux
+    """
+    return {feed.name: feed.stats() for feed in (objet_changes, utilisateur_changes)}
+
+
+# Route pour consulter les dernières requêtes SQL lentes
+@router_monitoring.get("/slow-queries")
+def get_slow_queries():
+    """
+    Retourne le seuil et les compteurs du journal des requêtes lentes, ainsi que les dernières requêtes
+    au-dessus du seuil (texte SQL, durée, plan d'exécution si SLOW_QUERY_EXPLAIN est activé).
+    :return: Dictionnaire des compteurs et des requêtes lentes
+    """
+    return {**slow_query_log.stats(), "entries": slow_query_log.entries()}
+
+
+# Route pour consulter le profil d'une requête (identifiant renvoyé dans l'en-tête X-Profile-Id)
+@router_monitoring.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, x_profile: str | None = Header(default=None)):
+    """
+    Retourne le profil d'une requête : temps propre de chaque phase et requêtes SQL exécutées.
+    Réservé aux appelants autorisés (même en-tête X-Profile que pour demander le profil).
+    :param profile_id: Identifiant du profil
+    :param x_profile: Jeton de profilage
+    :return: Profil de la requête
+    """
+    profile = profile_store.get(profile_id) if profiling_allowed(x_profile) else None
+    if profile is None:
+        # 404 aussi sans jeton valide : l'existence des profils n'est pas révélée
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profil introuvable")
+    return profile.as_dict()
+
+
+# Route pour exposer les métriques au format Prometheus
+@router_monitoring.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Retourne les métriques HTTP et SQL par route, ainsi que les compteurs du cache et des pools,
+    au format texte Prometheus.
+    :return: Métriques au format texte
+    """
+    lines = [registry.render()]
+    for name, value in get_cache().stats().items():
+        if isinstance(value, (int, float)):
+            lines.append(f"cache_{name} {value}\n")
+    for name, value in objet_search_index.stats().items():
+        lines.append(f"search_index_{name} {int(value)}\n")
+    for name, value in compression_stats.as_dict().items():
+        lines.append(f"compression_{name} {value}\n")
+    for name, value in admission_stats.as_dict().items():
+        lines.append(f"admission_{name} {value}\n")
+    for name, value in single_flight.stats().items():
+        lines.append(f"coalescing_{name} {value}\n")
+    for name, value in get_objet_counters().stats().items():
+        lines.append(f"write_behind_{name} {value}\n")
+    for feed in (objet_changes, utilisateur_changes):
+        for name, value in feed.stats().items():
+            lines.append(f'change_feed_{name}{{feed="{feed.name}"}} {value}\n')
+    for name, value in slow_query_log.stats().items():
+        lines.append(f"slow_queries_{name} {value}\n")
+    replica_stats = get_replica_router().stats()
+    for name in ("primary_reads", "pinned_reads", "pinned_clients"):
+        lines.append(f"db_{name} {replica_stats[name]}\n")
+    for replica_name, stats in replica_stats["replicas"].items():
+        for name, value in stats.items():
+            lines.append(f'db_replica_{name}{{replica="{replica_name}"}} {value}\n')
+    for engine_name, stats in pool_stats().items():
+        for name, value in {**stats.pop("pool"), **stats}.items():
+            lines.append(f'db_pool_{name}{{engine="{engine_name}"}} {value}\n')
+    return PlainTextResponse("".join(lines), media_type="text/plain; version=0.0.4")
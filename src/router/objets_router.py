@@ -1,19 +1,44 @@
 # routers/objets_router.py
-from fastapi import APIRouter, Depends, HTTPException, status  # Importation de FastAPI et des exceptions HTTP
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status  # Importation de FastAPI et des exceptions HTTP
 from sqlalchemy.orm import Session  # Importation de Session pour interagir avec la base de données via SQLAlchemy
 from src.services.objets_services import (
     create_objet,            # Service pour créer un objet
-    get_all_objets,          # Service pour récupérer tous les objets
-    get_objet_by_id,         # Service pour récupérer un objet par son ID
+    get_objets_page_json,    # Service pour récupérer une page d'objets sérialisée (lectures simultanées regroupées)
+    iter_objets,             # Service pour parcourir tous les objets (export)
+    get_objet_json,          # Service pour récupérer un objet sérialisé (avec cache)
+    get_objets_json_by_ids,  # Service pour récupérer plusieurs objets sérialisés (cache, puis requêtes IN)
     update_objet,            # Service pour mettre à jour un objet
-    delete_objet             # Service pour supprimer un objet
+    patch_objet,             # Service pour mettre à jour partiellement un objet
+    PreconditionFailed,      # Erreur levée si l'objet a été modifié entre-temps (If-Match)
+    delete_objet,            # Service pour supprimer un objet
+    bulk_create_objets,      # Service pour créer des objets en masse
+    bulk_update_objets,      # Service pour mettre à jour des objets en masse
+    bulk_delete_objets,      # Service pour supprimer des objets en masse
+    search_objets,           # Service pour rechercher des objets par libellé
+    objet_cache_key,         # Clé d'un objet dans le cache
+    OBJET_LIST_FIELDS        # Champs d'une liste d'objets sans la relation `condit`
 )
-from src.schemas.objet import ObjetCreate, ObjetResponse  # Importation des schémas de données pour la validation des entrées et sorties
+from src.schemas.objet import ObjetBatchResponse, ObjetBulkResponse, ObjetBulkUpdate, ObjetCreate, ObjetIncrement, ObjetIncrementAccepted, ObjetPatch, ObjetResponse  # Importation des schémas de données pour la validation des entrées et sorties
+from fastapi.responses import StreamingResponse  # Réponse envoyée par morceaux
+from src.services.export_services import EXPORT_FORMATS, stream_export  # Export en streaming
+from src.services.batch_lookup import MAX_BATCH_IDS, batch_json, parse_ids  # Lectures groupées par identifiants
+from src.services.sparse_fields import parse_fields, parse_include, sparse_response  # Réponses réduites aux champs demandés (fields=)
+from src.services.write_behind import BufferFull, get_objet_counters  # Compteurs des objets écrits en différé (write-behind)
+from src.services.change_feed import DEFAULT_POLL_TIMEOUT, MAX_POLL_TIMEOUT, changes_response, objet_changes  # Flux des modifications
+from src.services.versions import conditional_headers, entity_etag, entity_headers, is_not_modified  # ETag / requêtes conditionnelles
+from src.services.cache import get_cached_etag  # ETag mis en cache avec l'entité (304 sans la relire)
 from src.database import get_db  # Importation de la fonction pour récupérer une session de base de données
+from src.database_replicas import get_read_db  # Session de lecture sur un réplica (routes en lecture seule)
 
 # Définir le routeur pour les objets
 router_objet = APIRouter()  # Création d'un routeur pour les routes liées aux objets
 
+OBJET_RELATIONS = frozenset({"condit"})  # Relations pouvant être demandées avec include=
+DEFAULT_PAGE_SIZE = 100  # Taille de page par défaut pour les listes d'objets
+MAX_PAGE_SIZE = 1000  # Taille de page maximale autorisée
+MAX_BULK_SIZE = 10000  # Nombre maximal de lignes par opération en masse
+DEFAULT_SEARCH_SIZE = 20  # Nombre de résultats par défaut d'une recherche
+
 
 # Route pour créer un nouvel objet
 @router_objet.post("/", response_model=ObjetResponse, status_code=status.HTTP_201_CREATED)
@@ -27,31 +52,230 @@ def create_new_objet(objet_data: ObjetCreate, db: Session = Depends(get_db)):
     return create_objet(db=db, objet_data=objet_data)  # Appelle la fonction service pour créer l'objet
 
 
-# Route pour récupérer tous les objets
+# Route pour récupérer les objets page par page
 @router_objet.get("/", response_model=list[ObjetResponse])
-def get_all(db: Session = Depends(get_db)):
+def get_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(None, description="Dernier codobj de la page précédente"),
+    libobj: str | None = Query(None, description="Préfixe du libellé"),
+    indispobj: int | None = None,
+    o_aff: int | None = None,
+    fields: str | None = Query(None, description="Champs renvoyés, séparés par des virgules (ex. codobj,libobj,puobj)"),
+    include: str | None = Query(None, description="Relations à inclure (condit)"),
+    ids: str | None = Query(None, description="Identifiants séparés par des virgules : lecture groupée (ex. 12,15,20)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Récupère une page d'objets (pagination par curseur sur `codobj`).
+    Sans `limit`, seuls les 100 premiers objets sont renvoyés (et non plus toute la table) :
+    les pages suivantes se lisent avec `after`, tant que l'en-tête `X-Next-Cursor` est présent.
+    Avec `ids`, récupère ces objets en une seule requête (voir `batch_get`) ; les autres paramètres sont ignorés.
+    Le curseur de la page suivante est renvoyé dans l'en-tête `X-Next-Cursor`.
+    Si le client possède déjà cette page (If-None-Match / If-Modified-Since), renvoie 304 sans interroger la base.
+    Seules les colonnes de la table sont lues et renvoyées ; la relation `condit` est chargée
+    (sans N+1, voir CONDIT_LOADING) uniquement avec `include=condit` ou si `fields` la contient.
+    Avec `fields`, seules les colonnes demandées sont lues et renvoyées.
+    En mode SERIALIZATION=fast, les lignes sont encodées directement en JSON (sans validation Pydantic).
+    :param request: Requête HTTP (pour les en-têtes conditionnels)
+    :param limit: Nombre maximal d'objets par page
+    :param after: Curseur de la page précédente
+    :param libobj: Préfixe du libellé
+    :param indispobj: Filtre sur l'indisponibilité
+    :param o_aff: Filtre sur l'affichage
+    :param fields: Champs à renvoyer (tous si absent)
+    :param include: Relations à inclure ("condit")
+    :param ids: Identifiants des objets à récupérer (lecture groupée)
+    :param db: Session de base de données
+    :return: Liste des objets de la page
+    """
+    try:
+        selected = parse_fields(fields, ObjetResponse)
+        include_condit = "condit" in parse_include(include, OBJET_RELATIONS)
+        codobjs = parse_ids(ids) if ids is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = conditional_headers("objets", "list", request.url.query)  # Calculé sans lecture en base
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    if codobjs is not None:
+        return Response(content=batch_json(get_objets_json_by_ids(db, codobjs)), media_type="application/json", headers=headers)
+    if selected is None and not include_condit:
+        selected = OBJET_LIST_FIELDS  # Sans include=condit, la relation n'est pas chargée du tout
+    elif selected is not None and include_condit and "condit" not in selected:
+        selected = parse_fields(",".join(selected + ("condit",)), ObjetResponse)
+    # Seules les colonnes demandées sont lues (objets complets si `selected` vaut None), déjà sérialisées ;
+    # les requêtes identiques simultanées partagent la même lecture
+    content, next_cursor = get_objets_page_json(db, selected, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)  # Indique au client où reprendre
+    return Response(content=content, media_type="application/json", headers=headers)  # Retourne les objets de la page
+
+
+# Route pour rechercher des objets par libellé
+@router_objet.get("/search", response_model=list[ObjetResponse])
+def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Début des mots du libellé (ex. \"ech bleu\")"),
+    limit: int = Query(DEFAULT_SEARCH_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Recherche des objets par libellé : chaque mot de `q` doit commencer un mot du libellé,
+    sans tenir compte des accents ni des majuscules ("ech" trouve "Écharpe").
+    Les résultats sont classés par pertinence, sans la relation `condit`.
+    :param request: Requête HTTP (pour les en-têtes conditionnels)
+    :param q: Texte recherché
+    :param limit: Nombre maximal de résultats
+    :param db: Session de base de données
+    :return: Liste des objets trouvés
+    """
+    headers = conditional_headers("objets", "search", request.url.query)  # Calculé sans lecture en base
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return sparse_response(ObjetResponse, OBJET_LIST_FIELDS, search_objets(db, q, limit), headers)
+
+
+# Route pour exporter tous les objets en streaming
+@router_objet.get("/export")
+def export_objets(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$", description="ndjson ou json"),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Exporte tous les objets en streaming (NDJSON ou tableau JSON envoyé par morceaux).
+    Les lignes sont lues avec un curseur côté serveur : la mémoire reste constante quelle que soit la taille de la table.
+    :param format: Format de sortie
+    :param batch_size: Nombre de lignes lues et envoyées par lot
+    :param db: Session de base de données (fermée après l'envoi de la réponse)
+    :return: Réponse en streaming
+    """
+    return StreamingResponse(
+        stream_export(iter_objets, db, fmt=format, batch_size=batch_size),
+        media_type=EXPORT_FORMATS[format],
+    )
+
+
+# Route pour suivre les modifications des objets (SSE ou long-poll)
+@router_objet.get("/changes")
+async def objets_changes(
+    request: Request,
+    after: int | None = Query(None, ge=0, description="Dernier numéro d'événement reçu"),
+    timeout: float = Query(DEFAULT_POLL_TIMEOUT, gt=0, le=MAX_POLL_TIMEOUT, description="Attente maximale (long-poll)"),
+):
+    """
+    Flux des créations, modifications et suppressions d'objets, à la place de relectures complètes de la liste.
+    Avec `Accept: text/event-stream` : flux Server-Sent Events (reprise avec Last-Event-ID après une coupure).
+    Sinon, long-poll : renvoie les événements suivant `after`, en attendant au plus `timeout` secondes ;
+    sans `after`, renvoie la position courante. Si `reset` est vrai, des événements ont été perdus :
+    le client relit la liste, puis reprend à `last_seq`.
+    :param request: Requête HTTP (Accept, Last-Event-ID)
+    :param after: Dernier numéro d'événement reçu
+    :param timeout: Attente maximale en secondes
+    :return: Flux SSE, ou JSON {"events": [{seq, type, ids, at}], "last_seq", "reset"}
+    """
+    return await changes_response(objet_changes, request, after, timeout)
+
+
+# Route pour récupérer plusieurs objets par leurs ID
+@router_objet.post("/batch-get", response_model=ObjetBatchResponse)
+def batch_get(codobjs: list[int] = Body(..., min_length=1, max_length=MAX_BATCH_IDS), db: Session = Depends(get_read_db)):
+    """
+    Récupère plusieurs objets en un seul aller-retour : ceux en cache sans requête, les autres avec une requête
+    IN par lot. Les objets inexistants sont renvoyés à null et listés dans `not_found` (pas de 404).
+    :param codobjs: Identifiants des objets (les doublons sont ignorés)
+    :param db: Session de base de données
+    :return: Les objets par identifiant, et les identifiants introuvables
+    """
+    return Response(content=batch_json(get_objets_json_by_ids(db, codobjs)), media_type="application/json")
+
+
+# Route pour créer des objets en masse
+@router_objet.post("/bulk", response_model=ObjetBulkResponse, status_code=status.HTTP_201_CREATED)
+def create_objets_bulk(objets_data: list[ObjetCreate] = Body(..., max_length=MAX_BULK_SIZE), db: Session = Depends(get_db)):
     """
-    Récupère tous les objets depuis la base de données.
+    Crée plusieurs objets dans une seule transaction.
+    :param objets_data: Liste des objets à créer
     :param db: Session de base de données
-    :return: Liste de tous les objets
+    :return: Le résultat de chaque ligne
     """
-    return get_all_objets(db)  # Appelle la fonction service pour récupérer tous les objets
+    return {"results": bulk_create_objets(db, objets_data)}  # Appelle la fonction service de création en masse
+
+
+# Route pour mettre à jour des objets en masse
+@router_objet.put("/bulk", response_model=ObjetBulkResponse)
+def update_objets_bulk(objets_data: list[ObjetBulkUpdate] = Body(..., max_length=MAX_BULK_SIZE), db: Session = Depends(get_db)):
+    """
+    Met à jour plusieurs objets dans une seule transaction.
+    :param objets_data: Liste des objets à mettre à jour (avec leur `codobj`)
+    :param db: Session de base de données
+    :return: Le résultat de chaque ligne ("updated" ou "not_found")
+    """
+    return {"results": bulk_update_objets(db, objets_data)}  # Appelle la fonction service de mise à jour en masse
+
+
+# Route pour supprimer des objets en masse
+@router_objet.delete("/bulk", response_model=ObjetBulkResponse)
+def delete_objets_bulk(codobjs: list[int] = Body(..., max_length=MAX_BULK_SIZE), db: Session = Depends(get_db)):
+    """
+    Supprime plusieurs objets dans une seule transaction.
+    Un identifiant répété n'est supprimé qu'une fois : ses occurrences suivantes sont signalées "not_found".
+    :param codobjs: Identifiants des objets à supprimer
+    :param db: Session de base de données
+    :return: Le résultat de chaque ligne ("deleted" ou "not_found")
+    """
+    return {"results": bulk_delete_objets(db, codobjs)}  # Appelle la fonction service de suppression en masse
+
+
+# Route pour incrémenter les compteurs d'un objet
+@router_objet.post("/{codobj}/increment", response_model=ObjetIncrementAccepted, status_code=status.HTTP_202_ACCEPTED)
+def increment_objet(codobj: int, increment: ObjetIncrement):
+    """
+    Ajoute des valeurs aux compteurs d'un objet (points, o_imp, o_aff) sans accès à la base :
+    les incréments sont cumulés en mémoire et écrits par lots (voir WRITE_BEHIND_INTERVAL).
+    L'existence de l'objet n'est pas vérifiée : les incréments d'un objet inexistant sont ignorés à l'écriture.
+    Renvoie 503 si trop d'objets sont en attente d'écriture (base indisponible).
+    :param codobj: L'ID de l'objet
+    :param increment: Valeurs à ajouter
+    :return: Les incréments de l'objet en attente d'écriture
+    """
+    try:
+        pending = get_objet_counters().add(codobj, increment.model_dump())
+    except BufferFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many pending increments",
+            headers={"Retry-After": "1"},
+        )
+    return {"codobj": codobj, "pending": pending}
 
 
 # Route pour récupérer un objet par ID
 @router_objet.get("/{codobj}", response_model=ObjetResponse)
-def get_by_id(codobj: int, db: Session = Depends(get_db)):
+def get_by_id(codobj: int, request: Request, db: Session = Depends(get_read_db)):
     """
     Récupère un objet spécifique en fonction de son ID.
+    L'ETag est calculé à partir du JSON de l'objet et mis en cache à part : si le client est à jour,
+    renvoie 304 sans lire l'objet (ni en base, ni dans le cache) tant que l'ETag est en cache.
     :param codobj: L'ID de l'objet à récupérer
+    :param request: Requête HTTP (pour les en-têtes conditionnels)
     :param db: Session de base de données
     :return: L'objet correspondant à l'ID
     """
-    objet = get_objet_by_id(db=db, codobj=codobj)  # Appelle la fonction service pour récupérer l'objet par ID
-    if not objet:
+    if "if-none-match" in request.headers:
+        etag = get_cached_etag(objet_cache_key(codobj))  # 304 sans lire l'objet, même si son JSON a été évincé du cache
+        headers = entity_headers("objets", etag=etag) if etag else None
+        if headers and is_not_modified(request.headers, headers):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    objet_json = get_objet_json(db=db, codobj=codobj)  # Appelle la fonction service (avec cache) pour récupérer l'objet par ID
+    if not objet_json:
         # Si l'objet n'est pas trouvé, renvoie une erreur HTTP 404 (objet non trouvé)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objet not found")
-    return objet  # Retourne l'objet trouvé
+    headers = entity_headers("objets", objet_json)
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return Response(content=objet_json, media_type="application/json", headers=headers)  # Retourne l'objet déjà sérialisé
 
 
 # Route pour mettre à jour un objet par ID
@@ -71,6 +295,37 @@ def update_objet_by_id(codobj: int, updated_data: ObjetCreate, db: Session = Dep
     return objet  # Retourne l'objet mis à jour
 
 
+# Route pour mettre à jour partiellement un objet par ID
+@router_objet.patch("/{codobj}", response_model=ObjetResponse)
+def patch_objet_by_id(
+    codobj: int,
+    changes: ObjetPatch,
+    if_match: str | None = Header(None, description="ETag de l'objet lu (concurrence optimiste)"),
+    db: Session = Depends(get_db),
+):
+    """
+    Met à jour uniquement les champs envoyés d'un objet.
+    Avec If-Match, renvoie 412 si l'objet a été modifié depuis sa lecture.
+    :param codobj: L'ID de l'objet à modifier
+    :param changes: Champs à modifier
+    :param if_match: ETag attendu de l'objet
+    :param db: Session de base de données
+    :return: L'objet modifié, avec son nouvel ETag
+    """
+    try:
+        objet_json = patch_objet(db, codobj, changes.model_dump(exclude_unset=True), if_match=if_match)
+    except PreconditionFailed as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Objet modified by another request",
+            headers={"ETag": e.etag},
+        )
+    if not objet_json:
+        # Si l'objet n'est pas trouvé, renvoie une erreur HTTP 404 (objet non trouvé)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objet not found")
+    return Response(content=objet_json, media_type="application/json", headers={"ETag": entity_etag(objet_json)})
+
+
 # Route pour supprimer un objet par ID
 @router_objet.delete("/{codobj}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_objet_by_id(codobj: int, db: Session = Depends(get_db)):
@@ -80,10 +335,7 @@ def delete_objet_by_id(codobj: int, db: Session = Depends(get_db)):
     :param db: Session de base de données
     :return: Message de succès de suppression
     """
-    objet = get_objet_by_id(db=db, codobj=codobj)  # Vérifie si l'objet existe
-    if not objet:
+    if not delete_objet(db=db, codobj=codobj):  # 0 ligne supprimée par le DELETE => objet introuvable
         # Si l'objet n'est pas trouvé, renvoie une erreur HTTP 404 (objet non trouvé)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objet not found")
-    
-    delete_objet(db=db, codobj=codobj)  # Appelle la fonction service pour supprimer l'objet
     return {"message": "Objet deleted successfully"}  # Retourne un message de succès
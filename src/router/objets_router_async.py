@@ -0,0 +1,118 @@
+# routers/objets_router_async.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status  # Importation de FastAPI et des exceptions HTTP
+from sqlalchemy.ext.asyncio import AsyncSession  # Session asynchrone
+from src.services.objets_services_async import (
+    create_objet,            # Service pour créer un objet
+    get_objets_page_json,    # Service pour récupérer une page d'objets sérialisée (lectures simultanées regroupées)
+    get_objet_json,          # Service pour récupérer un objet sérialisé (avec cache)
+    get_objets_json_by_ids,  # Service pour récupérer plusieurs objets sérialisés (cache, puis requêtes IN)
+    update_objet,            # Service pour mettre à jour un objet
+    delete_objet             # Service pour supprimer un objet
+)
+from src.schemas.objet import ObjetCreate, ObjetResponse  # Importation des schémas de données
+from src.services.batch_lookup import batch_json, parse_ids  # Lectures groupées par identifiants
+from src.services.sparse_fields import parse_fields, parse_include  # Réponses réduites aux champs demandés (fields=)
+from src.services.versions import conditional_headers, entity_headers, is_not_modified  # ETag / requêtes conditionnelles
+from src.services.cache import get_cached_etag  # ETag mis en cache avec l'entité (304 sans la relire)
+from src.router.objets_router import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, OBJET_RELATIONS  # Mêmes bornes et relations qu'en synchrone
+from src.services.objets_services import OBJET_LIST_FIELDS, objet_cache_key  # Champs d'une liste d'objets sans la relation `condit` ; clé de cache
+from src.database_async import get_async_db  # Session asynchrone par requête
+
+# Routeur asynchrone des objets (DB_MODE=async).
+# Les identifiants utilisent le convertisseur `int` : les chemins fixes (/export, /bulk, /batch-get)
+# continuent d'être servis par le routeur synchrone monté après celui-ci.
+router_objet_async = APIRouter()
+
+
+# Route pour récupérer les objets page par page
+@router_objet_async.get("/", response_model=list[ObjetResponse])
+async def get_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(None, description="Dernier codobj de la page précédente"),
+    libobj: str | None = Query(None, description="Préfixe du libellé"),
+    indispobj: int | None = None,
+    o_aff: int | None = None,
+    fields: str | None = Query(None, description="Champs renvoyés, séparés par des virgules (ex. codobj,libobj,puobj)"),
+    include: str | None = Query(None, description="Relations à inclure (condit)"),
+    ids: str | None = Query(None, description="Identifiants séparés par des virgules : lecture groupée (ex. 12,15,20)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Version asynchrone de la liste paginée des objets (et de la lecture groupée avec `ids`).
+    :return: Liste des objets de la page
+    """
+    try:
+        selected = parse_fields(fields, ObjetResponse)
+        include_condit = "condit" in parse_include(include, OBJET_RELATIONS)
+        codobjs = parse_ids(ids) if ids is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = conditional_headers("objets", "list", request.url.query)  # Calculé sans lecture en base
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    if codobjs is not None:
+        return Response(content=batch_json(await get_objets_json_by_ids(db, codobjs)), media_type="application/json", headers=headers)
+    if selected is None and not include_condit:
+        selected = OBJET_LIST_FIELDS  # Sans include=condit, la relation n'est pas chargée du tout
+    elif selected is not None and include_condit and "condit" not in selected:
+        selected = parse_fields(",".join(selected + ("condit",)), ObjetResponse)
+    # Page déjà sérialisée ; les requêtes identiques simultanées partagent la même lecture
+    content, next_cursor = await get_objets_page_json(db, selected, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)  # Indique au client où reprendre
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+# Route pour créer un nouvel objet
+@router_objet_async.post("/", response_model=ObjetResponse, status_code=status.HTTP_201_CREATED)
+async def create_new_objet(objet_data: ObjetCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la création d'un objet.
+    :return: L'objet nouvellement créé
+    """
+    return await create_objet(db=db, objet_data=objet_data)
+
+
+# Route pour récupérer un objet par ID
+@router_objet_async.get("/{codobj:int}", response_model=ObjetResponse)
+async def get_by_id(codobj: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la lecture d'un objet (avec cache et ETag).
+    :return: L'objet correspondant à l'ID
+    """
+    if "if-none-match" in request.headers:
+        etag = get_cached_etag(objet_cache_key(codobj))  # 304 sans lire l'objet, même si son JSON a été évincé du cache
+        headers = entity_headers("objets", etag=etag) if etag else None
+        if headers and is_not_modified(request.headers, headers):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    objet_json = await get_objet_json(db=db, codobj=codobj)
+    if not objet_json:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objet not found")
+    headers = entity_headers("objets", objet_json)  # ETag calculé à partir du JSON (en cache)
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return Response(content=objet_json, media_type="application/json", headers=headers)
+
+
+# Route pour mettre à jour un objet par ID
+@router_objet_async.put("/{codobj:int}", response_model=ObjetResponse)
+async def update_objet_by_id(codobj: int, updated_data: ObjetCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la mise à jour d'un objet.
+    :return: L'objet mis à jour
+    """
+    objet = await update_objet(db=db, codobj=codobj, updated_data=updated_data)
+    if not objet:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objet not found")
+    return objet
+
+
+# Route pour supprimer un objet par ID
+@router_objet_async.delete("/{codobj:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_objet_by_id(codobj: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la suppression d'un objet.
+    """
+    if not await delete_objet(db=db, codobj=codobj):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objet not found")
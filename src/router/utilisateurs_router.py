@@ -1,24 +1,71 @@
-from fastapi import APIRouter, HTTPException, Depends, status  # Importation de FastAPI et des exceptions HTTP
+from fastapi import APIRouter, Body, HTTPException, Depends, Header, Query, Request, Response, status  # Importation de FastAPI et des exceptions HTTP
 from src.models import Utilisateur # Importation du modèle utilisateur pour interagir avec la base de données
 from sqlalchemy.orm import Session  # Importation de Session pour interagir avec la base de données via SQLAlchemy
 from typing import List  # Pour spécifier que nous retournons une liste d'objets dans les réponses
+from fastapi.responses import StreamingResponse  # Réponse envoyée par morceaux
+from src.services.export_services import EXPORT_FORMATS, stream_export  # Export en streaming
+from src.services.batch_lookup import MAX_BATCH_IDS, batch_json, parse_ids  # Lectures groupées par identifiants
+from src.services.change_feed import DEFAULT_POLL_TIMEOUT, MAX_POLL_TIMEOUT, changes_response, utilisateur_changes  # Flux des modifications
+from src.services.sparse_fields import parse_fields  # Réponses réduites aux champs demandés (fields=)
+from src.services.versions import conditional_headers, entity_etag, entity_headers, is_not_modified  # ETag / requêtes conditionnelles
+from src.services.cache import get_cached_etag  # ETag mis en cache avec l'entité (304 sans la relire)
+from src.repositories.utilisateurs_repository import utilisateur_cache_key  # Clé d'un utilisateur dans le cache
 from src.database import get_db  # Importation de la fonction pour récupérer une session de base de données
-from src.services.utilisateurs_services import get_all_utilisateurs, get_utilisateur_by_id, create_utilisateur, update_utilisateur, delete_utilisateur  # Importation des services
-from src.schemas.utilisateur import UtilisateurCreate, UtilisateurResponse  # Importation des schémas de données pour la validation des entrées et sorties
+from src.database_replicas import get_read_db  # Session de lecture sur un réplica (routes en lecture seule)
+from src.services.utilisateurs_services import get_utilisateurs_page_json, iter_utilisateurs, get_utilisateur_by_id, get_utilisateur_json, get_utilisateurs_json_by_ids, get_utilisateur_by_username_json, create_utilisateur, update_utilisateur, patch_utilisateur, delete_utilisateur  # Importation des services
+from src.schemas.utilisateur import UtilisateurBatchResponse, UtilisateurCreate, UtilisateurResponse  # Importation des schémas de données pour la validation des entrées et sorties
 
 router_utilisateur = APIRouter()  # Création d'un routeur pour les routes liées aux utilisateurs
 
+DEFAULT_PAGE_SIZE = 100  # Taille de page par défaut pour les listes d'utilisateurs
+MAX_PAGE_SIZE = 1000  # Taille de page maximale autorisée
+
 
 @router_utilisateur.get("/", response_model=List[UtilisateurResponse], tags=["Utilisateurs"])
-def get_utilisateurs(db: Session = Depends(get_db)):
+def get_utilisateurs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(None, description="Dernier code_utilisateur de la page précédente"),
+    username: str | None = None,
+    fields: str | None = Query(None, description="Champs renvoyés, séparés par des virgules (ex. username,nom_utilisateur)"),
+    ids: str | None = Query(None, description="Identifiants séparés par des virgules : lecture groupée (ex. 3,8,12)"),
+    db: Session = Depends(get_read_db),
+):
     """
-    Récupère tous les utilisateurs depuis la base de données.
+    Récupère une page d'utilisateurs (pagination par curseur sur `code_utilisateur`).
+    Sans `limit`, seuls les 100 premiers utilisateurs sont renvoyés (et non plus toute la table) :
+    les pages suivantes se lisent avec `after`, tant que l'en-tête `X-Next-Cursor` est présent.
+    Avec `ids`, récupère ces utilisateurs en une seule requête (voir `batch_get_utilisateurs`) ; les autres paramètres sont ignorés.
+    Le curseur de la page suivante est renvoyé dans l'en-tête `X-Next-Cursor`.
+    Si le client possède déjà cette page (If-None-Match / If-Modified-Since), renvoie 304 sans interroger la base.
+    En mode SERIALIZATION=fast, les colonnes sont encodées directement en JSON (sans ORM ni validation Pydantic).
+    Avec `fields`, seules les colonnes demandées sont lues et renvoyées.
+    :param request: Requête HTTP (pour les en-têtes conditionnels)
+    :param limit: Nombre maximal d'utilisateurs par page
+    :param after: Curseur de la page précédente
+    :param username: Filtre sur le username
+    :param fields: Champs à renvoyer (tous si absent)
+    :param ids: Identifiants des utilisateurs à récupérer (lecture groupée)
     :param db: Session de base de données
     :return: Liste de utilisateurs
     """
     try:
-        utilisateurs = get_all_utilisateurs(db)  # Récupère tous les utilisateurs via la fonction service
-        return utilisateurs  # Retourne les utilisateurs récupérés
+        selected = parse_fields(fields, UtilisateurResponse)
+        ids_list = parse_ids(ids) if ids is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = conditional_headers("utilisateurs", "list", request.url.query)  # Calculé sans lecture en base
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    if ids_list is not None:
+        return Response(content=batch_json(get_utilisateurs_json_by_ids(db, ids_list)), media_type="application/json", headers=headers)
+    try:
+        # Page déjà sérialisée (seules les colonnes demandées sont lues avec `fields`) ;
+        # les requêtes identiques simultanées partagent la même lecture
+        content, next_cursor = get_utilisateurs_page_json(db, selected, limit, after=after, username=username)
+        if next_cursor is not None:
+            headers["X-Next-Cursor"] = str(next_cursor)  # Indique au client où reprendre
+        return Response(content=content, media_type="application/json", headers=headers)  # Retourne les utilisateurs récupérés
     except Exception as e:
         # Si une erreur se produit lors de la récupération des utilisateurs, renvoie une exception HTTP avec un message d'erreur
         raise HTTPException(
@@ -27,22 +74,104 @@ def get_utilisateurs(db: Session = Depends(get_db)):
         )
 
 
+# Route pour récupérer plusieurs utilisateurs par leurs ID
+@router_utilisateur.post("/batch-get", response_model=UtilisateurBatchResponse, tags=["Utilisateurs"])
+def batch_get_utilisateurs(ids: list[int] = Body(..., min_length=1, max_length=MAX_BATCH_IDS), db: Session = Depends(get_read_db)):
+    """
+    Récupère plusieurs utilisateurs en un seul aller-retour : ceux en cache sans requête, les autres avec une requête
+    IN par lot. Les utilisateurs inexistants sont renvoyés à null et listés dans `not_found` (pas de 404).
+    :param ids: Identifiants des utilisateurs (les doublons sont ignorés)
+    :param db: Session de base de données
+    :return: Les utilisateurs par identifiant, et les identifiants introuvables
+    """
+    return Response(content=batch_json(get_utilisateurs_json_by_ids(db, ids)), media_type="application/json")
+
+
+# Route pour suivre les modifications des utilisateurs (SSE ou long-poll)
+@router_utilisateur.get("/changes", tags=["Utilisateurs"])
+async def utilisateurs_changes(
+    request: Request,
+    after: int | None = Query(None, ge=0, description="Dernier numéro d'événement reçu"),
+    timeout: float = Query(DEFAULT_POLL_TIMEOUT, gt=0, le=MAX_POLL_TIMEOUT, description="Attente maximale (long-poll)"),
+):
+    """
+    Flux des créations, modifications et suppressions d'utilisateurs (voir GET /objets/changes).
+    :param request: Requête HTTP (Accept, Last-Event-ID)
+    :param after: Dernier numéro d'événement reçu
+    :param timeout: Attente maximale en secondes
+    :return: Flux SSE, ou JSON {"events": [{seq, type, ids, at}], "last_seq", "reset"}
+    """
+    return await changes_response(utilisateur_changes, request, after, timeout)
+
+
+# Route pour exporter tous les utilisateurs en streaming
+@router_utilisateur.get("/export", tags=["Utilisateurs"])
+def export_utilisateurs(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$", description="ndjson ou json"),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Exporte tous les utilisateurs en streaming (NDJSON ou tableau JSON envoyé par morceaux).
+    Les lignes sont lues avec un curseur côté serveur : la mémoire reste constante quelle que soit la taille de la table.
+    :param format: Format de sortie
+    :param batch_size: Nombre de lignes lues et envoyées par lot
+    :param db: Session de base de données (fermée après l'envoi de la réponse)
+    :return: Réponse en streaming
+    """
+    return StreamingResponse(
+        stream_export(iter_utilisateurs, db, fmt=format, batch_size=batch_size),
+        media_type=EXPORT_FORMATS[format],
+    )
+
+
+@router_utilisateur.get("/by-username/{username}", response_model=UtilisateurResponse, tags=["Utilisateurs"])
+def get_utilisateur_by_username(username: str, request: Request, db: Session = Depends(get_read_db)):
+    """
+    Récupère un utilisateur à partir de son username (recherche sur l'index unique).
+    :param username: Username recherché
+    :param request: Requête HTTP (pour les en-têtes conditionnels)
+    :param db: Session de base de données
+    :return: L'utilisateur correspondant au username
+    """
+    utilisateur_json = get_utilisateur_by_username_json(db, username)
+    if not utilisateur_json:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"utilisateur with username {username} not found."
+        )
+    headers = entity_headers("utilisateurs", utilisateur_json)  # Même ETag que la lecture par ID
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return Response(content=utilisateur_json, media_type="application/json", headers=headers)
+
+
 @router_utilisateur.get("/{id}", response_model=UtilisateurResponse, tags=["Utilisateurs"])
-def get_utilisateur_by_id(id: int, db: Session = Depends(get_db)):
+def get_utilisateur_by_id(id: int, request: Request, db: Session = Depends(get_read_db)):
     """
     Récupère un utilisateur spécifique en fonction de son ID.
+    Renvoie 304 si l'ETag fourni par le client est toujours valide, sans lire l'utilisateur tant que son ETag est en cache.
     :param id: ID du utilisateur
+    :param request: Requête HTTP (pour les en-têtes conditionnels)
     :param db: Session de base de données
     :return: Le utilisateur correspondant à l'ID
     """
-    utilisateur = get_utilisateur_by_id(db, id)  # Récupère le utilisateur via la fonction service
-    if not utilisateur:
+    if "if-none-match" in request.headers:
+        etag = get_cached_etag(utilisateur_cache_key(id))  # 304 sans lire l'utilisateur, même si son JSON a été évincé du cache
+        headers = entity_headers("utilisateurs", etag=etag) if etag else None
+        if headers and is_not_modified(request.headers, headers):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    utilisateur_json = get_utilisateur_json(db, id)  # Récupère le utilisateur via la fonction service (avec cache)
+    if not utilisateur_json:
         # Si le utilisateur n'est pas trouvé, renvoie une erreur HTTP 404 avec un message
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"utilisateur with ID {id} not found."
         )
-    return utilisateur  # Retourne le utilisateur trouvé
+    headers = entity_headers("utilisateurs", utilisateur_json)  # ETag calculé à partir du JSON (en cache)
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return Response(content=utilisateur_json, media_type="application/json", headers=headers)  # Retourne le utilisateur déjà sérialisé
 
 
 @router_utilisateur.post("/", response_model=UtilisateurResponse, status_code=status.HTTP_201_CREATED, tags=["Utilisateurs"])
@@ -57,6 +186,8 @@ def add_utilisateur(utilisateur_data: UtilisateurCreate, db: Session = Depends(g
         # Appelle la fonction service pour créer le utilisateur en utilisant les données reçues
         new_utilisateur = create_utilisateur(db, utilisateur_data.model_dump())
         return new_utilisateur  # Retourne le utilisateur créé
+    except HTTPException:
+        raise  # Ex. 400 si le username existe déjà
     except Exception as e:
         # Si une erreur se produit lors de la création du utilisateur, renvoie une exception HTTP avec un message d'erreur
         raise HTTPException(
@@ -81,6 +212,8 @@ def update_utilisateur_data(id: int, updated_data: UtilisateurCreate, db: Sessio
             # Si le utilisateur n'est pas trouvé, renvoie une erreur HTTP 404
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="utilisateur not found")
         return updated_utilisateur  # Retourne le utilisateur mis à jour
+    except HTTPException:
+        raise  # Les erreurs HTTP (ex. 404) sont renvoyées telles quelles
     except Exception as e:
         # Si une erreur se produit lors de la mise à jour du utilisateur, renvoie une exception HTTP avec un message d'erreur
         raise HTTPException(
@@ -89,6 +222,36 @@ def update_utilisateur_data(id: int, updated_data: UtilisateurCreate, db: Sessio
         )
 
 
+@router_utilisateur.patch("/{id}", response_model=UtilisateurResponse, tags=["Utilisateurs"])
+def patch_utilisateur_data(
+    id: int,
+    changes: UtilisateurCreate,
+    if_match: str | None = Header(None, description="ETag de l'utilisateur lu (concurrence optimiste)"),
+    db: Session = Depends(get_db),
+):
+    """
+    Met à jour uniquement les champs envoyés d'un utilisateur.
+    Avec If-Match, renvoie 412 si l'utilisateur a été modifié depuis sa lecture.
+    :param id: ID du utilisateur à modifier
+    :param changes: Champs à modifier
+    :param if_match: ETag attendu de l'utilisateur
+    :param db: Session de base de données
+    :return: Le utilisateur modifié, avec son nouvel ETag
+    """
+    try:
+        utilisateur_json = patch_utilisateur(db, id, changes.model_dump(exclude_unset=True), if_match=if_match)
+    except HTTPException:
+        raise  # 412 : le utilisateur a été modifié entre-temps
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while updating the utilisateur: {str(e)}"
+        )
+    if not utilisateur_json:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"utilisateur with ID {id} not found.")
+    return Response(content=utilisateur_json, media_type="application/json", headers={"ETag": entity_etag(utilisateur_json)})
+
+
 @router_utilisateur.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Utilisateurs"])
 def remove_utilisateur(id: int, db: Session = Depends(get_db)):
     """
@@ -97,19 +260,18 @@ def remove_utilisateur(id: int, db: Session = Depends(get_db)):
     :param db: Session de base de données
     :return: Aucune donnée, seulement un code HTTP 204 en cas de succès
     """
-    utilisateur = get_utilisateur_by_id(db, id)  # Vérifie si le utilisateur existe
-    if not utilisateur:
-        # Si le utilisateur n'est pas trouvé, renvoie une erreur HTTP 404 avec un message
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"utilisateur with ID {id} not found."
-        )
     try:
-        # Appelle la fonction service pour supprimer le utilisateur
-        delete_utilisateur(db, id)
+        # Appelle la fonction service pour supprimer le utilisateur (une seule requête DELETE)
+        deleted = delete_utilisateur(db, id)
     except Exception as e:
         # Si une erreur se produit lors de la suppression du utilisateur, renvoie une exception HTTP avec un message d'erreur
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while deleting the utilisateur: {str(e)}"
         )
+    if not deleted:
+        # Aucune ligne supprimée : le utilisateur n'existe pas
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"utilisateur with ID {id} not found."
+        )
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status  # Importation de FastAPI et des exceptions HTTP
+from sqlalchemy.ext.asyncio import AsyncSession  # Session asynchrone
+from typing import List  # Pour spécifier que nous retournons une liste d'objets dans les réponses
+from src.database_async import get_async_db  # Session asynchrone par requête
+from src.services.utilisateurs_services_async import get_utilisateurs_page_json, get_utilisateur_json, get_utilisateurs_json_by_ids, get_utilisateur_by_username_json, create_utilisateur, update_utilisateur, delete_utilisateur  # Importation des services asynchrones
+from src.services.batch_lookup import batch_json, parse_ids  # Lectures groupées par identifiants
+from src.services.sparse_fields import parse_fields  # Réponses réduites aux champs demandés (fields=)
+from src.services.versions import conditional_headers, entity_headers, is_not_modified  # ETag / requêtes conditionnelles
+from src.services.cache import get_cached_etag  # ETag mis en cache avec l'entité (304 sans la relire)
+from src.repositories.utilisateurs_repository import utilisateur_cache_key  # Clé d'un utilisateur dans le cache
+from src.schemas.utilisateur import UtilisateurCreate, UtilisateurResponse  # Importation des schémas de données
+from src.router.utilisateurs_router import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE  # Mêmes bornes de pagination qu'en synchrone
+
+# Routeur asynchrone des utilisateurs (DB_MODE=async).
+# Les identifiants utilisent le convertisseur `int` : /export et /batch-get restent servis par le routeur synchrone.
+router_utilisateur_async = APIRouter()
+
+
+@router_utilisateur_async.get("/", response_model=List[UtilisateurResponse], tags=["Utilisateurs"])
+async def get_utilisateurs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(None, description="Dernier code_utilisateur de la page précédente"),
+    username: str | None = None,
+    fields: str | None = Query(None, description="Champs renvoyés, séparés par des virgules (ex. username,nom_utilisateur)"),
+    ids: str | None = Query(None, description="Identifiants séparés par des virgules : lecture groupée (ex. 3,8,12)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Version asynchrone de la liste paginée des utilisateurs (et de la lecture groupée avec `ids`).
+    :return: Liste de utilisateurs
+    """
+    try:
+        selected = parse_fields(fields, UtilisateurResponse)
+        ids_list = parse_ids(ids) if ids is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = conditional_headers("utilisateurs", "list", request.url.query)  # Calculé sans lecture en base
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    if ids_list is not None:
+        return Response(content=batch_json(await get_utilisateurs_json_by_ids(db, ids_list)), media_type="application/json", headers=headers)
+    # Page déjà sérialisée ; les requêtes identiques simultanées partagent la même lecture
+    content, next_cursor = await get_utilisateurs_page_json(db, selected, limit, after=after, username=username)
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)  # Indique au client où reprendre
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router_utilisateur_async.get("/{id:int}", response_model=UtilisateurResponse, tags=["Utilisateurs"])
+async def get_utilisateur_by_id(id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la lecture d'un utilisateur (avec cache et ETag).
+    :return: Le utilisateur correspondant à l'ID
+    """
+    if "if-none-match" in request.headers:
+        etag = get_cached_etag(utilisateur_cache_key(id))  # 304 sans lire l'utilisateur, même si son JSON a été évincé du cache
+        headers = entity_headers("utilisateurs", etag=etag) if etag else None
+        if headers and is_not_modified(request.headers, headers):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    utilisateur_json = await get_utilisateur_json(db, id)
+    if not utilisateur_json:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"utilisateur with ID {id} not found.")
+    headers = entity_headers("utilisateurs", utilisateur_json)  # ETag calculé à partir du JSON (en cache)
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return Response(content=utilisateur_json, media_type="application/json", headers=headers)
+
+
+@router_utilisateur_async.get("/by-username/{username}", response_model=UtilisateurResponse, tags=["Utilisateurs"])
+async def get_utilisateur_by_username(username: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la lecture d'un utilisateur par son username (avec ETag).
+    :return: L'utilisateur correspondant au username
+    """
+    utilisateur_json = await get_utilisateur_by_username_json(db, username)
+    if not utilisateur_json:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"utilisateur with username {username} not found.")
+    headers = entity_headers("utilisateurs", utilisateur_json)
+    if is_not_modified(request.headers, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)  # Le client est à jour
+    return Response(content=utilisateur_json, media_type="application/json", headers=headers)
+
+
+@router_utilisateur_async.post("/", response_model=UtilisateurResponse, status_code=status.HTTP_201_CREATED, tags=["Utilisateurs"])
+async def add_utilisateur(utilisateur_data: UtilisateurCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la création d'un utilisateur.
+    :return: Le utilisateur créé
+    """
+    return await create_utilisateur(db, utilisateur_data.model_dump())
+
+
+@router_utilisateur_async.put("/{id:int}", response_model=UtilisateurResponse, status_code=status.HTTP_200_OK, tags=["Utilisateurs"])
+async def update_utilisateur_data(id: int, updated_data: UtilisateurCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la mise à jour d'un utilisateur.
+    :return: Le utilisateur mis à jour
+    """
+    utilisateur = await update_utilisateur(db, id, updated_data.model_dump())
+    if utilisateur is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="utilisateur not found")
+    return utilisateur
+
+
+@router_utilisateur_async.delete("/{id:int}", status_code=status.HTTP_204_NO_CONTENT, tags=["Utilisateurs"])
+async def remove_utilisateur(id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Version asynchrone de la suppression d'un utilisateur.
+    """
+    if not await delete_utilisateur(db, id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"utilisateur with ID {id} not found.")
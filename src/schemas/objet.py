@@ -38,3 +38,59 @@ class ObjetResponse(ObjetCreate):
 
     # Configuration du modèle : permet de dériver les attributs de la base de données.
     model_config = ConfigDict(from_attributes=True)
+
+# Schéma pour la mise à jour partielle d'un objet (PATCH) : seuls les champs envoyés sont modifiés
+class ObjetPatch(BaseModel):
+    # Mêmes champs que ObjetCreate, sans valeur par défaut significative (lus avec exclude_unset=True)
+    libobj: Optional[str] = None
+    tailleobj: Optional[str] = None
+    puobj: Optional[float] = None
+    poidsobj: Optional[float] = None
+    indispobj: Optional[int] = None
+    o_imp: Optional[int] = None
+    o_aff: Optional[int] = None
+    o_cartp: Optional[int] = None
+    points: Optional[int] = None
+    o_ordre_aff: Optional[int] = None
+
+# Schéma pour la mise à jour en masse d'objets (l'identifiant est obligatoire)
+class ObjetBulkUpdate(ObjetCreate):
+    # codobj: L'identifiant de l'objet à mettre à jour
+    codobj: int
+
+# Schéma pour le résultat d'une ligne d'une opération en masse
+class ObjetBulkResult(BaseModel):
+    # index: La position de la ligne dans la requête
+    index: int
+    # codobj: L'identifiant de l'objet concerné (None si l'objet n'a pas été créé)
+    codobj: Optional[int] = None
+    # status: Le résultat de l'opération ("created", "updated", "deleted" ou "not_found")
+    status: str
+    # objet: L'objet tel qu'enregistré en base (renvoyé par RETURNING)
+    objet: Optional[ObjetResponse] = None
+
+# Schéma pour la réponse d'une opération en masse
+class ObjetBulkResponse(BaseModel):
+    # results: Le résultat de chaque ligne, dans l'ordre de la requête
+    results: list[ObjetBulkResult]
+
+# Schéma d'un incrément des compteurs d'un objet (POST /objets/{codobj}/increment)
+class ObjetIncrement(BaseModel):
+    # Valeurs ajoutées (ou retirées si négatives) aux colonnes ; 0 pour ne pas modifier une colonne
+    points: int = 0
+    o_imp: int = 0
+    o_aff: int = 0
+
+# Schéma de la réponse à un incrément (accepté, pas encore écrit en base)
+class ObjetIncrementAccepted(BaseModel):
+    # codobj: L'identifiant de l'objet
+    codobj: int
+    # pending: Les incréments cumulés de l'objet en attente d'écriture, par colonne
+    pending: dict[str, int]
+
+# Schéma de la réponse d'une lecture groupée (GET /objets/?ids=..., POST /objets/batch-get)
+class ObjetBatchResponse(BaseModel):
+    # results: Les objets par identifiant, dans l'ordre de la requête ; null si l'objet n'existe pas
+    results: dict[int, Optional[ObjetResponse]]
+    # not_found: Les identifiants sans objet
+    not_found: list[int]
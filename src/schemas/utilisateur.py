@@ -27,3 +27,14 @@ class UtilisateurResponse(BaseModel):
     )
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Modèle pour répondre à une lecture groupée d'utilisateurs
+class UtilisateurBatchResponse(BaseModel):
+    """
+    Modèle pour la réponse d'une lecture groupée (GET /utilisateurs/?ids=..., POST /utilisateurs/batch-get).
+    """
+    results: dict[int, UtilisateurResponse | None] = Field(
+        ..., description="Utilisateurs par identifiant, dans l'ordre de la requête ; null si l'utilisateur n'existe pas"
+    )
+    not_found: list[int] = Field(..., description="Identifiants sans utilisateur")
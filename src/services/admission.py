@@ -0,0 +1,293 @@
+# services/admission.py
+import asyncio  # File d'attente des requêtes en surnombre (boucle d'événements)
+import math  # Arrondi de Retry-After
+import re  # Reconnaissance des routes d'une seule entité
+import threading  # Verrou : seaux partagés entre la boucle d'événements et les threads
+import time  # Horloge des seaux de jetons
+from collections import OrderedDict, deque  # Seaux les plus récents ; requêtes en attente, dans l'ordre d'arrivée
+from src.config import get_settings  # Budgets, backend et plafonds de concurrence
+
+# Routes de supervision et de documentation : jamais limitées (la supervision doit rester possible sous charge)
+EXEMPT_PATHS = frozenset((
+    "/metrics", "/cache/stats", "/pool/stats", "/search/stats", "/compression/stats", "/admission/stats", "/coalescing/stats",
+    "/write-behind/stats", "/replicas/stats", "/slow-queries", "/changes/stats",
+))
+EXEMPT_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/profiles/")
+# Lecture d'une seule entité : /objets/12, /utilisateurs/by-username/alice
+ITEM_PATTERN = re.compile(r"^/[^/]+/(\d+|by-username/[^/]+)/?$")
+MAX_TRACKED_KEYS = 10000  # Seaux conservés en mémoire ; un client oublié repart avec un seau plein
+
+
+def request_class(method: str, path: str) -> str | None:
+    """
+    Classe de budget d'une requête.
+    - "heavy" : lectures de collections (listes paginées, recherche, export, lectures groupées), coûteuses pour la base ;
+    - "light" : lecture d'une seule entité et écritures ;
+    - "stream" : flux des modifications (/changes), connexions longues, hors plafonds de concurrence ;
+    - None : supervision et documentation, non limitées.
+    :param method: Méthode HTTP
+    :param path: Chemin de la requête
+    :return: "heavy", "light", "stream" ou None
+    """
+    if path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if method == "GET" and path.endswith("/changes"):
+        return "stream"
+    if method == "GET" and not ITEM_PATTERN.match(path) or path.endswith("/batch-get"):
+        return "heavy"
+    return "light"
+
+
+def client_key(scope, header: str | None) -> str:
+    """
+    Identifie le client d'une requête : clé d'API (en-tête `header`) si elle est présente, sinon adresse IP.
+    L'en-tête n'est pas vérifié ici : il doit être authentifié en amont (passerelle), sinon un client
+    pourrait changer de clé à chaque requête ; RATE_LIMIT_KEY_HEADER vide pour ne compter que par IP.
+    :param scope: Scope ASGI
+    :param header: Nom de l'en-tête portant la clé d'API, en minuscules, ou None
+    :return: Clé du client
+    """
+    if header:
+        for name, value in scope["headers"]:
+            if name == header.encode("latin-1"):
+                return "key:" + value.decode("latin-1")
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def budgets() -> dict:
+    """
+    Budgets configurés : classe -> (jetons par seconde, capacité du seau). Un débit nul désactive la limite.
+    :return: Dictionnaire des budgets
+    """
+    settings = get_settings()
+    return {
+        "heavy": (settings.rate_limit_heavy_rate, settings.rate_limit_heavy_burst),
+        "light": (settings.rate_limit_light_rate, settings.rate_limit_light_burst),
+        "stream": (settings.rate_limit_light_rate, settings.rate_limit_light_burst),  # Connexions (et reconnexions)
+    }
+
+
+class TokenBucketLimiter:
+    """
+    Limiteur à seaux de jetons, en mémoire du processus : chaque clé dispose d'un seau de `burst` jetons,
+    rempli à `rate` jetons par seconde ; une requête consomme un jeton.
+    Avec plusieurs workers, chaque processus a ses propres seaux (voir RedisRateLimiter).
+    """
+
+    local = True  # Pas d'entrée / sortie : appelé directement depuis la boucle d'événements
+
+    def __init__(self, max_keys: int = MAX_TRACKED_KEYS, clock=time.monotonic):
+        """
+        :param max_keys: Nombre maximal de seaux conservés (les moins récemment utilisés sont oubliés)
+        :param clock: Horloge en secondes (remplaçable dans les tests)
+        """
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()  # clé -> (jetons restants, date de la dernière mise à jour)
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Consomme un jeton du seau de `key`.
+        :param key: Clé du client et de la classe de budget
+        :param rate: Jetons ajoutés par seconde
+        :param burst: Capacité du seau
+        :return: 0 si la requête est admise, sinon le délai (secondes) avant qu'un jeton soit disponible
+        """
+        with self._lock:
+            now = self.clock()
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+class RedisRateLimiter:
+    """
+    Limiteur partagé entre les workers, stocké dans un serveur compatible Redis.
+    Le seau de jetons est approché par une fenêtre glissante de `burst / rate` secondes autorisant `burst`
+    requêtes (même débit moyen et même rafale), calculée avec INCR seul : pas de script côté serveur,
+    et le client peut être remplacé par une implémentation locale dans les tests.
+    Les requêtes refusées sont comptées : un client qui insiste reste limité.
+    """
+
+    local = False  # Aller-retour réseau : exécuté dans un thread
+
+    def __init__(self, client, prefix: str = "tp7:ratelimit:", clock=time.time):
+        """
+        :param client: Client compatible Redis (méthodes incr, expire, get)
+        :param prefix: Préfixe ajouté à toutes les clés
+        :param clock: Horloge en secondes, partagée par les workers (remplaçable dans les tests)
+        """
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        :param key: Clé du client et de la classe de budget
+        :param rate: Débit moyen autorisé (requêtes par seconde)
+        :param burst: Requêtes autorisées par fenêtre
+        :return: 0 si la requête est admise, sinon le délai (secondes) avant de réessayer
+        """
+        window = burst / rate
+        position = self.clock() / window
+        current = int(position)
+        counter = f"{self.prefix}{key}:{current}"
+        count = self.client.incr(counter)
+        if count == 1:
+            self.client.expire(counter, math.ceil(window * 2))  # Encore lue comme fenêtre précédente
+        previous = int(self.client.get(f"{self.prefix}{key}:{current - 1}") or 0)
+        # Requêtes de la fenêtre précédente encore couvertes par la fenêtre glissante, plus celles de la fenêtre en cours
+        if previous * (1 - (position - current)) + count <= burst:
+            return 0.0
+        return 1 / rate
+
+
+class ConcurrencyLimiter:
+    """
+    Plafond de requêtes traitées en même temps, avec une file d'attente bornée.
+    Une requête en surnombre attend qu'une place se libère (dans l'ordre d'arrivée), au plus `timeout` secondes ;
+    si la file est pleine, elle est refusée immédiatement. Propre à chaque processus (boucle d'événements).
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        """
+        :param limit: Nombre maximal de requêtes en cours
+        :param queue_size: Nombre maximal de requêtes en attente
+        :param timeout: Attente maximale dans la file (secondes)
+        """
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0  # Requêtes en cours
+        self._waiters = deque()  # Futures des requêtes en attente
+        self.queued = 0  # Requêtes passées par la file
+        self.rejected_full = 0  # Refusées : file pleine
+        self.rejected_timeout = 0  # Refusées : attente trop longue
+
+    @property
+    def waiting(self) -> int:
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    async def acquire(self) -> bool:
+        """
+        Réserve une place, en attendant si nécessaire.
+        :return: True si la requête peut être traitée (appeler `release` ensuite), False si elle est refusée
+        """
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return True
+        if self.waiting >= self.queue_size:
+            self.rejected_full += 1
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+            return True  # Place transmise par `release` (active déjà compté)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Place transmise au moment même de l'expiration : on la rend
+            self.rejected_timeout += 1
+            return False
+        finally:
+            if waiter in self._waiters and waiter.done():
+                self._waiters.remove(waiter)
+
+    def release(self):
+        """
+        Libère une place : elle est transmise à la plus ancienne requête en attente, s'il y en a une.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        """
+        :return: Plafond, occupation et compteurs de refus
+        """
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "queued": self.queued,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class AdmissionStats:
+    """
+    Compteurs du contrôle d'admission.
+    """
+
+    def __init__(self):
+        self.admitted = 0  # Requêtes transmises à l'application
+        self.rate_limited = {"heavy": 0, "light": 0, "stream": 0}  # Refusées (429) par classe de budget
+        self.concurrency = {}  # Nom -> ConcurrencyLimiter, renseigné par le middleware
+
+    def as_dict(self) -> dict:
+        """
+        :return: Compteurs à plat (ex. rate_limited_heavy, concurrency_global_active)
+        """
+        stats = {"admitted": self.admitted}
+        for name, count in self.rate_limited.items():
+            stats[f"rate_limited_{name}"] = count
+        for name, limiter in self.concurrency.items():
+            for key, value in limiter.stats().items():
+                stats[f"concurrency_{name}_{key}"] = value
+        return stats
+
+
+admission_stats = AdmissionStats()
+_rate_limiter = None  # Limiteur partagé (créé à la première utilisation)
+
+
+def get_rate_limiter():
+    """
+    Construit (une seule fois) le limiteur selon RATE_LIMIT_BACKEND ("memory" ou "redis").
+    :return: Instance du limiteur
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        if settings.rate_limit_backend == "redis":
+            try:
+                import redis  # Dépendance optionnelle, uniquement pour le backend Redis
+            except ImportError as e:
+                raise RuntimeError("Le backend de limitation 'redis' nécessite le paquet redis.") from e
+            _rate_limiter = RedisRateLimiter(redis.Redis.from_url(settings.rate_limit_redis_url))
+        else:
+            _rate_limiter = TokenBucketLimiter()
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter):
+    """
+    Remplace le limiteur (par exemple par un faux client Redis dans les tests).
+    :param limiter: Nouvelle instance
+    """
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def retry_after_header(delay: float) -> str:
+    """
+    :param delay: Délai en secondes
+    :return: Valeur de l'en-tête Retry-After (secondes entières, au moins 1)
+    """
+    return str(max(1, math.ceil(delay)))
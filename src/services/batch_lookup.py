@@ -0,0 +1,95 @@
+# services/batch_lookup.py
+import json  # Liste des identifiants introuvables
+from src.services.cache import get_cache, set_if_current  # Lecture des entités déjà en cache, mise en cache conditionnelle
+from src.services.profiling import profiled  # Temps de sérialisation des requêtes profilées
+from src.services.versions import table_version  # Version relevée avant les lectures en base
+
+MAX_BATCH_IDS = 10000  # Nombre maximal d'identifiants par lecture groupée
+BATCH_CHUNK_SIZE = 1000  # Identifiants par clause IN (une requête par lot)
+
+
+def parse_ids(ids: str) -> list[int]:
+    """
+    Lit le paramètre `ids` d'une lecture groupée (ex. "12,15,20").
+    :param ids: Identifiants séparés par des virgules
+    :return: Liste des identifiants, dans l'ordre de la requête
+    :raises ValueError: Si un identifiant n'est pas un entier ou s'il y en a trop
+    """
+    values = [value.strip() for value in ids.split(",") if value.strip()]
+    if not values:
+        raise ValueError("ids : au moins un identifiant est attendu")
+    if len(values) > MAX_BATCH_IDS:
+        raise ValueError(f"ids : au plus {MAX_BATCH_IDS} identifiants")
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        raise ValueError("ids : identifiants entiers séparés par des virgules attendus") from None
+
+
+def _from_cache(ids: list[int], cache_key) -> tuple[dict, list[int]]:
+    """
+    :param ids: Identifiants demandés
+    :param cache_key: Fonction identifiant -> clé du cache
+    :return: Tuple (identifiant -> JSON en cache ou None, identifiants à lire en base)
+    """
+    ids = list(dict.fromkeys(ids))  # Doublons retirés, ordre de la requête conservé
+    results = dict(zip(ids, get_cache().get_many([cache_key(id) for id in ids])))
+    return results, [id for id, value in results.items() if value is None]
+
+
+def get_json_by_ids(ids: list[int], cache_key, load_chunk, table: str, store: bool = True) -> dict:
+    """
+    Lecture groupée d'entités sérialisées : le cache d'abord (une seule lecture pour toutes les clés),
+    puis les absentes en base, par lots de BATCH_CHUNK_SIZE identifiants (une requête IN par lot).
+    Les entités lues en base sont mises en cache, comme par la lecture d'une seule entité,
+    sauf si la table a changé entre-temps.
+    :param ids: Identifiants demandés
+    :param cache_key: Fonction identifiant -> clé du cache
+    :param load_chunk: Fonction liste d'identifiants -> dictionnaire identifiant -> JSON (entités existantes)
+    :param table: Table lue
+    :param store: False pour ne pas mettre en cache les entités lues (ex. sur un réplica)
+    :return: Dictionnaire identifiant -> JSON, ou None si l'entité n'existe pas
+    """
+    results, missing = _from_cache(ids, cache_key)
+    for start in range(0, len(missing), BATCH_CHUNK_SIZE):
+        version = table_version(table)
+        for id, value in load_chunk(missing[start:start + BATCH_CHUNK_SIZE]).items():
+            if store:
+                set_if_current(cache_key(id), value, table, version)
+            results[id] = value
+    return results
+
+
+async def get_json_by_ids_async(ids: list[int], cache_key, load_chunk, table: str) -> dict:
+    """
+    Version asynchrone de `get_json_by_ids`.
+    :param load_chunk: Fonction liste d'identifiants -> coroutine renvoyant identifiant -> JSON
+    :return: Dictionnaire identifiant -> JSON, ou None si l'entité n'existe pas
+    """
+    results, missing = _from_cache(ids, cache_key)
+    for start in range(0, len(missing), BATCH_CHUNK_SIZE):
+        version = table_version(table)
+        for id, value in (await load_chunk(missing[start:start + BATCH_CHUNK_SIZE])).items():
+            set_if_current(cache_key(id), value, table, version)
+            results[id] = value
+    return results
+
+
+@profiled("serialization")
+def batch_json(results: dict) -> bytes:
+    """
+    Corps de la réponse d'une lecture groupée, assemblé à partir des JSON déjà sérialisés (en cache) :
+    {"results": {"12": {...}, "99": null}, "not_found": [99]}.
+    :param results: Dictionnaire identifiant -> JSON (str ou bytes), ou None si l'entité n'existe pas
+    :return: JSON de la réponse
+    """
+    parts = []
+    not_found = []
+    for id, value in results.items():
+        if value is None:
+            not_found.append(id)
+            value = "null"  # Marqueur explicite : l'identifiant a bien été cherché
+        elif isinstance(value, bytes):
+            value = value.decode()  # Valeur lue dans Redis
+        parts.append(f'"{id}":{value}')
+    return ('{"results":{' + ",".join(parts) + '},"not_found":' + json.dumps(not_found) + "}").encode()
@@ -0,0 +1,274 @@
+# services/cache.py
+import os  # Lecture de la configuration depuis les variables d'environnement
+import threading  # Verrou : les routes synchrones s'exécutent dans un pool de threads
+import time  # Horloge monotone pour l'expiration des entrées
+from collections import OrderedDict  # Conserve l'ordre d'utilisation des clés (LRU)
+from src.services.versions import table_version  # Mise en cache refusée si la table a changé pendant la lecture
+
+
+class LRUCache:
+    """
+    Cache en mémoire du processus, borné en taille (LRU) et en durée de vie (TTL).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """
+        :param max_size: Nombre maximal d'entrées conservées
+        :param ttl: Durée de vie d'une entrée, en secondes
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # clé -> (date d'expiration, valeur)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        """
+        Retourne la valeur associée à la clé, ou None si elle est absente ou expirée.
+        :param key: Clé recherchée
+        :return: Valeur en cache ou None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]  # Entrée expirée : on la retire
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)  # Marque la clé comme récemment utilisée
+            self.hits += 1
+            return value
+
+    def get_many(self, keys: list[str]) -> list:
+        """
+        :param keys: Clés recherchées
+        :return: Valeurs en cache (None pour les clés absentes ou expirées), dans l'ordre des clés
+        """
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value):
+        """
+        Enregistre une valeur ; l'entrée la moins récemment utilisée est évincée si le cache est plein.
+        :param key: Clé
+        :param value: Valeur à conserver
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)  # Évince l'entrée la plus ancienne
+                self.evictions += 1
+
+    def delete(self, key: str):
+        """
+        Supprime une entrée (invalidation).
+        :param key: Clé à supprimer
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Vide entièrement le cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        :return: Compteurs d'utilisation du cache
+        """
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCache:
+    """
+    Cache partagé s'appuyant sur un client compatible Redis (méthodes get, set et delete).
+    Le client peut être remplacé par une implémentation locale dans les tests.
+    """
+
+    def __init__(self, client, ttl: float = 60.0, prefix: str = "tp7:"):
+        """
+        :param client: Client compatible Redis (ex. `redis.Redis`)
+        :param ttl: Durée de vie d'une entrée, en secondes
+        :param prefix: Préfixe ajouté à toutes les clés
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # Les évictions sont gérées par le serveur Redis
+
+    def get(self, key: str):
+        """
+        :param key: Clé recherchée
+        :return: Valeur en cache ou None
+        """
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_many(self, keys: list[str]) -> list:
+        """
+        Lit plusieurs clés en un seul aller-retour (MGET).
+        :param keys: Clés recherchées
+        :return: Valeurs en cache (None pour les clés absentes), dans l'ordre des clés
+        """
+        if not keys:
+            return []
+        values = self.client.mget([self.prefix + key for key in keys])
+        found = sum(value is not None for value in values)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+    def set(self, key: str, value):
+        """
+        :param key: Clé
+        :param value: Valeur à conserver (expire après `ttl` secondes)
+        """
+        self.client.set(self.prefix + key, value, ex=max(1, int(self.ttl)))
+
+    def delete(self, key: str):
+        """
+        :param key: Clé à supprimer
+        """
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        """
+        Supprime toutes les clés portant le préfixe du cache.
+        """
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        """
+        :return: Compteurs d'utilisation du cache
+        """
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache = None  # Instance du cache utilisée par les services (créée à la première utilisation)
+
+
+def _build_cache_from_env():
+    """
+    Construit le cache à partir des variables d'environnement :
+    CACHE_BACKEND ("memory" ou "redis"), CACHE_MAX_SIZE, CACHE_TTL et CACHE_REDIS_URL.
+    :return: Instance de cache
+    """
+    ttl = float(os.getenv("CACHE_TTL", "60"))
+    if os.getenv("CACHE_BACKEND", "memory") == "redis":
+        try:
+            import redis  # Dépendance optionnelle, uniquement pour le backend Redis
+        except ImportError as e:
+            raise RuntimeError("Le backend de cache 'redis' nécessite le paquet redis.") from e
+        client = redis.Redis.from_url(os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"))
+        return RedisCache(client, ttl=ttl)
+    return LRUCache(max_size=int(os.getenv("CACHE_MAX_SIZE", "1024")), ttl=ttl)
+
+
+def get_cache():
+    """
+    :return: L'instance de cache partagée par les services
+    """
+    global _cache
+    if _cache is None:
+        _cache = _build_cache_from_env()
+    return _cache
+
+
+def set_cache(cache):
+    """
+    Remplace l'instance de cache (par exemple par un faux client Redis dans les tests).
+    :param cache: Nouvelle instance de cache
+    """
+    global _cache
+    _cache = cache
+
+
+def set_if_current(key: str, value, table: str, version: str):
+    """
+    Met une valeur en cache seulement si la table n'a pas changé depuis le début de sa lecture (`version`).
+    Sans cette vérification, une lecture commencée avant une écriture et terminée après son invalidation
+    remettrait en cache une valeur périmée jusqu'à l'expiration. La version est relue après l'écriture
+    dans le cache : une invalidation survenue entre les deux vérifications est rattrapée.
+    Les écritures incrémentent la version avant d'invalider (voir `objets_changed`).
+    :param key: Clé du cache
+    :param value: Valeur chargée
+    :param table: Table d'où provient la valeur
+    :param version: Version de la table relevée avant la lecture
+    """
+    if table_version(table) != version:
+        return
+    cache = get_cache()
+    cache.set(key, value)
+    if table_version(table) != version:
+        cache.delete(key)
+
+
+def read_through(key: str, loader, table: str, store: bool = True):
+    """
+    Lit une valeur dans le cache ; en cas d'absence, la charge avec `loader` puis la met en cache,
+    sauf si la table a changé pendant la lecture (voir `set_if_current`).
+    Une valeur None (ex. entité introuvable) n'est jamais mise en cache.
+    :param key: Clé du cache
+    :param loader: Fonction sans argument qui charge la valeur
+    :param table: Table d'où provient la valeur
+    :param store: False pour ne pas mettre en cache la valeur chargée (ex. lue sur un réplica)
+    :return: Valeur en cache ou chargée, ou None
+    """
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        version = table_version(table)  # Relevée avant la lecture en base
+        value = loader()
+        if value is not None and store:
+            set_if_current(key, value, table, version)
+    return value
+
+
+def etag_cache_key(key: str) -> str:
+    """
+    :param key: Clé d'une entité sérialisée dans le cache
+    :return: La clé de son ETag, conservé à part : une requête conditionnelle est servie sans lire l'entité,
+             même si son JSON a été évincé du cache
+    """
+    return f"{key}:etag"
+
+
+def get_cached_etag(key: str) -> str | None:
+    """
+    :param key: Clé d'une entité sérialisée dans le cache
+    :return: L'ETag en cache de l'entité, ou None
+    """
+    etag = get_cache().get(etag_cache_key(key))
+    return etag.decode() if isinstance(etag, bytes) else etag  # Valeur lue dans Redis
+
+
+def invalidate(*keys: str):
+    """
+    Supprime une ou plusieurs entrées du cache après une écriture.
+    :param keys: Clés à invalider
+    """
+    cache = get_cache()
+    for key in keys:
+        cache.delete(key)
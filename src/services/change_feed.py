@@ -0,0 +1,278 @@
+# services/change_feed.py
+import asyncio  # Abonnés en attente dans la boucle d'événements (pas de thread par abonné)
+import json  # Événements sérialisés une seule fois, à la publication
+import threading  # Publications depuis les threads des routes synchrones
+import time  # Date des événements
+from collections import deque  # Historique des derniers événements ; file de chaque abonné
+from fastapi import HTTPException, Request, Response, status  # Réponses des routes /changes
+from fastapi.responses import StreamingResponse  # Flux Server-Sent Events
+from src.config import get_settings  # Historique, files des abonnés, plafond et battement de cœur
+
+EVENT_TYPES = ("created", "updated", "deleted")
+MAX_POLL_TIMEOUT = 60.0  # Attente maximale d'une requête long-poll (secondes)
+DEFAULT_POLL_TIMEOUT = 25.0  # Sous les délais d'inactivité habituels des proxys
+
+
+class ChangeEvent:
+    """
+    Événement du flux : écriture validée sur une ou plusieurs entités (une opération en masse = un événement).
+    Le JSON et la trame SSE sont construits à la publication, pas pour chaque abonné.
+    """
+
+    __slots__ = ("seq", "type", "ids", "json", "frame")
+
+    def __init__(self, seq: int, type: str, ids: list[int]):
+        self.seq = seq
+        self.type = type
+        self.ids = ids
+        self.json = json.dumps({"seq": seq, "type": type, "ids": ids, "at": time.time()})
+        self.frame = f"id: {seq}\nevent: {type}\ndata: {self.json}\n\n".encode()
+
+
+class SubscriberOverflow(Exception):
+    """
+    La file de l'abonné est pleine (client trop lent) : il doit se reconnecter en reprenant au dernier numéro reçu.
+    """
+
+
+class Subscription:
+    """
+    Abonné au flux : file bornée, remplie depuis la boucle d'événements de l'abonné.
+    """
+
+    __slots__ = ("loop", "size", "events", "last_seq", "overflowed", "_wakeup")
+
+    def __init__(self, loop, size: int, last_seq: int):
+        """
+        :param loop: Boucle d'événements de la requête abonnée
+        :param size: Événements en attente au plus
+        :param last_seq: Dernier numéro déjà couvert (historique renvoyé à l'abonnement)
+        """
+        self.loop = loop
+        self.size = size
+        self.events = deque()
+        self.last_seq = last_seq
+        self.overflowed = False
+        self._wakeup = asyncio.Event()
+
+    def _push(self, event: ChangeEvent):
+        """
+        Ajoute un événement à la file (appelé dans la boucle de l'abonné).
+        """
+        if event.seq <= self.last_seq:
+            return  # Déjà renvoyé avec l'historique
+        if len(self.events) >= self.size:
+            self.overflowed = True  # Pas d'événement perdu en silence : l'abonné est prévenu et se reconnecte
+        else:
+            self.events.append(event)
+            self.last_seq = event.seq
+        self._wakeup.set()
+
+    async def next_events(self, timeout: float) -> list[ChangeEvent]:
+        """
+        Attend les prochains événements.
+        :param timeout: Attente maximale en secondes
+        :return: Événements en attente, liste vide si aucun n'est arrivé avant `timeout`
+        :raises SubscriberOverflow: Si la file a débordé
+        """
+        if not self.events and not self.overflowed:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+        if self.overflowed:
+            raise SubscriberOverflow()
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+
+class ChangeFeed:
+    """
+    Flux des modifications d'une table, en mémoire du processus (publication / abonnement).
+    Les chemins d'écriture publient un événement par écriture validée, numéroté dans l'ordre ;
+    les derniers événements sont conservés pour qu'un client reprenne après une déconnexion (`after`, Last-Event-ID).
+    Les abonnés attendent dans la boucle d'événements : un abonné inactif ne coûte qu'une file vide,
+    la publication ne fait qu'un appel par boucle (call_soon_threadsafe), la distribution a lieu dans la boucle.
+    Avec plusieurs workers, chaque processus a son propre flux et sa propre numérotation.
+    """
+
+    def __init__(self, name: str, history: int | None = None, buffer: int | None = None, max_subscribers: int | None = None):
+        """
+        :param name: Nom de la table (statistiques)
+        :param history: Événements conservés pour la reprise (par défaut : CHANGE_FEED_HISTORY)
+        :param buffer: Événements en attente au plus par abonné (par défaut : CHANGE_FEED_BUFFER)
+        :param max_subscribers: Abonnés simultanés au plus (par défaut : CHANGE_FEED_MAX_SUBSCRIBERS)
+        """
+        settings = get_settings()
+        self.name = name
+        self.buffer = settings.change_feed_buffer if buffer is None else buffer
+        self.max_subscribers = settings.change_feed_max_subscribers if max_subscribers is None else max_subscribers
+        self._history = deque(maxlen=settings.change_feed_history if history is None else history)
+        self._loops = {}  # Boucle d'événements -> abonnés de cette boucle
+        self._lock = threading.Lock()
+        self.seq = 0  # Numéro du dernier événement publié
+        self.subscribers = 0
+        self.overflows = 0  # Abonnés déconnectés car trop lents
+        self.resets = 0  # Reprises impossibles (numéro hors de l'historique) : relecture complète nécessaire
+
+    def publish(self, type: str, *ids: int):
+        """
+        Publie un événement ; à appeler après le commit, depuis un thread ou depuis la boucle d'événements.
+        :param type: "created", "updated" ou "deleted"
+        :param ids: Identifiants des entités concernées
+        """
+        if not ids:
+            return
+        with self._lock:
+            self.seq += 1
+            event = ChangeEvent(self.seq, type, list(ids))
+            self._history.append(event)
+            # Sous le verrou : les distributions sont planifiées dans l'ordre des numéros
+            for loop, subscriptions in list(self._loops.items()):
+                if not subscriptions:
+                    continue
+                try:
+                    loop.call_soon_threadsafe(self._fan_out, subscriptions, event)
+                except RuntimeError:
+                    self.subscribers -= len(self._loops.pop(loop))  # Boucle fermée
+
+    @staticmethod
+    def _fan_out(subscriptions: set, event: ChangeEvent):
+        for subscription in tuple(subscriptions):
+            subscription._push(event)
+
+    def subscribe(self, after: int | None = None) -> tuple[Subscription, list[ChangeEvent], bool]:
+        """
+        Abonne la requête en cours (à appeler depuis la boucle d'événements).
+        :param after: Dernier numéro reçu par le client, ou None pour partir de maintenant
+        :return: Tuple (abonnement, événements manqués depuis `after`, reprise impossible)
+        :raises HTTPException: 503 si le nombre maximal d'abonnés est atteint
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.subscribers >= self.max_subscribers:
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Trop d'abonnés : réessayez plus tard.")
+            backlog, reset = self._since(after)
+            subscription = Subscription(loop, self.buffer, self.seq)
+            self._loops.setdefault(loop, set()).add(subscription)
+            self.subscribers += 1
+        return subscription, backlog, reset
+
+    def _since(self, after: int | None) -> tuple[list[ChangeEvent], bool]:
+        """
+        :param after: Dernier numéro reçu par le client
+        :return: Tuple (événements suivants, reprise impossible), à appeler sous le verrou
+        """
+        if after is None or after == self.seq:
+            return [], False
+        oldest = self._history[0].seq if self._history else self.seq + 1
+        # Numéro sorti de l'historique, ou d'un autre processus (redémarrage, autre worker)
+        if after < oldest - 1 or after > self.seq:
+            self.resets += 1
+            return [], True
+        return [event for event in self._history if event.seq > after], False
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._loops.get(subscription.loop)
+            if subscriptions is not None and subscription in subscriptions:
+                subscriptions.discard(subscription)
+                self.subscribers -= 1
+                if subscription.overflowed:
+                    self.overflows += 1
+                if not subscriptions:
+                    del self._loops[subscription.loop]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "seq": self.seq,
+                "history": len(self._history),
+                "subscribers": self.subscribers,
+                "overflows": self.overflows,
+                "resets": self.resets,
+            }
+
+
+def _marker(type: str, seq: int) -> bytes:
+    """
+    Trame SSE de début de flux : "ready" (position de départ) ou "reset" (relecture complète nécessaire).
+    """
+    return f'id: {seq}\nevent: {type}\ndata: {{"seq": {seq}}}\n\n'.encode()
+
+
+async def sse_events(feed: ChangeFeed, subscription: Subscription, backlog: list[ChangeEvent], reset: bool, heartbeat: float):
+    """
+    Trames Server-Sent Events d'un abonné : position de départ, événements manqués, puis événements au fil de l'eau.
+    Un commentaire est envoyé toutes les `heartbeat` secondes sans événement (connexions gardées ouvertes
+    par les proxys, client parti détecté). Le flux s'arrête sur un événement "overflow" si le client est trop lent.
+    :param feed: Flux des modifications
+    :param subscription: Abonnement de la requête
+    :param backlog: Événements manqués depuis Last-Event-ID
+    :param reset: Reprise impossible : le client doit tout relire
+    :param heartbeat: Intervalle du battement de cœur en secondes
+    """
+    try:
+        # Position avant les événements manqués : une coupure pendant leur envoi ne fait rien perdre
+        yield _marker("reset" if reset else "ready", backlog[0].seq - 1 if backlog else subscription.last_seq)
+        if backlog:
+            yield b"".join(event.frame for event in backlog)
+        while True:
+            try:
+                events = await subscription.next_events(heartbeat)
+            except SubscriberOverflow:
+                yield _marker("overflow", subscription.last_seq)  # Reconnexion avec Last-Event-ID
+                return
+            yield b"".join(event.frame for event in events) if events else b": keepalive\n\n"
+    finally:
+        feed.unsubscribe(subscription)
+
+
+async def long_poll(feed: ChangeFeed, after: int | None, timeout: float) -> bytes:
+    """
+    Événements suivant `after`, en attendant au plus `timeout` secondes s'il n'y en a pas encore.
+    Sans `after`, renvoie aussitôt la position courante, point de départ des appels suivants.
+    :param feed: Flux des modifications
+    :param after: Dernier numéro reçu par le client
+    :param timeout: Attente maximale en secondes
+    :return: JSON {"events": [...], "last_seq": n, "reset": bool}
+    """
+    subscription, events, reset = feed.subscribe(after)
+    try:
+        if after is not None and not events and not reset:
+            try:
+                events = await subscription.next_events(timeout)
+            except SubscriberOverflow:
+                events = list(subscription.events)  # File pleine : renvoyée telle quelle, la suite au prochain appel
+    finally:
+        feed.unsubscribe(subscription)
+    last_seq = events[-1].seq if events else subscription.last_seq
+    body = ",".join(event.json for event in events)
+    return f'{{"events":[{body}],"last_seq":{last_seq},"reset":{"true" if reset else "false"}}}'.encode()
+
+
+async def changes_response(feed: ChangeFeed, request: Request, after: int | None, timeout: float):
+    """
+    Réponse des routes /changes : flux SSE si le client accepte text/event-stream, sinon long-poll JSON.
+    :param feed: Flux des modifications
+    :param request: Requête HTTP (Accept, Last-Event-ID)
+    :param after: Dernier numéro reçu (paramètre `after`, ou en-tête Last-Event-ID pour une reconnexion SSE)
+    :param timeout: Attente maximale d'une requête long-poll
+    """
+    if "text/event-stream" not in request.headers.get("accept", ""):
+        return Response(await long_poll(feed, after, timeout), media_type="application/json")
+    last_event_id = request.headers.get("last-event-id")
+    if after is None and last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+    subscription, backlog, reset = feed.subscribe(after)
+    return StreamingResponse(
+        sse_events(feed, subscription, backlog, reset, get_settings().change_feed_heartbeat),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # Pas de mise en tampon par nginx
+    )
+
+
+objet_changes = ChangeFeed("objets")  # Alimenté par les écritures des services des objets
+utilisateur_changes = ChangeFeed("utilisateurs")  # Alimenté par les écritures du repository des utilisateurs
@@ -0,0 +1,166 @@
+# services/compression.py
+import gzip  # Compression gzip en une fois
+import zlib  # Compression gzip en continu (réponses en streaming)
+from src.config import get_settings  # Encodages activés, seuil et taille du cache
+from src.services.cache import LRUCache  # Cache des corps déjà compressés
+
+try:
+    import brotli  # Dépendance optionnelle : encodage "br"
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard  # Dépendance optionnelle : encodage "zstd"
+except ImportError:
+    zstandard = None
+
+# Niveaux de compression : compromis entre taille et temps CPU pour des réponses JSON
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+COMPRESSED_CACHE_TTL = 300.0  # Durée de vie d'un corps compressé en cache (secondes)
+# Types de contenu compressés (préfixes) ; les autres (images, archives...) sont envoyés tels quels
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+# Flux SSE : connexions longues et souvent inactives, un compresseur par connexion coûterait de la mémoire pour rien
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """
+    Encodages configurés (COMPRESSION, par ordre de préférence du serveur) dont la bibliothèque est installée.
+    :return: Tuple des encodages utilisables, vide si la compression est désactivée
+    """
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    configured = (name.strip() for name in get_settings().compression.split(","))
+    return tuple(name for name in configured if installed.get(name))
+
+
+def negotiate(accept_encoding: str | None, encodings: tuple[str, ...]) -> str | None:
+    """
+    Choisit l'encodage de la réponse d'après l'en-tête Accept-Encoding du client.
+    Le poids q le plus élevé l'emporte ; à poids égal, l'ordre de préférence du serveur décide.
+    :param accept_encoding: Valeur de l'en-tête Accept-Encoding, ou None
+    :param encodings: Encodages disponibles, par ordre de préférence
+    :return: Encodage retenu, ou None pour une réponse non compressée
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0  # Poids invalide : encodage ignoré
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """
+    :param content_type: Valeur de l'en-tête Content-Type
+    :return: True si ce type de contenu gagne à être compressé
+    """
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(UNCOMPRESSED_TYPES)
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    """
+    Compresse un corps complet.
+    :param encoding: "gzip", "br" ou "zstd"
+    :param data: Corps à compresser
+    :return: Corps compressé
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)  # mtime fixe : même entrée, même sortie
+
+
+class StreamCompressor:
+    """
+    Compression d'une réponse envoyée par morceaux : chaque morceau est compressé puis vidé
+    aussitôt (flush), pour que le client reçoive les données au fil de l'eau.
+    """
+
+    def __init__(self, encoding: str):
+        """
+        :param encoding: "gzip", "br" ou "zstd"
+        """
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 : en-tête et contrôle gzip
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        :param chunk: Morceau du corps
+        :return: Données compressées à envoyer immédiatement
+        """
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        if self.encoding == "zstd":
+            return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """
+        :return: Fin du flux compressé
+        """
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionStats:
+    """
+    Compteurs de la compression des réponses.
+    """
+
+    def __init__(self):
+        self.responses = 0  # Réponses compressées
+        self.bytes_in = 0  # Octets avant compression
+        self.bytes_out = 0  # Octets envoyés après compression
+        self.skipped_small = 0  # Réponses sous le seuil, envoyées telles quelles
+
+    def as_dict(self) -> dict:
+        """
+        :return: Compteurs, avec les hits / misses du cache des corps compressés
+        """
+        cache = get_compressed_cache().stats()
+        return {
+            "responses": self.responses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "skipped_small": self.skipped_small,
+            "cache_hits": cache["hits"],
+            "cache_misses": cache["misses"],
+        }
+
+
+compression_stats = CompressionStats()
+_compressed_cache = None  # Corps compressés des réponses avec ETag (créé à la première utilisation)
+
+
+def get_compressed_cache() -> LRUCache:
+    """
+    Cache des corps déjà compressés, indexé par (encodage, chemin, ETag) : une réponse identique
+    (même ETag) n'est compressée qu'une fois. Taille : COMPRESSION_CACHE_SIZE entrées.
+    :return: Instance du cache
+    """
+    global _compressed_cache
+    if _compressed_cache is None:
+        _compressed_cache = LRUCache(max_size=get_settings().compression_cache_size, ttl=COMPRESSED_CACHE_TTL)
+    return _compressed_cache
@@ -0,0 +1,57 @@
+# services/export_services.py
+import json  # Encodage JSON des lignes exportées
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",  # Un objet JSON par ligne
+    "json": "application/json",  # Un tableau JSON envoyé par morceaux
+}
+
+
+def _encode_row(row) -> str:
+    """
+    Encode une ligne (mapping colonne -> valeur) en JSON compact.
+    :param row: Ligne issue de la base de données
+    :return: Chaîne JSON
+    """
+    return json.dumps(dict(row), default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+def stream_export(fetch_rows, db, fmt: str = "ndjson", batch_size: int = 1000):
+    """
+    Générateur qui exporte une table ligne par ligne, en NDJSON ou en tableau JSON.
+    La session est fournie par la route (`Depends(get_db)`) : elle n'est fermée qu'après l'envoi complet
+    de la réponse, et les dépendances remplacées (dependency_overrides) s'appliquent aussi à l'export.
+    Les lignes sont regroupées par lots pour limiter le nombre d'écritures réseau.
+    :param fetch_rows: Fonction (db, batch_size) -> itérateur de lignes (ex. `iter_objets`)
+    :param db: Session de base de données
+    :param fmt: Format de sortie, "ndjson" ou "json"
+    :param batch_size: Nombre de lignes par lot lu et envoyé
+    :return: Itérateur de morceaux de texte
+    """
+    if fmt == "json":
+        yield "["  # Premier octet envoyé immédiatement
+    first = True  # Reste vrai tant qu'aucun lot n'a été envoyé (virgules du tableau JSON)
+    chunk = []
+    for row in fetch_rows(db, batch_size):
+        chunk.append(_encode_row(row))
+        if len(chunk) >= batch_size:
+            yield _join_chunk(chunk, fmt, first)
+            first = False
+            chunk = []
+    if chunk:
+        yield _join_chunk(chunk, fmt, first)
+    if fmt == "json":
+        yield "]"
+
+
+def _join_chunk(chunk: list[str], fmt: str, first: bool) -> str:
+    """
+    Assemble un lot de lignes encodées selon le format demandé.
+    :param chunk: Lignes JSON déjà encodées
+    :param fmt: Format de sortie, "ndjson" ou "json"
+    :param first: True s'il s'agit du premier lot envoyé
+    :return: Morceau de texte à envoyer au client
+    """
+    if fmt == "ndjson":
+        return "\n".join(chunk) + "\n"  # Une ligne par objet, terminée par un saut de ligne
+    return ("" if first else ",") + ",".join(chunk)  # Éléments du tableau JSON
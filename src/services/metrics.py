@@ -0,0 +1,168 @@
+# services/metrics.py
+import threading  # Verrou : les observations arrivent depuis la boucle asyncio et le pool de threads
+import time  # Mesure de la durée des requêtes SQL
+from bisect import bisect_left  # Recherche du seau d'histogramme
+from contextvars import ContextVar  # Statistiques SQL propres à la requête HTTP en cours
+from sqlalchemy import event  # Événements d'exécution des requêtes SQL
+from sqlalchemy.engine import Engine
+from src.services.profiling import current_profile, slow_query_log  # Profil de la requête, requêtes lentes
+
+# Bornes des histogrammes de latence HTTP (secondes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bornes de l'histogramme du nombre de requêtes SQL par requête HTTP
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class Histogram:
+    """
+    Histogramme cumulatif au format Prometheus (seaux, somme et nombre d'observations).
+    """
+
+    def __init__(self, buckets):
+        """
+        :param buckets: Bornes supérieures des seaux, triées
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Le dernier seau correspond à +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+        :param value: Valeur observée
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques HTTP et SQL, indexées par méthode et par modèle de route
+    (ex. /objets/{codobj}) plutôt que par chemin brut, pour borner le nombre de séries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}  # (méthode, route, statut) -> nombre de requêtes
+        self.latency = {}  # (méthode, route) -> Histogram des durées
+        self.db_queries = {}  # (méthode, route) -> Histogram du nombre de requêtes SQL
+        self.db_time = {}  # (méthode, route) -> temps SQL cumulé (secondes)
+
+    def observe_request(self, method: str, route: str, status: int, duration: float, queries: int, db_time: float):
+        """
+        Enregistre une requête HTTP terminée.
+        :param method: Méthode HTTP
+        :param route: Modèle de la route
+        :param status: Code de statut de la réponse
+        :param duration: Durée totale de la requête (secondes)
+        :param queries: Nombre de requêtes SQL exécutées
+        :param db_time: Temps passé dans les requêtes SQL (secondes)
+        """
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.db_queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(queries)
+            self.db_time[key] = self.db_time.get(key, 0.0) + db_time
+
+    def reset(self):
+        """
+        Remet toutes les métriques à zéro (mesures isolées, ex. benchmarks).
+        """
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.db_queries.clear()
+            self.db_time.clear()
+
+    def queries_per_request(self) -> float:
+        """
+        :return: Nombre moyen de requêtes SQL par requête HTTP, toutes routes confondues
+        """
+        with self._lock:
+            count = sum(histogram.count for histogram in self.db_queries.values())
+            total = sum(histogram.sum for histogram in self.db_queries.values())
+        return total / count if count else 0.0
+
+    def render(self) -> str:
+        """
+        :return: Les métriques au format texte Prometheus
+        """
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_requests_total Nombre de requêtes HTTP traitées.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status), value in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {value}')
+            _render_histograms(lines, "http_request_duration_seconds", "Durée des requêtes HTTP.", self.latency)
+            _render_histograms(lines, "db_queries_per_request", "Nombre de requêtes SQL par requête HTTP.", self.db_queries)
+            lines.append("# HELP db_query_duration_seconds_total Temps cumulé passé dans les requêtes SQL.")
+            lines.append("# TYPE db_query_duration_seconds_total counter")
+            for (method, route), value in sorted(self.db_time.items()):
+                lines.append(f'db_query_duration_seconds_total{{method="{method}",route="{route}"}} {value:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+def _render_histograms(lines: list, name: str, help_text: str, histograms: dict):
+    """
+    Ajoute une famille d'histogrammes au format texte Prometheus.
+    """
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in sorted(histograms.items()):
+        labels = f'method="{method}",route="{route}"'
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+registry = MetricsRegistry()  # Registre partagé par le middleware et la route /metrics
+
+
+class QueryStats:
+    """
+    Statistiques SQL d'une requête HTTP (nombre de requêtes et temps cumulé).
+    """
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# Statistiques de la requête HTTP en cours ; le contexte est recopié dans le pool de threads
+# des routes synchrones, l'objet (mutable) reste donc partagé avec le middleware.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:  # Requête exécutée en dehors d'une requête HTTP : rien à enregistrer
+        stats.count += 1
+        stats.duration += duration
+    profile = current_profile.get()
+    if profile is not None:  # Requête HTTP profilée (X-Profile)
+        profile.add_sql(statement, duration)
+    slow_query_log.observe(cursor, conn.dialect.name, statement, parameters, duration, executemany)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # Requête en échec : pas d'after_cursor_execute, le début mesuré est retiré de la connexion (réutilisée par le pool)
+    conn = context.connection
+    starts = conn.info.get("query_start_time") if conn is not None else None
+    if starts:
+        starts.pop()
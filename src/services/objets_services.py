@@ -1,41 +1,67 @@
 # services/objets_service.py
+import threading  # Verrou : une seule construction de l'index de recherche à la fois
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 from src.models import Objet  # Importation du modèle Objet
-from src.schemas.objet import ObjetCreate  # Importation du schéma ObjetCreate
+from src.schemas.objet import ObjetCreate, ObjetResponse  # Importation des schémas ObjetCreate et ObjetResponse
+from src.services.serialization import entity_json  # Validation et sérialisation d'une entité (profilées)
+from src.services.cache import etag_cache_key, invalidate, read_through, set_if_current  # Cache en lecture (read-through) des objets et de leurs ETags
+from src.services.versions import bump_version, entity_etag, etag_matches, table_version  # Versions et ETags (ETag / If-Match)
+from src.services.batch_lookup import get_json_by_ids  # Lecture groupée : cache d'abord, puis requêtes IN par lots
+from src.services.single_flight import single_flight  # Lectures identiques simultanées regroupées
+from src.services.change_feed import objet_changes  # Flux des modifications (GET /objets/changes)
+from src.services.sparse_fields import sparse_json  # Sérialisation des listes réduites aux champs demandés
+from src.repositories.objets_repository import get_objets_page as repo_get_objets_page  # Pagination SQL
+from src.repositories.objets_repository import iter_objets  # Parcours de la table avec un curseur côté serveur (export)
+from src.repositories.objets_repository import get_objet_rows_page  # Page d'objets lue en colonnes (sérialisation rapide)
+from src.repositories.objets_repository import OBJET_COLUMNS, OBJET_COLUMNS_BY_NAME  # Colonnes d'un objet (hors relation `condit`)
+from src.repositories.objets_repository import get_all_objets as repo_get_all_objets, get_objet_by_id as repo_get_objet_by_id  # Lectures avec `condit`
+from src.repositories.objets_repository import get_objets_by_ids as repo_get_objets_by_ids  # Lecture groupée avec `condit`
+from src.repositories.objets_repository import get_objet_rows_by_ids, iter_objet_labels, search_objet_rows  # Recherche sur les libellés
+from src.repositories.objets_repository import release_condit, select_condit  # Relation `condit` hors ORM (mise à jour, suppression)
+from src.config import get_settings  # Moteur de recherche (SEARCH_BACKEND)
+from src.database_replicas import replica_name  # Lectures sur un réplica : ni mises en cache, ni regroupées avec la base principale
+from src.services.search_index import objet_search_index, tokenize  # Index inversé des libellés en mémoire
+
+BULK_CHUNK_SIZE = 1000  # Nombre d'identifiants par clause IN lors des opérations en masse
+# Colonnes modifiables d'un objet (toutes sauf la clé primaire)
+UPDATABLE_COLUMNS = frozenset(column.key for column in OBJET_COLUMNS) - {"codobj"}
+# Champs d'une liste d'objets sans `include=condit` : colonnes de la table uniquement
+OBJET_LIST_FIELDS = tuple(name for name in ObjetResponse.model_fields if name != "condit")
+OBJET_LIST_COLUMNS = tuple(OBJET_COLUMNS_BY_NAME[name] for name in OBJET_LIST_FIELDS)  # Colonnes correspondantes
+OBJET_FIELDS = tuple(ObjetResponse.model_fields)  # Tous les champs, relation `condit` comprise
+_search_index_build_lock = threading.Lock()  # Construction de l'index au démarrage et à la première recherche
+
+
+class PreconditionFailed(Exception):
+    """
+    Levée quand l'ETag fourni dans If-Match ne correspond plus à l'objet (modifié entre-temps).
+    """
+
+    def __init__(self, etag: str):
+        super().__init__(f"ETag courant : {etag}")
+        self.etag = etag  # ETag courant de l'objet, renvoyé au client
 
 # Fonction pour créer un nouvel objet
 def create_objet(db: Session, objet_data: ObjetCreate):
     """
-    Crée un nouvel objet dans la base de données.
+    Crée un nouvel objet avec une seule requête INSERT ... RETURNING.
     :param db: Session de base de données
     :param objet_data: Données de l'objet à créer
-    :return: L'objet créé
-    """
-    # Crée une nouvelle instance de l'objet sans inclure le champ `codobj` (auto-incrémenté par la base)
-    new_objet = Objet(
-        libobj=objet_data.libobj,
-        tailleobj=objet_data.tailleobj,
-        puobj=objet_data.puobj,
-        poidsobj=objet_data.poidsobj,
-        indispobj=objet_data.indispobj,
-        o_imp=objet_data.o_imp,
-        o_aff=objet_data.o_aff,
-        o_cartp=objet_data.o_cartp,
-        points=objet_data.points,
-        o_ordre_aff=objet_data.o_ordre_aff
-    )
-    
-    # Ajouter l'objet à la session de la base de données
-    db.add(new_objet)
-    
+    :return: Les colonnes de l'objet créé
+    """
+    # `codobj` est auto-incrémenté par la base et `condit` est une relation : ils ne font pas partie de l'INSERT
+    stmt = insert(Objet).values(**objet_data.model_dump(exclude={"codobj", "condit"})).returning(*OBJET_COLUMNS)
     try:
-        # Commit la transaction pour enregistrer l'objet dans la base de données
+        new_objet = db.execute(stmt).mappings().one()  # Ligne insérée, avec l'identifiant généré
         db.commit()
-        db.refresh(new_objet)  # Rafraîchit l'objet pour récupérer l'ID auto-incrémenté
-        return new_objet
     except Exception as e:
         db.rollback()  # Annule la transaction en cas d'erreur
         raise e  # Gérer l'exception selon les besoins de votre application
+    objets_changed()  # Les listes d'objets ont changé
+    objet_changes.publish("created", new_objet["codobj"])
+    objet_search_index.add(new_objet["codobj"], new_objet["libobj"])  # Le nouvel objet est trouvable immédiatement
+    return dict(new_objet)
 
 
 # Fonction pour récupérer tous les objets
@@ -45,8 +71,111 @@ def get_all_objets(db: Session):
     :param db: Session de base de données
     :return: Liste de tous les objets
     """
-    # Requête pour récupérer tous les objets dans la base de données
-    return db.query(Objet).all()
+    # Requête pour récupérer tous les objets, avec leur relation `condit` chargée en une fois
+    return repo_get_all_objets(db)
+
+# Fonction pour récupérer une page d'objets
+def get_objets_page(db: Session, limit: int, after: int | None = None, libobj: str | None = None,
+                    indispobj: int | None = None, o_aff: int | None = None):
+    """
+    Récupère une page d'objets filtrés, triés par `codobj`, avec leur relation `condit`.
+    :param db: Session de base de données
+    :param limit: Nombre maximal d'objets par page
+    :param after: Curseur : dernier `codobj` de la page précédente
+    :param libobj: Préfixe du libellé
+    :param indispobj: Filtre sur l'indisponibilité
+    :param o_aff: Filtre sur l'affichage
+    :return: Tuple (liste des objets, curseur suivant ou None)
+    """
+    return repo_get_objets_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+
+# Fonction pour récupérer une page d'objets réduite à certains champs
+def get_objets_sparse_page(db: Session, fields: tuple[str, ...], limit: int, after: int | None = None,
+                           libobj: str | None = None, indispobj: int | None = None, o_aff: int | None = None):
+    """
+    Récupère une page d'objets en ne lisant que les champs demandés.
+    Sans `condit`, seules les colonnes demandées sont sélectionnées (lignes sous forme de dictionnaires) ;
+    avec `condit`, les objets ORM sont chargés avec `load_only` sur les colonnes demandées.
+    :param db: Session de base de données
+    :param fields: Champs demandés (voir `parse_fields`)
+    :param limit: Nombre maximal d'objets par page
+    :param after: Curseur : dernier `codobj` de la page précédente
+    :param libobj: Préfixe du libellé
+    :param indispobj: Filtre sur l'indisponibilité
+    :param o_aff: Filtre sur l'affichage
+    :return: Tuple (liste des objets, curseur suivant ou None)
+    """
+    if "condit" in fields:
+        return repo_get_objets_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff, fields=fields)
+    columns = tuple(OBJET_COLUMNS_BY_NAME[name] for name in fields)
+    return get_objet_rows_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff, columns=columns)
+
+# Fonction pour récupérer une page d'objets déjà sérialisée
+def get_objets_page_json(db: Session, fields: tuple[str, ...] | None, limit: int, after: int | None = None,
+                         libobj: str | None = None, indispobj: int | None = None, o_aff: int | None = None):
+    """
+    Récupère une page d'objets sérialisée en JSON. Les requêtes identiques simultanées (mêmes paramètres,
+    même version de la table) partagent une seule lecture et une seule sérialisation (single-flight).
+    :param db: Session de base de données
+    :param fields: Champs demandés, ou None pour les objets complets avec `condit`
+    :param limit: Nombre maximal d'objets par page
+    :param after: Curseur : dernier `codobj` de la page précédente
+    :param libobj: Préfixe du libellé
+    :param indispobj: Filtre sur l'indisponibilité
+    :param o_aff: Filtre sur l'affichage
+    :return: Tuple (JSON de la page, curseur suivant ou None)
+    """
+    def load():
+        if fields is None:
+            objets, next_cursor = get_objets_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+            return sparse_json(ObjetResponse, OBJET_FIELDS, objets), next_cursor
+        objets, next_cursor = get_objets_sparse_page(db, fields, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+        return sparse_json(ObjetResponse, fields, objets), next_cursor
+
+    key = ("objets", "list", table_version("objets"), replica_name(db), fields, limit, after, libobj, indispobj, o_aff)
+    return single_flight.do(key, load)
+
+# Fonction pour rechercher des objets par leur libellé
+def search_objets(db: Session, q: str, limit: int):
+    """
+    Recherche les objets dont le libellé contient des mots commençant par ceux de `q`
+    (sans tenir compte des accents ni des majuscules), classés par pertinence.
+    Avec SEARCH_BACKEND=memory, l'index en mémoire fournit les identifiants, puis une seule requête
+    (par clé primaire) lit leurs colonnes ; avec SEARCH_BACKEND=database, la base fait la recherche.
+    :param db: Session de base de données
+    :param q: Texte recherché
+    :param limit: Nombre maximal de résultats
+    :return: Liste de dictionnaires colonne -> valeur (sans `condit`), du plus pertinent au moins pertinent
+    """
+    if get_settings().search_backend == "database":
+        return search_objet_rows(db, tokenize(q), limit, columns=OBJET_LIST_COLUMNS)
+    ensure_objet_search_index(db)  # Index pas encore construit (construction en cours, ou application sans lifespan)
+    codobjs = objet_search_index.search(q, limit)
+    rows = get_objet_rows_by_ids(db, codobjs, columns=OBJET_LIST_COLUMNS)
+    return [rows[codobj] for codobj in codobjs if codobj in rows]
+
+
+def build_objet_search_index(db: Session):
+    """
+    (Re)construit l'index de recherche en mémoire à partir de tous les libellés d'objets.
+    :param db: Session de base de données
+    :return: Nombre d'objets indexés
+    """
+    objet_search_index.build(iter_objet_labels(db))
+    return objet_search_index.stats()["documents"]
+
+
+def ensure_objet_search_index(db: Session):
+    """
+    Construit l'index de recherche en mémoire s'il ne l'est pas encore. Un seul appelant le construit :
+    une recherche arrivée pendant la construction au démarrage attend sa fin au lieu d'en lancer une autre.
+    :param db: Session de base de données
+    """
+    if objet_search_index.ready:
+        return
+    with _search_index_build_lock:
+        if not objet_search_index.ready:
+            build_objet_search_index(db)
 
 # Fonction pour récupérer un objet par son ID
 def get_objet_by_id(db: Session, codobj: int):
@@ -56,60 +185,290 @@ def get_objet_by_id(db: Session, codobj: int):
     :param codobj: Identifiant de l'objet à récupérer
     :return: L'objet correspondant ou None si l'objet n'existe pas
     """
-    # Requête pour récupérer un objet en fonction de son identifiant (codobj)
-    return db.query(Objet).filter(Objet.codobj == codobj).first()
+    # Requête pour récupérer un objet en fonction de son identifiant (codobj), avec sa relation `condit`
+    return repo_get_objet_by_id(db, codobj)
+
+# Fonction pour récupérer un objet sérialisé, en passant par le cache
+def get_objet_json(db: Session, codobj: int):
+    """
+    Récupère un objet déjà sérialisé en JSON (`ObjetResponse`), depuis le cache si possible.
+    :param db: Session de base de données
+    :param codobj: Identifiant de l'objet
+    :return: Le JSON de l'objet ou None si l'objet n'existe pas
+    """
+    def load():
+        objet = get_objet_by_id(db, codobj)  # Lecture en base uniquement en cas d'absence dans le cache
+        if objet is None:
+            return None
+        objet_json = entity_json(ObjetResponse, objet)
+        if replica is None:
+            set_if_current(etag_cache_key(cache_key), entity_etag(objet_json), "objets", version)  # Voir `get_cached_etag`
+        return objet_json
+
+    # En cas d'absence dans le cache, les lectures simultanées du même objet (sur la même base) n'en font qu'une
+    cache_key = objet_cache_key(codobj)
+    version = table_version("objets")
+    replica = replica_name(db)
+    key = ("objets", "get", version, replica, codobj)
+    return read_through(cache_key, lambda: single_flight.do(key, load), "objets", store=replica is None)
+
+# Fonction pour récupérer plusieurs objets sérialisés, en passant par le cache
+def get_objets_json_by_ids(db: Session, codobjs: list[int]) -> dict:
+    """
+    Récupère plusieurs objets déjà sérialisés en JSON (`ObjetResponse`) : ceux en cache sans requête,
+    les autres avec une requête IN par lot de BATCH_CHUNK_SIZE identifiants.
+    :param db: Session de base de données
+    :param codobjs: Identifiants des objets
+    :return: Dictionnaire codobj -> JSON de l'objet, ou None s'il n'existe pas (ordre de la requête, sans doublons)
+    """
+    def load_chunk(chunk):
+        return {objet.codobj: entity_json(ObjetResponse, objet) for objet in repo_get_objets_by_ids(db, chunk)}
+
+    return get_json_by_ids(codobjs, objet_cache_key, load_chunk, "objets", store=replica_name(db) is None)
+
+
+def objet_cache_key(codobj: int) -> str:
+    """
+    :param codobj: Identifiant de l'objet
+    :return: La clé de l'objet dans le cache
+    """
+    return f"objet:{codobj}"
+
+
+def objets_changed(*codobjs: int):
+    """
+    À appeler après chaque écriture validée sur les objets :
+    incrémente la version de la table et invalide les objets concernés (et leurs ETags) dans le cache.
+    :param codobjs: Identifiants des objets modifiés ou supprimés
+    """
+    bump_version("objets")  # Avant l'invalidation : une lecture en cours ne remet pas l'ancienne valeur en cache
+    keys = [objet_cache_key(codobj) for codobj in codobjs]
+    invalidate(*keys, *(etag_cache_key(key) for key in keys))
 
 # Fonction pour supprimer un objet
 def delete_objet(db: Session, codobj: int):
     """
-    Supprime un objet en fonction de son ID.
+    Supprime un objet avec une requête DELETE, précédée de celle qui supprime ou détache ses conditionnements
+    (le DELETE ne passe pas par l'ORM, qui s'en chargeait, voir `release_condit`).
     :param db: Session de base de données
     :param codobj: Identifiant de l'objet à supprimer
+    :return: True si l'objet a été supprimé, False s'il n'existe pas
     """
-    # Recherche de l'objet à supprimer par son identifiant (codobj)
-    objet = db.query(Objet).filter(Objet.codobj == codobj).first()
-    
-    # Si l'objet existe, on le supprime
-    if objet:
-        db.delete(objet)  # Suppression de l'objet de la session
+    stmt = delete(Objet).where(Objet.codobj == codobj).execution_options(synchronize_session=False)
+    release = release_condit([codobj])
+    try:
+        if release is not None:
+            db.execute(release)
+        deleted = db.execute(stmt).rowcount  # Nombre de lignes supprimées (0 si l'objet n'existe pas)
         db.commit()  # Validation de la suppression dans la base de données
+    except Exception as e:
+        db.rollback()  # Annule la transaction en cas d'erreur
+        raise e
+    if not deleted:
+        return False
+    objets_changed(codobj)  # L'objet ne doit plus être servi depuis le cache
+    objet_changes.publish("deleted", codobj)
+    objet_search_index.remove(codobj)  # Ni trouvé par la recherche
+    return True
 
 # Fonction pour mettre à jour un objet
 def update_objet(db: Session, codobj: int, updated_data: dict):
     """
-    Met à jour un objet en fonction de son ID et des nouvelles données.
+    Met à jour un objet avec une requête UPDATE ... RETURNING, puis relit ses conditionnements
+    (non renvoyés par RETURNING) dans la même transaction.
+    La clé primaire et la relation `condit` ne sont pas modifiées.
     :param db: Session de base de données
     :param codobj: Identifiant de l'objet à mettre à jour
-    :param updated_data: Données mises à jour sous forme de dictionnaire
-    :return: L'objet mis à jour ou None si l'objet n'existe pas
-    """
-    # Recherche de l'objet à mettre à jour par son identifiant (codobj)
-    objet = db.query(Objet).filter(Objet.codobj == codobj).first()
-    
-    # Si l'objet existe, on met à jour ses attributs
-    if objet:
-        # Si updated_data est une instance de ObjetCreate, convertir en dictionnaire
-        if isinstance(updated_data, ObjetCreate):
-            updated_data = updated_data.dict()
-
-        # Itérer sur les données mises à jour (sous forme de dictionnaire)
-        for key, value in updated_data.items():
-            # Si l'objet a l'attribut à mettre à jour, on lui assigne la nouvelle valeur
-            if hasattr(objet, key):
+    :param updated_data: Données mises à jour (ObjetCreate ou dictionnaire)
+    :return: Les colonnes de l'objet mis à jour avec `condit`, ou None si l'objet n'existe pas
+    """
+    # Si updated_data est une instance de ObjetCreate, convertir en dictionnaire
+    if isinstance(updated_data, ObjetCreate):
+        updated_data = updated_data.model_dump()
+    # Ne conserve que les colonnes modifiables de l'objet
+    values = {key: value for key, value in updated_data.items() if key in UPDATABLE_COLUMNS}
+    stmt = (
+        update(Objet)
+        .where(Objet.codobj == codobj)
+        .values(**values)
+        .returning(*OBJET_COLUMNS)
+        .execution_options(synchronize_session=False)  # Pas de synchronisation (ni de SELECT) avec la session
+    )
+    try:
+        objet = db.execute(stmt).mappings().first()  # Aucune ligne renvoyée si l'objet n'existe pas
+        if objet is not None:
+            objet = {**objet, "condit": [dict(row) for row in db.execute(select_condit(codobj)).mappings()]}
+        db.commit()
+    except Exception as e:
+        db.rollback()  # Annule la transaction si une erreur se produit
+        raise e  # Vous pouvez gérer cette exception en fonction de votre logique (par exemple, envoyer une réponse d'erreur)
+    if objet is None:
+        return None  # Si l'objet n'existe pas, retourne None
+    objets_changed(codobj)  # La version en cache est désormais obsolète
+    objet_changes.publish("updated", codobj)
+    objet_search_index.add(codobj, objet["libobj"])  # Réindexe le libellé
+    return objet
+
+
+# Fonction pour mettre à jour partiellement un objet
+def patch_objet(db: Session, codobj: int, changes: dict, if_match: str | None = None):
+    """
+    Met à jour uniquement les champs fournis d'un objet.
+    L'ORM n'émet un UPDATE que pour les colonnes dont la valeur change réellement.
+    Si `if_match` est fourni, la ligne est verrouillée (SELECT ... FOR UPDATE) et son ETag comparé
+    avant la modification : une modification concurrente n'est jamais écrasée.
+    Si rien ne change (corps vide, valeurs identiques), l'objet courant est renvoyé sans invalider le cache
+    ni publier d'événement.
+    :param db: Session de base de données
+    :param codobj: Identifiant de l'objet à modifier
+    :param changes: Champs à modifier (`model_dump(exclude_unset=True)`)
+    :param if_match: Valeur de l'en-tête If-Match, ou None
+    :return: Le JSON de l'objet modifié, ou None si l'objet n'existe pas
+    :raises PreconditionFailed: Si l'ETag ne correspond plus
+    """
+    query = db.query(Objet).filter(Objet.codobj == codobj)
+    if if_match is not None:
+        query = query.with_for_update()  # Verrouille la ligne jusqu'au commit
+    try:
+        objet = query.first()
+        if objet is None:
+            db.rollback()
+            return None
+        if if_match is not None:
+            current_etag = entity_etag(entity_json(ObjetResponse, objet))
+            if not etag_matches(if_match, current_etag):
+                db.rollback()  # Libère le verrou
+                raise PreconditionFailed(current_etag)
+        for key, value in changes.items():
+            if key in UPDATABLE_COLUMNS:
                 setattr(objet, key, value)
-        
-        # Validation des changements dans la base de données
-        try:
-            db.commit()
-            db.refresh(objet)  # Rafraîchissement de l'objet pour refléter les modifications
-        except Exception as e:
-            db.rollback()  # Annule la transaction si une erreur se produit
-            raise e  # Vous pouvez gérer cette exception en fonction de votre logique (par exemple, envoyer une réponse d'erreur)
-        
-        # Retourne l'objet mis à jour
-        return objet
-    
-    # Si l'objet n'existe pas, retourne None
-    return None
+        modified = db.is_modified(objet)
+        db.flush()  # UPDATE limité aux colonnes modifiées (aucun UPDATE si rien ne change)
+        payload = entity_json(ObjetResponse, objet)  # Sérialisé avant l'expiration au commit
+        libobj = objet.libobj
+        db.commit()
+    except PreconditionFailed:
+        raise
+    except Exception as e:
+        db.rollback()  # Annule la transaction en cas d'erreur
+        raise e
+    if not modified:
+        return payload  # Aucune écriture : version de la table et flux inchangés
+    objets_changed(codobj)  # La version en cache est désormais obsolète
+    objet_changes.publish("updated", codobj)
+    if "libobj" in changes:
+        objet_search_index.add(codobj, libobj)  # Réindexe le libellé modifié
+    return payload
+
+
+# Fonction pour créer plusieurs objets en une seule transaction
+def bulk_create_objets(db: Session, objets_data: list[ObjetCreate]):
+    """
+    Crée plusieurs objets avec un INSERT multi-lignes et une seule transaction.
+    Les lignes créées sont renvoyées par RETURNING (pas de SELECT supplémentaire).
+    :param db: Session de base de données
+    :param objets_data: Liste des objets à créer
+    :return: Liste de dictionnaires {index, codobj, status, objet}
+    """
+    if not objets_data:
+        return []
+    # `codobj` est généré par la base et `condit` est une relation : ils ne font pas partie de l'INSERT
+    rows = [objet.model_dump(exclude={"codobj", "condit"}) for objet in objets_data]
+    stmt = insert(Objet).returning(*OBJET_COLUMNS, sort_by_parameter_order=True)
+    try:
+        created = db.execute(stmt, rows).mappings().all()  # Lignes insérées, dans l'ordre de la requête
+        db.commit()
+    except Exception as e:
+        db.rollback()  # Annule toute la transaction si une ligne échoue
+        raise e
+    objets_changed()  # Les listes d'objets ont changé
+    objet_changes.publish("created", *(row["codobj"] for row in created))
+    for row in created:
+        objet_search_index.add(row["codobj"], row["libobj"])
+    return [
+        {"index": index, "codobj": row["codobj"], "status": "created", "objet": dict(row)}
+        for index, row in enumerate(created)
+    ]
+
+
+# Fonction pour mettre à jour plusieurs objets en une seule transaction
+def bulk_update_objets(db: Session, objets_data: list):
+    """
+    Met à jour plusieurs objets (par clé primaire) dans une seule transaction.
+    Les objets inexistants sont signalés avec le statut "not_found".
+    :param db: Session de base de données
+    :param objets_data: Liste d'`ObjetBulkUpdate` (avec `codobj`)
+    :return: Liste de dictionnaires {index, codobj, status}
+    """
+    if not objets_data:
+        return []
+    ids = [objet.codobj for objet in objets_data]
+    try:
+        existing = _existing_codobjs(db, ids)  # Un seul SELECT (par lot) pour connaître les objets présents
+        mappings = [
+            objet.model_dump(exclude={"condit"})
+            for objet in objets_data
+            if objet.codobj in existing
+        ]
+        if mappings:
+            db.execute(update(Objet), mappings)  # UPDATE par clé primaire exécuté en lot (executemany)
+        db.commit()
+    except Exception as e:
+        db.rollback()  # Annule toute la transaction en cas d'erreur
+        raise e
+    objets_changed(*existing)  # Invalide les objets modifiés
+    objet_changes.publish("updated", *existing)
+    for mapping in mappings:
+        objet_search_index.add(mapping["codobj"], mapping["libobj"])
+    return [
+        {"index": index, "codobj": codobj, "status": "updated" if codobj in existing else "not_found"}
+        for index, codobj in enumerate(ids)
+    ]
+
+
+# Fonction pour supprimer plusieurs objets en une seule transaction
+def bulk_delete_objets(db: Session, codobjs: list[int]):
+    """
+    Supprime plusieurs objets avec DELETE ... WHERE codobj IN (...) RETURNING codobj,
+    précédé pour chaque lot de la requête qui supprime ou détache leurs conditionnements (voir `release_condit`).
+    Un identifiant répété n'est supprimé qu'une fois : ses occurrences suivantes sont signalées "not_found".
+    :param db: Session de base de données
+    :param codobjs: Identifiants des objets à supprimer
+    :return: Liste de dictionnaires {index, codobj, status}
+    """
+    unique = list(dict.fromkeys(codobjs))  # Doublons retirés, ordre de la requête conservé
+    deleted = set()
+    try:
+        for start in range(0, len(unique), BULK_CHUNK_SIZE):
+            chunk = unique[start:start + BULK_CHUNK_SIZE]
+            release = release_condit(chunk)
+            if release is not None:
+                db.execute(release)
+            stmt = delete(Objet).where(Objet.codobj.in_(chunk)).returning(Objet.codobj)
+            deleted.update(db.execute(stmt).scalars().all())  # Identifiants réellement supprimés
+        db.commit()
+    except Exception as e:
+        db.rollback()  # Annule toute la transaction en cas d'erreur
+        raise e
+    objets_changed(*deleted)  # Invalide les objets supprimés
+    objet_changes.publish("deleted", *deleted)
+    objet_search_index.remove(*deleted)
+    results = []
+    for index, codobj in enumerate(codobjs):
+        results.append({"index": index, "codobj": codobj, "status": "deleted" if codobj in deleted else "not_found"})
+        deleted.discard(codobj)  # Suppression déjà signalée pour cet identifiant
+    return results
 
 
+def _existing_codobjs(db: Session, codobjs: list[int]) -> set[int]:
+    """
+    Retourne les identifiants qui existent en base parmi ceux fournis (requêtes IN par lots).
+    :param db: Session de base de données
+    :param codobjs: Identifiants à vérifier
+    :return: Ensemble des identifiants existants
+    """
+    existing = set()
+    for start in range(0, len(codobjs), BULK_CHUNK_SIZE):
+        chunk = codobjs[start:start + BULK_CHUNK_SIZE]
+        existing.update(db.execute(select(Objet.codobj).where(Objet.codobj.in_(chunk))).scalars().all())
+    return existing
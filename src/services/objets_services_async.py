@@ -0,0 +1,174 @@
+# services/objets_services_async.py
+from sqlalchemy import delete, update  # Écritures en une seule requête
+from sqlalchemy.ext.asyncio import AsyncSession  # Session asynchrone
+from src.models import Objet  # Importation du modèle Objet
+from src.schemas.objet import ObjetCreate, ObjetResponse  # Importation des schémas ObjetCreate et ObjetResponse
+from src.services.serialization import entity_json  # Validation et sérialisation d'une entité (profilées)
+from src.services.cache import etag_cache_key, get_cache, set_if_current  # Cache en lecture des objets et de leurs ETags
+from src.services.objets_services import objet_cache_key, objets_changed  # Clés de cache et invalidation
+from src.services.objets_services import OBJET_FIELDS, UPDATABLE_COLUMNS  # Champs et colonnes modifiables d'un objet
+from src.services.single_flight import single_flight  # Lectures identiques simultanées regroupées
+from src.services.change_feed import objet_changes  # Flux des modifications (GET /objets/changes)
+from src.services.sparse_fields import sparse_json  # Sérialisation des listes réduites aux champs demandés
+from src.services.versions import entity_etag, table_version  # ETag mis en cache ; version de la table (clé des lectures regroupées)
+from src.services.search_index import objet_search_index  # Index de recherche tenu à jour à chaque écriture
+from src.repositories.objets_repository import OBJET_COLUMNS, OBJET_COLUMNS_BY_NAME  # Colonnes d'un objet (hors relation `condit`)
+from src.repositories.objets_repository import release_condit, select_condit  # Relation `condit` hors ORM (mise à jour, suppression)
+from src.repositories.objets_repository_async import get_objet_by_id, get_objets_by_ids, get_objets_page, get_objet_rows_page  # Lectures asynchrones
+from src.services.batch_lookup import get_json_by_ids_async  # Lecture groupée : cache d'abord, puis requêtes IN par lots
+
+
+# Fonction pour créer un nouvel objet
+async def create_objet(db: AsyncSession, objet_data: ObjetCreate):
+    """
+    Version asynchrone de `create_objet`.
+    :param db: Session asynchrone
+    :param objet_data: Données de l'objet à créer
+    :return: L'objet créé
+    """
+    # `codobj` est auto-incrémenté par la base et `condit` est une relation : ils ne sont pas repris
+    values = objet_data.model_dump(exclude={"codobj", "condit"})
+    new_objet = Objet(**values)
+    db.add(new_objet)
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()  # Annule la transaction en cas d'erreur
+        raise e
+    objets_changed()  # Les listes d'objets ont changé
+    objet_changes.publish("created", new_objet.codobj)
+    objet_search_index.add(new_objet.codobj, values["libobj"])
+    return await get_objet_by_id(db, new_objet.codobj)  # Recharge l'objet avec sa relation `condit`
+
+
+# Fonction pour récupérer une page d'objets réduite à certains champs
+async def get_objets_sparse_page(db: AsyncSession, fields: tuple[str, ...], limit: int, after: int | None = None,
+                                 libobj: str | None = None, indispobj: int | None = None, o_aff: int | None = None):
+    """
+    Version asynchrone de `get_objets_sparse_page`.
+    :return: Tuple (liste des objets, curseur suivant ou None)
+    """
+    if "condit" in fields:
+        return await get_objets_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff, fields=fields)
+    columns = tuple(OBJET_COLUMNS_BY_NAME[name] for name in fields)
+    return await get_objet_rows_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff, columns=columns)
+
+
+# Fonction pour récupérer une page d'objets déjà sérialisée
+async def get_objets_page_json(db: AsyncSession, fields: tuple[str, ...] | None, limit: int, after: int | None = None,
+                               libobj: str | None = None, indispobj: int | None = None, o_aff: int | None = None):
+    """
+    Version asynchrone de `get_objets_page_json` (lectures identiques simultanées regroupées).
+    :return: Tuple (JSON de la page, curseur suivant ou None)
+    """
+    async def load():
+        if fields is None:
+            objets, next_cursor = await get_objets_page(db, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+            return sparse_json(ObjetResponse, OBJET_FIELDS, objets), next_cursor
+        objets, next_cursor = await get_objets_sparse_page(db, fields, limit, after=after, libobj=libobj, indispobj=indispobj, o_aff=o_aff)
+        return sparse_json(ObjetResponse, fields, objets), next_cursor
+
+    key = ("objets", "list", table_version("objets"), fields, limit, after, libobj, indispobj, o_aff)
+    return await single_flight.do_async(key, load)
+
+
+# Fonction pour récupérer un objet sérialisé, en passant par le cache
+async def get_objet_json(db: AsyncSession, codobj: int):
+    """
+    Version asynchrone de `get_objet_json`.
+    :param db: Session asynchrone
+    :param codobj: Identifiant de l'objet
+    :return: Le JSON de l'objet ou None si l'objet n'existe pas
+    """
+    async def load():
+        objet = await get_objet_by_id(db, codobj)  # Lecture en base uniquement en cas d'absence dans le cache
+        if objet is None:
+            return None
+        objet_json = entity_json(ObjetResponse, objet)
+        set_if_current(etag_cache_key(key), entity_etag(objet_json), "objets", version)
+        return objet_json
+
+    cache = get_cache()
+    key = objet_cache_key(codobj)
+    objet_json = cache.get(key)
+    if objet_json is None:
+        version = table_version("objets")  # Relevée avant la lecture en base
+        # Les lectures simultanées du même objet n'en font qu'une
+        objet_json = await single_flight.do_async(("objets", "get", version, codobj), load)
+        if objet_json is None:
+            return None
+        set_if_current(key, objet_json, "objets", version)
+    return objet_json
+
+
+# Fonction pour récupérer plusieurs objets sérialisés, en passant par le cache
+async def get_objets_json_by_ids(db: AsyncSession, codobjs: list[int]) -> dict:
+    """
+    Version asynchrone de `get_objets_json_by_ids`.
+    :param db: Session asynchrone
+    :param codobjs: Identifiants des objets
+    :return: Dictionnaire codobj -> JSON de l'objet, ou None s'il n'existe pas
+    """
+    async def load_chunk(chunk):
+        return {objet.codobj: entity_json(ObjetResponse, objet) for objet in await get_objets_by_ids(db, chunk)}
+
+    return await get_json_by_ids_async(codobjs, objet_cache_key, load_chunk, "objets")
+
+
+# Fonction pour supprimer un objet
+async def delete_objet(db: AsyncSession, codobj: int):
+    """
+    Version asynchrone de `delete_objet` (conditionnements supprimés ou détachés, puis un DELETE).
+    :param db: Session asynchrone
+    :param codobj: Identifiant de l'objet à supprimer
+    :return: True si l'objet a été supprimé, False s'il n'existe pas
+    """
+    stmt = delete(Objet).where(Objet.codobj == codobj).execution_options(synchronize_session=False)
+    release = release_condit([codobj])
+    try:
+        if release is not None:
+            await db.execute(release)
+        deleted = (await db.execute(stmt)).rowcount
+        await db.commit()
+    except Exception as e:
+        await db.rollback()  # Annule la transaction en cas d'erreur
+        raise e
+    if not deleted:
+        return False
+    objets_changed(codobj)  # L'objet ne doit plus être servi depuis le cache
+    objet_changes.publish("deleted", codobj)
+    objet_search_index.remove(codobj)  # Ni trouvé par la recherche
+    return True
+
+
+# Fonction pour mettre à jour un objet
+async def update_objet(db: AsyncSession, codobj: int, updated_data: ObjetCreate):
+    """
+    Version asynchrone de `update_objet` (UPDATE ... RETURNING, puis lecture des conditionnements).
+    :param db: Session asynchrone
+    :param codobj: Identifiant de l'objet à mettre à jour
+    :param updated_data: Données mises à jour
+    :return: Les colonnes de l'objet mis à jour avec `condit`, ou None si l'objet n'existe pas
+    """
+    values = {key: value for key, value in updated_data.model_dump().items() if key in UPDATABLE_COLUMNS}
+    stmt = (
+        update(Objet)
+        .where(Objet.codobj == codobj)
+        .values(**values)
+        .returning(*OBJET_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        objet = (await db.execute(stmt)).mappings().first()
+        if objet is not None:
+            objet = {**objet, "condit": [dict(row) for row in (await db.execute(select_condit(codobj))).mappings()]}
+        await db.commit()
+    except Exception as e:
+        await db.rollback()  # Annule la transaction si une erreur se produit
+        raise e
+    if objet is None:
+        return None
+    objets_changed(codobj)  # La version en cache est désormais obsolète
+    objet_changes.publish("updated", codobj)
+    objet_search_index.add(codobj, objet["libobj"])  # Réindexe le libellé
+    return objet
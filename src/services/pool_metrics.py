@@ -0,0 +1,108 @@
+# services/pool_metrics.py
+import threading  # Verrou : les connexions sont empruntées depuis plusieurs threads
+import time  # Mesure de la durée de détention des connexions
+from sqlalchemy import event  # Événements du pool de connexions
+
+
+class PoolMetrics:
+    """
+    Compteurs du pool de connexions d'un engine : emprunts, connexions utilisées (pic),
+    emprunts ayant saturé le pool, débordements (overflow) et durée de détention des connexions.
+    """
+
+    def __init__(self, engine):
+        """
+        :param engine: Engine SQLAlchemy (synchrone) dont le pool est instrumenté
+        """
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0  # Nombre d'emprunts de connexion
+        self.checked_out = 0  # Connexions empruntées en ce moment
+        self.checked_out_max = 0  # Plus grand nombre de connexions empruntées simultanément
+        self.saturated_checkouts = 0  # Emprunts après lesquels le pool était plein : les suivants attendent
+        self.overflow_checkouts = 0  # Emprunts servis par une connexion de débordement
+        self.hold_total = 0.0  # Temps cumulé pendant lequel les connexions ont été détenues
+        self.connections_created = 0  # Connexions DBAPI ouvertes
+        self.invalidations = 0  # Connexions invalidées (ex. échec du pre-ping)
+
+    def snapshot(self) -> dict:
+        """
+        :return: Compteurs cumulés et état instantané du pool
+        """
+        pool = self.engine.pool
+        state = {}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                state[name] = getattr(pool, name)()  # Disponible sur les QueuePool uniquement
+        return {
+            "pool": state,
+            "checkouts": self.checkouts,
+            "checked_out_max": self.checked_out_max,
+            "saturated_checkouts": self.saturated_checkouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "hold_total_seconds": round(self.hold_total, 6),
+            "hold_avg_seconds": round(self.hold_total / self.checkouts, 6) if self.checkouts else 0.0,
+            "connections_created": self.connections_created,
+            "invalidations": self.invalidations,
+        }
+
+
+_metrics = {}  # Nom de l'engine -> PoolMetrics
+
+
+def instrument_pool(engine, name: str = "primary") -> PoolMetrics:
+    """
+    Instrumente le pool d'un engine à l'aide des seuls événements SQLAlchemy (connect, checkout, checkin, invalidate).
+    Les écouteurs sont enregistrés sur l'engine : ils sont reportés sur le nouveau pool quand l'engine
+    le recrée (`engine.dispose()`), contrairement à un remplacement de `pool.connect`.
+    Aucun événement ne précède l'emprunt : le temps d'attente d'une connexion n'est pas mesuré,
+    la saturation du pool (`saturated_checkouts`, `checked_out_max`) en tient lieu.
+    :param engine: Engine SQLAlchemy synchrone (pour un AsyncEngine, passer `async_engine.sync_engine`)
+    :param name: Nom sous lequel les compteurs sont exposés
+    :return: Les compteurs associés à l'engine
+    """
+    if name in _metrics:
+        return _metrics[name]
+    metrics = PoolMetrics(engine)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.connections_created += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        pool = engine.pool  # Pool courant, éventuellement recréé
+        with metrics._lock:
+            metrics.checkouts += 1
+            metrics.checked_out += 1
+            metrics.checked_out_max = max(metrics.checked_out_max, metrics.checked_out)
+            if hasattr(pool, "overflow"):
+                if pool.overflow() > 0:
+                    metrics.overflow_checkouts += 1
+                if pool.checkedin() == 0 and pool.overflow() >= pool._max_overflow >= 0:
+                    metrics.saturated_checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            with metrics._lock:
+                metrics.checked_out -= 1
+                metrics.hold_total += time.perf_counter() - checked_out_at
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with metrics._lock:
+            metrics.invalidations += 1
+
+    _metrics[name] = metrics
+    return metrics
+
+
+def pool_stats() -> dict:
+    """
+    :return: Les compteurs de tous les pools instrumentés, par nom d'engine
+    """
+    return {name: metrics.snapshot() for name, metrics in _metrics.items()}
@@ -0,0 +1,282 @@
+# services/profiling.py
+import functools  # Décorateur des fonctions profilées
+import hmac  # Comparaison du jeton à temps constant
+import inspect  # Fonctions asynchrones profilées
+import itertools  # Identifiants des profils
+import logging  # Journal des requêtes SQL lentes
+import threading  # Profils et requêtes lentes enregistrés depuis plusieurs threads
+import time  # Durée des phases
+from collections import OrderedDict, deque  # Profils récents par identifiant ; dernières requêtes lentes
+from contextlib import nullcontext  # Phase sans effet quand le profilage est désactivé
+from contextvars import ContextVar  # Profil de la requête HTTP en cours
+from src.config import get_settings  # Jeton de profilage et seuils du journal des requêtes lentes
+
+PHASES = ("sql", "orm", "validation", "serialization")  # Phases mesurées, dans l'ordre du traitement
+MAX_PROFILE_STATEMENTS = 200  # Requêtes SQL détaillées par profil (les suivantes sont seulement comptées)
+MAX_STATEMENT_LENGTH = 2000  # Texte SQL conservé par requête
+RECENT_PROFILES = 100  # Profils conservés pour /profiles/{id}
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN ", "mariadb": "EXPLAIN "}
+
+logger = logging.getLogger(__name__)
+_NO_PHASE = nullcontext()
+
+
+class _Phase:
+    """
+    Mesure d'une phase : seul le temps propre est compté (sans les phases imbriquées, ex. SQL pendant l'ORM).
+    """
+
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.profile._nested.append(0.0)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.profile._add(self.name, elapsed - self.profile._nested.pop(), elapsed)
+
+
+class Profile:
+    """
+    Profil d'une requête HTTP : temps propre de chaque phase (SQL, chargement ORM, validation Pydantic,
+    sérialisation JSON) et détail des requêtes SQL exécutées.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.id = None  # Attribué à l'enregistrement
+        self.method = method
+        self.path = path
+        self.status = None
+        self.total = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.statements = []  # (texte SQL, durée en secondes)
+        self.queries = 0
+        self._nested = []  # Temps des phases imbriquées, par phase en cours
+
+    def phase(self, name: str) -> _Phase:
+        """
+        :param name: Nom de la phase (voir PHASES)
+        :return: Gestionnaire de contexte mesurant la phase
+        """
+        return _Phase(self, name)
+
+    def _add(self, name: str, own: float, elapsed: float):
+        self.phases[name] = self.phases.get(name, 0.0) + own
+        if self._nested:
+            self._nested[-1] += elapsed  # Retiré du temps propre de la phase englobante
+
+    def add_sql(self, statement: str, duration: float):
+        """
+        Enregistre une requête SQL (appelé par les événements d'exécution).
+        :param statement: Texte de la requête
+        :param duration: Durée d'exécution
+        """
+        self.queries += 1
+        self._add("sql", duration, duration)
+        if len(self.statements) < MAX_PROFILE_STATEMENTS:
+            self.statements.append((statement[:MAX_STATEMENT_LENGTH], duration))
+
+    def server_timing(self) -> str:
+        """
+        :return: Valeur de l'en-tête Server-Timing (durées en millisecondes)
+        """
+        metrics = [f'{name};dur={seconds * 1000:.3f}' for name, seconds in self.phases.items()]
+        metrics[0] += f';desc="{self.queries} requetes"'  # En-tête HTTP : ASCII uniquement
+        return ", ".join(metrics)
+
+    def as_dict(self) -> dict:
+        """
+        :return: Profil complet (durées en millisecondes), renvoyé par /profiles/{id}
+        """
+        measured = sum(self.phases.values())
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "total_ms": round(self.total * 1000, 3),
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "other_ms": round(max(0.0, self.total - measured) * 1000, 3),  # Routage, dépendances, middlewares...
+            "queries": self.queries,
+            "statements": [{"sql": sql, "ms": round(duration * 1000, 3)} for sql, duration in self.statements],
+        }
+
+
+# Profil de la requête HTTP en cours (None : profilage désactivé, cas normal) ; l'objet est partagé
+# avec le pool de threads des routes synchrones, comme les statistiques SQL du middleware de métriques
+current_profile: ContextVar[Profile | None] = ContextVar("current_profile", default=None)
+
+
+def phase(name: str):
+    """
+    Mesure une phase de la requête en cours, si elle est profilée : `with phase("validation"): ...`.
+    Sans profil, renvoie un gestionnaire de contexte vide (coût : une lecture de ContextVar).
+    :param name: Nom de la phase
+    """
+    profile = current_profile.get()
+    return _NO_PHASE if profile is None else profile.phase(name)
+
+
+def profiled(name: str):
+    """
+    Décorateur : le temps propre de la fonction (hors SQL) est compté dans la phase `name` des requêtes profilées.
+    :param name: Nom de la phase (ex. "orm" pour les lectures des repositories)
+    """
+    def decorator(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                profile = current_profile.get()
+                if profile is None:
+                    return await function(*args, **kwargs)
+                with profile.phase(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            if profile is None:
+                return function(*args, **kwargs)
+            with profile.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiling_allowed(token: str | None) -> bool:
+    """
+    :param token: Valeur de l'en-tête X-Profile envoyée par le client
+    :return: True si elle correspond à PROFILING_TOKEN (profilage désactivé si le jeton n'est pas configuré)
+    """
+    expected = get_settings().profiling_token
+    return bool(expected and token) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+class ProfileStore:
+    """
+    Derniers profils enregistrés, consultables par identifiant.
+    """
+
+    def __init__(self, size: int = RECENT_PROFILES):
+        self.size = size
+        self._profiles = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        return str(next(self._ids))
+
+    def save(self, profile: Profile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Profile | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore()
+
+
+class SlowQueryLog:
+    """
+    Journal des requêtes SQL lentes, toujours actif : chaque requête d'au moins `threshold_ms` millisecondes
+    est comptée, journalisée (logger `src.services.profiling`) et conservée parmi les `size` dernières,
+    avec son plan d'exécution si `explain` est activé (SELECT uniquement, requête rejouée avec EXPLAIN).
+    """
+
+    def __init__(self, threshold_ms: float | None = None, explain: bool | None = None, size: int | None = None):
+        """
+        :param threshold_ms: Seuil en millisecondes, 0 pour désactiver (par défaut : SLOW_QUERY_MS)
+        :param explain: Capture du plan d'exécution (par défaut : SLOW_QUERY_EXPLAIN)
+        :param size: Requêtes lentes conservées (par défaut : SLOW_QUERY_LOG_SIZE)
+        """
+        settings = get_settings()
+        self.threshold = (settings.slow_query_ms if threshold_ms is None else threshold_ms) / 1000
+        self.explain = settings.slow_query_explain if explain is None else explain
+        self._entries = deque(maxlen=settings.slow_query_log_size if size is None else size)
+        self._lock = threading.Lock()
+        self.count = 0  # Requêtes lentes depuis le démarrage
+        self.explain_errors = 0
+
+    def observe(self, cursor, dialect: str, statement: str, parameters, duration: float, executemany: bool):
+        """
+        Appelé après chaque requête SQL ; ne fait rien sous le seuil.
+        :param cursor: Curseur DBAPI de la requête (sa connexion sert à EXPLAIN)
+        :param dialect: Nom du dialecte SQLAlchemy
+        :param statement: Texte de la requête
+        :param parameters: Paramètres DBAPI
+        :param duration: Durée en secondes
+        :param executemany: Requête exécutée pour plusieurs jeux de paramètres
+        """
+        if not self.threshold or duration < self.threshold:
+            return
+        plan = None
+        if self.explain and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+            plan = self._explain(cursor, dialect, statement, parameters)
+        entry = {
+            "at": time.time(),
+            "ms": round(duration * 1000, 3),
+            "sql": statement[:MAX_STATEMENT_LENGTH],
+            "plan": plan,
+        }
+        with self._lock:
+            self.count += 1
+            self._entries.append(entry)
+        logger.warning("Requête SQL lente (%.1f ms) : %s", duration * 1000, entry["sql"])
+
+    def _explain(self, cursor, dialect: str, statement: str, parameters) -> list | None:
+        """
+        Rejoue la requête avec EXPLAIN sur un curseur DBAPI de la même connexion
+        (sans passer par SQLAlchemy : ni événements, ni transaction supplémentaire).
+        :return: Lignes du plan, ou None si le dialecte n'est pas géré ou si EXPLAIN échoue
+        """
+        prefix = EXPLAIN_PREFIXES.get(dialect)
+        if prefix is None:
+            return None
+        # PostgreSQL : une erreur annulerait la transaction de la requête HTTP, d'où le point de sauvegarde
+        savepoint = dialect == "postgresql"
+        try:
+            explain_cursor = cursor.connection.cursor()
+        except Exception:
+            self.explain_errors += 1
+            return None
+        try:
+            if savepoint:
+                explain_cursor.execute("SAVEPOINT slow_query_explain")
+            explain_cursor.execute(prefix + statement, parameters)
+            plan = [" | ".join(str(value) for value in row) for row in explain_cursor.fetchall()]
+            if savepoint:
+                explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception:
+            self.explain_errors += 1
+            if savepoint:
+                try:
+                    explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                except Exception:
+                    pass
+            return None
+        finally:
+            explain_cursor.close()
+
+    def entries(self) -> list[dict]:
+        """
+        :return: Dernières requêtes lentes, de la plus récente à la plus ancienne
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def stats(self) -> dict:
+        return {"threshold_ms": self.threshold * 1000, "count": self.count, "explain_errors": self.explain_errors}
+
+
+slow_query_log = SlowQueryLog()  # Alimenté par les événements d'exécution (services/metrics.py)
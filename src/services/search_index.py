@@ -0,0 +1,281 @@
+# services/search_index.py
+import re  # Découpage des libellés en mots
+import threading  # Verrou : les routes synchrones s'exécutent dans un pool de threads
+import unicodedata  # Suppression des accents
+from bisect import bisect_left, insort  # Vocabulaire trié : recherche des mots par préfixe
+from heapq import nsmallest  # Seuls les `limit` premiers résultats sont triés
+from itertools import islice  # Parcours borné de l'ordre global
+
+# Ligatures non décomposées par la normalisation Unicode, fréquentes dans les libellés français
+LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+WORD_PATTERN = re.compile(r"\w+")  # Un mot : lettres, chiffres et soulignés
+EMPTY = frozenset()  # Aucun identifiant
+# Au-delà de ce rapport entre le nombre de mots d'un préfixe et le nombre de documents restants,
+# les documents sont vérifiés un à un plutôt que d'unir les identifiants de tous ces mots
+PREFIX_FILTER_RATIO = 5
+# Une liste déjà triée n'est parcourue que si elle est au plus ce nombre de fois plus grande que l'ensemble cherché
+ORDERED_SCAN_RATIO = 16
+
+
+def normalize(text: str | None) -> str:
+    """
+    Met un texte sous forme comparable : minuscules, sans accents ni ligatures ("Écharpe" -> "echarpe").
+    :param text: Texte à normaliser
+    :return: Texte normalisé
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold().translate(LIGATURES)
+
+
+def tokenize(text: str | None) -> list[str]:
+    """
+    :param text: Libellé ou requête
+    :return: Mots normalisés, dans l'ordre du texte
+    """
+    return WORD_PATTERN.findall(normalize(text))
+
+
+class SearchIndex:
+    """
+    Index inversé des libellés, en mémoire du processus : mot normalisé -> identifiants.
+    Le vocabulaire est conservé trié pour retrouver tous les mots commençant par un préfixe
+    par recherche dichotomique. L'index est construit une fois puis tenu à jour à chaque écriture.
+    Chaque processus (worker) possède son propre index : avec plusieurs workers, les écritures
+    faites par un autre processus n'y apparaissent qu'après reconstruction (voir SEARCH_BACKEND=database).
+    """
+
+    def __init__(self):
+        self._postings = {}  # mot -> identifiants des libellés contenant ce mot
+        self._first_words = {}  # mot -> identifiants des libellés commençant par ce mot
+        self._vocabulary = []  # mots présents, triés
+        self._documents = {}  # identifiant -> mots du libellé
+        self._sort_keys = {}  # identifiant -> (longueur du libellé, identifiant), ordre à pertinence égale
+        self._ranking = []  # clés de tri de tous les documents, triées
+        self._ordered_postings = {}  # mot -> identifiants triés par clé de tri (calculé à la première recherche)
+        self._lock = threading.Lock()
+        self._pending = None  # Écritures reçues pendant une construction, rejouées ensuite (None hors construction)
+        self.ready = False  # Vrai une fois l'index construit
+        self.searches = 0
+        self.updates = 0
+
+    def build(self, rows):
+        """
+        (Re)construit l'index à partir de toutes les lignes.
+        Les recherches continuent sur l'ancien index pendant la construction ; les écritures reçues
+        entre-temps (construction en arrière-plan au démarrage) sont rejouées sur le nouvel index.
+        :param rows: Itérable de tuples (identifiant, libellé)
+        """
+        with self._lock:
+            self._pending = []
+        index = SearchIndex()
+        try:
+            for id, label in rows:
+                index._add(id, label)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            self._postings = index._postings
+            self._first_words = index._first_words
+            self._vocabulary = sorted(index._postings)
+            self._documents = index._documents
+            self._sort_keys = index._sort_keys
+            self._ranking = sorted(index._sort_keys.values())
+            self._ordered_postings = {}
+            pending, self._pending = self._pending, None
+            for id, label, present in pending:
+                self._remove(id)
+                if present:
+                    self._upsert(id, label)
+            self.ready = True
+
+    def add(self, id: int, label: str | None):
+        """
+        Ajoute un document, ou remplace son libellé s'il est déjà indexé.
+        :param id: Identifiant
+        :param label: Libellé
+        """
+        with self._lock:
+            self._remove(id)
+            self._upsert(id, label)
+            if self._pending is not None:
+                self._pending.append((id, label, True))
+            self.updates += 1
+
+    def remove(self, *ids: int):
+        """
+        Retire des documents de l'index (identifiants inconnus ignorés).
+        :param ids: Identifiants à retirer
+        """
+        with self._lock:
+            for id in ids:
+                self._remove(id)
+                if self._pending is not None:
+                    self._pending.append((id, None, False))
+            self.updates += 1
+
+    def _upsert(self, id: int, label: str | None):
+        """
+        Indexe un document absent de l'index, vocabulaire et ordre global compris ; le verrou doit être tenu.
+        """
+        for token in self._add(id, label):
+            insort(self._vocabulary, token)
+        insort(self._ranking, self._sort_keys[id])
+
+    def _add(self, id: int, label: str | None) -> list[str]:
+        """
+        Indexe un document ; le verrou doit être tenu.
+        :return: Mots apparus dans le vocabulaire (à insérer dans `_vocabulary`)
+        """
+        tokens = tuple(tokenize(label))
+        self._documents[id] = tokens
+        self._sort_keys[id] = (len(label or ""), id)
+        new_tokens = []
+        for token in set(tokens):
+            if token not in self._postings:
+                self._postings[token] = set()
+                new_tokens.append(token)
+            self._postings[token].add(id)
+            self._ordered_postings.pop(token, None)
+        if tokens:
+            self._first_words.setdefault(tokens[0], set()).add(id)
+        return new_tokens
+
+    def _remove(self, id: int):
+        """
+        Retire un document ; le verrou doit être tenu.
+        """
+        tokens = self._documents.pop(id, None)
+        if tokens is None:
+            return
+        sort_key = self._sort_keys.pop(id)
+        if self._ranking:  # Vide pendant `build` (index temporaire)
+            del self._ranking[bisect_left(self._ranking, sort_key)]
+        for token in set(tokens):
+            ids = self._postings[token]
+            ids.discard(id)
+            self._ordered_postings.pop(token, None)
+            if not ids:  # Plus aucun document ne contient ce mot
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+        if tokens:
+            first = self._first_words[tokens[0]]
+            first.discard(id)
+            if not first:
+                del self._first_words[tokens[0]]
+
+    def _prefix_range(self, prefix: str) -> range:
+        """
+        Positions, dans le vocabulaire trié, des mots commençant par `prefix` ; le verrou doit être tenu.
+        """
+        return range(bisect_left(self._vocabulary, prefix), bisect_left(self._vocabulary, prefix + "\U0010ffff"))
+
+    def _prefix_matches(self, prefix: str, postings: dict) -> set:
+        """
+        Union des identifiants de `postings` pour les mots commençant par `prefix` ; le verrou doit être tenu.
+        L'ensemble renvoyé peut être celui de l'index : il ne doit pas être modifié.
+        """
+        positions = self._prefix_range(prefix)
+        if len(positions) == 1:
+            return postings.get(self._vocabulary[positions[0]], EMPTY)  # Un seul mot : pas de copie
+        matches = set()
+        for position in positions:
+            matches |= postings.get(self._vocabulary[position], EMPTY)
+        return matches
+
+    def _ordered(self, token: str) -> list[int]:
+        """
+        Identifiants des documents contenant `token`, triés par clé de tri ; le verrou doit être tenu.
+        Conservé jusqu'à la prochaine écriture touchant ce mot.
+        """
+        ordered = self._ordered_postings.get(token)
+        if ordered is None:
+            ordered = self._ordered_postings[token] = sorted(self._postings[token], key=self._sort_keys.__getitem__)
+        return ordered
+
+    def _smallest(self, ids: set, count: int, ordered: list[int] | None) -> list[int]:
+        """
+        Les `count` identifiants de `ids` qui viennent en premier à pertinence égale ; le verrou doit être tenu.
+        `ordered`, s'il est fourni, contient tous les identifiants de `ids` déjà triés : il suffit de le parcourir.
+        Sinon, un ensemble dense est d'abord cherché dans l'ordre global (quelques dizaines de tests
+        suffisent en général) ; au-delà d'un quart de sa taille en tests, ou pour un ensemble clairsemé,
+        il est trié directement.
+        """
+        if ordered is not None and len(ordered) < len(ids) * ORDERED_SCAN_RATIO:
+            found = []
+            for id in ordered:
+                if id in ids:
+                    found.append(id)
+                    if len(found) == count:
+                        break
+            return found
+        if count * len(self._ranking) < len(ids) ** 2:
+            found = []
+            for _, id in islice(self._ranking, len(ids) // 4):
+                if id in ids:
+                    found.append(id)
+                    if len(found) == count:
+                        return found
+        return nsmallest(count, ids, key=self._sort_keys.__getitem__)
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """
+        Recherche les documents dont chaque mot de la requête est le préfixe d'un mot du libellé
+        (sans accents ni majuscules : "ech" trouve "Écharpe").
+        Classement, par niveaux : tous les mots trouvés en entier avant les simples préfixes,
+        puis libellés commençant par le premier mot de la requête, puis libellés les plus courts.
+        Les niveaux sont calculés par opérations d'ensembles : seuls `limit` documents sont triés.
+        :param query: Texte saisi
+        :param limit: Nombre maximal de résultats
+        :return: Identifiants, du plus pertinent au moins pertinent
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            self.searches += 1
+            ranges = {term: self._prefix_range(term) for term in terms}
+            candidates, ordered = None, None
+            for term in sorted(ranges, key=lambda term: len(ranges[term])):  # Préfixes couvrant peu de mots d'abord
+                if candidates is None and len(ranges[term]) == 1:
+                    # Un seul mot pour ce préfixe : ses documents, déjà triés, contiennent tous les résultats
+                    ordered = self._ordered(self._vocabulary[ranges[term][0]])
+                if candidates is not None and len(ranges[term]) > PREFIX_FILTER_RATIO * len(candidates):
+                    # Préfixe très courant ("5") : on vérifie plutôt les quelques documents restants
+                    candidates = {id for id in candidates if any(token.startswith(term) for token in self._documents[id])}
+                else:
+                    matches = self._prefix_matches(term, self._postings)
+                    candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+            exact = candidates.intersection(*(self._postings.get(term, EMPTY) for term in terms))
+            first = self._prefix_matches(terms[0], self._first_words)
+            tiers = (  # Calculés un à un, seulement si les niveaux précédents ne suffisent pas
+                lambda: exact & first,
+                lambda: exact - first,
+                lambda: (candidates - exact) & first,
+                lambda: candidates - exact - first,
+            )
+            results = []
+            for tier in tiers:
+                results.extend(self._smallest(tier(), limit - len(results), ordered))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def stats(self) -> dict:
+        """
+        :return: Taille et compteurs de l'index
+        """
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "documents": len(self._documents),
+                "words": len(self._vocabulary),
+                "searches": self.searches,
+                "updates": self.updates,
+            }
+
+
+objet_search_index = SearchIndex()  # Index des libellés d'objets (libobj)
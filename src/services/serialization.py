@@ -0,0 +1,68 @@
+# services/serialization.py
+import json  # Encodeur de repli si orjson n'est pas installé
+from decimal import Decimal  # Colonnes NUMERIC (prix, poids) lues par le pilote
+from fastapi.responses import Response
+from src.config import get_settings  # Mode de sérialisation ("standard" ou "fast")
+from src.services.profiling import phase  # Temps de validation et de sérialisation des requêtes profilées
+
+try:
+    import orjson  # Dépendance optionnelle : encodeur JSON rapide (dates et UUID gérés nativement, pas les décimaux)
+except ImportError:
+    orjson = None
+
+
+def fast_serialization_enabled() -> bool:
+    """
+    :return: True si les listes sont sérialisées par le chemin rapide (SERIALIZATION=fast)
+    """
+    return get_settings().serialization == "fast"
+
+
+def _default(value):
+    """
+    Types non gérés par les encodeurs : un Decimal devient un float, comme le déclarent les schémas
+    (ex. `puobj: float`), les autres valeurs leur représentation texte (dates avec le json standard).
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    if orjson is not None:
+        raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+    return str(value)
+
+
+def dumps(content) -> bytes:
+    """
+    Encode directement en JSON des données déjà prêtes (dictionnaires de colonnes),
+    sans passer par Pydantic ni `jsonable_encoder`.
+    :param content: Données à encoder
+    :return: JSON encodé en UTF-8
+    """
+    with phase("serialization"):
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def entity_json(model, entity) -> str:
+    """
+    JSON d'une entité validée par son modèle de réponse (ex. ObjetResponse), tel que mis en cache.
+    :param model: Modèle de réponse Pydantic
+    :param entity: Objet ORM
+    :return: JSON de l'entité
+    """
+    with phase("validation"):
+        validated = model.model_validate(entity)
+    with phase("serialization"):
+        return validated.model_dump_json()
+
+
+class FastJSONResponse(Response):
+    """
+    Réponse JSON encodée par `dumps` : le contenu n'est ni validé ni converti par FastAPI,
+    il doit déjà avoir la forme du modèle de réponse.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,126 @@
+# services/single_flight.py
+import asyncio  # Appels identiques regroupés dans la boucle d'événements (routes asynchrones)
+import threading  # Appels identiques regroupés entre les threads (routes synchrones)
+from src.config import get_settings  # Regroupement activé ou non (SINGLE_FLIGHT)
+
+
+class _Flight:
+    """
+    Exécution en cours pour une clé, attendue par les threads arrivés pendant ce temps.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _LeaderCancelled(Exception):
+    """
+    La requête qui exécutait la lecture a été annulée (client parti) : les requêtes qui l'attendaient la relancent.
+    """
+
+
+class SingleFlight:
+    """
+    Regroupement des lectures identiques simultanées (single-flight) : pour une même clé (route et paramètres),
+    la première requête exécute la lecture, celles qui arrivent avant la fin attendent et reçoivent son résultat
+    (ou son erreur) au lieu d'envoyer la même requête à la base et de refaire la même sérialisation.
+    Rien n'est conservé après la fin de l'exécution : ce n'est pas un cache.
+    Deux modèles d'exécution : `do` pour les routes synchrones (threads), `do_async` pour les routes asynchrones.
+    Le résultat est partagé : il doit être immuable (JSON déjà sérialisé, tuples).
+    """
+
+    def __init__(self):
+        self._flights = {}  # clé -> _Flight (threads)
+        self._async_flights = {}  # clé -> asyncio.Future (boucle d'événements)
+        self._lock = threading.Lock()
+        self.calls = 0  # Lectures réellement exécutées
+        self.coalesced = 0  # Appels servis par la lecture d'une autre requête
+        self.errors = 0  # Lectures en erreur (erreur transmise à toutes les requêtes en attente)
+
+    def do(self, key, function):
+        """
+        Exécute `function`, ou attend le résultat de l'exécution déjà en cours pour la même clé.
+        :param key: Clé de la lecture (hachable)
+        :param function: Fonction sans argument qui fait la lecture
+        :return: Résultat de la lecture
+        """
+        if not get_settings().single_flight:
+            return function()
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = function()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]  # Les requêtes suivantes relancent une lecture
+            flight.done.set()
+
+    async def do_async(self, key, function):
+        """
+        Version asynchrone de `do`.
+        :param key: Clé de la lecture (hachable)
+        :param function: Fonction sans argument renvoyant la coroutine qui fait la lecture
+        :return: Résultat de la lecture
+        """
+        if not get_settings().single_flight:
+            return await function()
+        while key in self._async_flights:
+            self.coalesced += 1
+            try:
+                # shield : l'annulation d'une requête en attente n'annule pas la lecture partagée
+                return await asyncio.shield(self._async_flights[key])
+            except _LeaderCancelled:
+                self.coalesced -= 1  # Lecture abandonnée : cette requête la relance (ou en attend une autre)
+        future = asyncio.get_running_loop().create_future()
+        self._async_flights[key] = future
+        self.calls += 1
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            self.errors += 1
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._async_flights[key]
+            if future.done() and not future.cancelled():
+                future.exception()  # Marque l'erreur comme lue, même si aucune requête n'attendait
+
+    def stats(self) -> dict:
+        """
+        :return: Compteurs et lectures en cours
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._flights) + len(self._async_flights),
+        }
+
+
+single_flight = SingleFlight()  # Partagé par les services des objets et des utilisateurs
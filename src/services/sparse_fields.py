@@ -0,0 +1,96 @@
+# services/sparse_fields.py
+from functools import lru_cache  # Un modèle réduit par ensemble de champs, construit une seule fois
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from src.services.serialization import dumps, fast_serialization_enabled  # Sérialisation rapide des listes
+from src.services.profiling import phase  # Temps de validation et de sérialisation des requêtes profilées
+
+MAX_SPARSE_MODELS = 256  # Nombre maximal de modèles réduits conservés
+
+
+def parse_fields(fields: str | None, model: type[BaseModel]) -> tuple[str, ...] | None:
+    """
+    Lit le paramètre `fields` (ex. "codobj,libobj,puobj").
+    Les champs sont renvoyés dans l'ordre du modèle, pour qu'un même ensemble donne toujours la même clé de cache.
+    :param fields: Valeur du paramètre, None ou vide pour tous les champs
+    :param model: Modèle de réponse complet
+    :return: Tuple des champs demandés, ou None pour tous les champs
+    :raises ValueError: Si un champ n'existe pas dans le modèle
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - model.model_fields.keys())
+    if unknown:
+        raise ValueError(f"Champs inconnus : {', '.join(unknown)}")
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+def parse_include(include: str | None, relations: frozenset[str]) -> set[str]:
+    """
+    Lit le paramètre `include` (relations à charger, ex. "condit").
+    :param include: Valeur du paramètre, None ou vide pour aucune relation
+    :param relations: Relations disponibles
+    :return: Ensemble des relations demandées
+    :raises ValueError: Si une relation n'existe pas
+    """
+    requested = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = sorted(requested - relations)
+    if unknown:
+        raise ValueError(f"Relations inconnues : {', '.join(unknown)}")
+    return requested
+
+
+@lru_cache(maxsize=MAX_SPARSE_MODELS)
+def sparse_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Construit le modèle de réponse réduit aux champs demandés (mêmes types et descriptions).
+    :param model: Modèle de réponse complet
+    :param fields: Champs conservés, tels que renvoyés par `parse_fields`
+    :return: Classe du modèle réduit
+    """
+    definitions = {name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    return create_model(
+        f"{model.__name__}_{'_'.join(fields)}",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+@lru_cache(maxsize=MAX_SPARSE_MODELS)
+def _sparse_list_adapter(model: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    """
+    :return: Validateur / sérialiseur d'une liste du modèle réduit
+    """
+    return TypeAdapter(list[sparse_model(model, fields)])
+
+
+def sparse_json(model: type[BaseModel], fields: tuple[str, ...], items: list) -> bytes:
+    """
+    JSON d'une liste réduite aux champs demandés.
+    Les lignes lues en colonnes sont encodées directement en mode SERIALIZATION=fast ;
+    sinon (ou pour des objets ORM) elles sont validées par le modèle réduit.
+    :param model: Modèle de réponse complet
+    :param fields: Champs demandés
+    :param items: Dictionnaires colonne -> valeur ou objets ORM
+    :return: JSON encodé
+    """
+    if fast_serialization_enabled() and all(isinstance(item, dict) for item in items):
+        return dumps(items)
+    adapter = _sparse_list_adapter(model, fields)
+    with phase("validation"):
+        validated = adapter.validate_python(items, from_attributes=True)
+    with phase("serialization"):
+        return adapter.dump_json(validated)
+
+
+def sparse_response(model: type[BaseModel], fields: tuple[str, ...], items: list, headers: dict) -> Response:
+    """
+    Réponse JSON d'une liste réduite aux champs demandés (voir `sparse_json`).
+    :param model: Modèle de réponse complet
+    :param fields: Champs demandés
+    :param items: Dictionnaires colonne -> valeur ou objets ORM
+    :param headers: En-têtes de la réponse
+    :return: Réponse JSON
+    """
+    return Response(content=sparse_json(model, fields, items), media_type="application/json", headers=headers)
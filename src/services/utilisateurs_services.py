@@ -1,10 +1,30 @@
 from src.repositories.utilisateurs_repository import (
     get_all_utilisateurs,           # Fonction pour récupérer tous les utilisateurs
+    get_utilisateurs_page,          # Fonction pour récupérer une page d'utilisateurs
+    get_utilisateur_rows_page,      # Fonction pour récupérer une page d'utilisateurs en colonnes (sérialisation rapide)
+    iter_utilisateurs,              # Fonction pour parcourir tous les utilisateurs (export)
     get_utilisateur_by_id,          # Fonction pour récupérer un utilisateur par son identifiant
+    find_utilisateur_by_id,         # Fonction pour récupérer un utilisateur (ou None) par son identifiant
+    find_utilisateurs_by_ids,       # Fonction pour récupérer plusieurs utilisateurs par leurs identifiants
+    find_utilisateur_by_username,   # Fonction pour récupérer un utilisateur (ou None) par son username
+    utilisateur_cache_key,          # Clé d'un utilisateur dans le cache
+    UTILISATEUR_COLUMNS_BY_NAME,    # Champ de l'API -> colonne
     create_utilisateur as repo_create_utilisateur,  # Fonction pour créer un nouveau utilisateur
     update_utilisateur as repo_update_utilisateur,  # Fonction pour mettre à jour un utilisateur existant
+    patch_utilisateur as repo_patch_utilisateur,    # Fonction pour mettre à jour partiellement un utilisateur
     delete_utilisateur as repo_delete_utilisateur   # Fonction pour supprimer un utilisateur
 )
+from fastapi import HTTPException
+from src.schemas.utilisateur import UtilisateurResponse  # Schéma de réponse mis en cache
+from src.services.cache import etag_cache_key, read_through, set_if_current  # Cache en lecture (read-through) des utilisateurs et de leurs ETags
+from src.services.batch_lookup import get_json_by_ids  # Lecture groupée : cache d'abord, puis requêtes IN par lots
+from src.services.serialization import dumps, entity_json, fast_serialization_enabled  # Sérialisation rapide des listes
+from src.services.single_flight import single_flight  # Lectures identiques simultanées regroupées
+from src.services.sparse_fields import sparse_json  # Sérialisation des listes réduites aux champs demandés
+from src.services.versions import entity_etag, table_version  # ETag mis en cache ; version de la table (clé des lectures regroupées)
+from src.database_replicas import replica_name  # Lectures sur un réplica : ni mises en cache, ni regroupées avec la base principale
+
+UTILISATEUR_FIELDS = tuple(UtilisateurResponse.model_fields)  # Tous les champs d'un utilisateur
 
 # Fonction pour récupérer tous les utilisateurs
 def get_all(db):
@@ -24,11 +44,104 @@ def get_by_id(db, id):
         # En cas d'erreur ou de utilisateur non trouvé, une ValueError est levée
         raise ValueError(f"utilisateur avec ID {id} introuvable : {str(e)}")
 
+# Fonction pour récupérer une page d'utilisateurs réduite à certains champs
+def get_utilisateurs_sparse_page(db, fields, limit, after=None, username=None):
+    """
+    Récupère une page d'utilisateurs en ne sélectionnant que les colonnes demandées.
+    :param db: Session de base de données
+    :param fields: Champs demandés (voir `parse_fields`)
+    :param limit: Nombre maximal d'utilisateurs par page
+    :param after: Curseur : dernier `code_utilisateur` de la page précédente
+    :param username: Filtre exact sur le username
+    :return: Tuple (liste de dictionnaires colonne -> valeur, curseur suivant ou None)
+    """
+    columns = tuple(UTILISATEUR_COLUMNS_BY_NAME[name] for name in fields)
+    return get_utilisateur_rows_page(db, limit, after=after, username=username, columns=columns)
+
+# Fonction pour récupérer une page d'utilisateurs déjà sérialisée
+def get_utilisateurs_page_json(db, fields, limit, after=None, username=None):
+    """
+    Récupère une page d'utilisateurs sérialisée en JSON. Les requêtes identiques simultanées (mêmes paramètres,
+    même version de la table) partagent une seule lecture et une seule sérialisation (single-flight).
+    :param db: Session de base de données
+    :param fields: Champs demandés, ou None pour tous les champs
+    :param limit: Nombre maximal d'utilisateurs par page
+    :param after: Curseur : dernier `code_utilisateur` de la page précédente
+    :param username: Filtre exact sur le username
+    :return: Tuple (JSON de la page, curseur suivant ou None)
+    """
+    def load():
+        if fields is not None:
+            utilisateurs, next_cursor = get_utilisateurs_sparse_page(db, fields, limit, after=after, username=username)
+            return sparse_json(UtilisateurResponse, fields, utilisateurs), next_cursor
+        if fast_serialization_enabled():
+            rows, next_cursor = get_utilisateur_rows_page(db, limit, after=after, username=username)
+            return dumps(rows), next_cursor  # Lignes déjà prêtes : pas de validation Pydantic
+        utilisateurs, next_cursor = get_utilisateurs_page(db, limit, after=after, username=username)
+        return sparse_json(UtilisateurResponse, UTILISATEUR_FIELDS, utilisateurs), next_cursor
+
+    key = ("utilisateurs", "list", table_version("utilisateurs"), replica_name(db), fields, limit, after, username)
+    return single_flight.do(key, load)
+
+# Fonction pour récupérer un utilisateur sérialisé, en passant par le cache
+def get_utilisateur_json(db, id):
+    """
+    Récupère un utilisateur déjà sérialisé en JSON (`UtilisateurResponse`), depuis le cache si possible.
+    :param db: Session de base de données
+    :param id: Identifiant de l'utilisateur
+    :return: Le JSON de l'utilisateur ou None s'il n'existe pas
+    """
+    def load():
+        utilisateur = find_utilisateur_by_id(db, id)  # Lecture en base uniquement en cas d'absence dans le cache
+        if utilisateur is None:
+            return None
+        utilisateur_json = entity_json(UtilisateurResponse, utilisateur)
+        if replica is None:
+            set_if_current(etag_cache_key(cache_key), entity_etag(utilisateur_json), "utilisateurs", version)  # Voir `get_cached_etag`
+        return utilisateur_json
+
+    # En cas d'absence dans le cache, les lectures simultanées du même utilisateur (sur la même base) n'en font qu'une
+    cache_key = utilisateur_cache_key(id)
+    version = table_version("utilisateurs")
+    replica = replica_name(db)
+    key = ("utilisateurs", "get", version, replica, id)
+    return read_through(cache_key, lambda: single_flight.do(key, load), "utilisateurs", store=replica is None)
+
+# Fonction pour récupérer plusieurs utilisateurs sérialisés, en passant par le cache
+def get_utilisateurs_json_by_ids(db, ids):
+    """
+    Récupère plusieurs utilisateurs déjà sérialisés en JSON (`UtilisateurResponse`) : ceux en cache sans requête,
+    les autres avec une requête IN par lot de BATCH_CHUNK_SIZE identifiants.
+    :param db: Session de base de données
+    :param ids: Identifiants des utilisateurs
+    :return: Dictionnaire identifiant -> JSON de l'utilisateur, ou None s'il n'existe pas
+    """
+    def load_chunk(chunk):
+        return {
+            utilisateur.code_utilisateur: entity_json(UtilisateurResponse, utilisateur)
+            for utilisateur in find_utilisateurs_by_ids(db, chunk)
+        }
+
+    return get_json_by_ids(ids, utilisateur_cache_key, load_chunk, "utilisateurs", store=replica_name(db) is None)
+
+# Fonction pour récupérer un utilisateur sérialisé à partir de son username
+def get_utilisateur_by_username_json(db, username):
+    """
+    Récupère un utilisateur par son username (index unique, une seule requête).
+    :param db: Session de base de données
+    :param username: Username recherché
+    :return: Le JSON de l'utilisateur ou None s'il n'existe pas
+    """
+    utilisateur = find_utilisateur_by_username(db, username)
+    return entity_json(UtilisateurResponse, utilisateur) if utilisateur else None
+
 # Fonction pour créer un nouveau utilisateur
 def create_utilisateur(db, utilisateur_data):
     try:
         # Appel à la fonction du dépôt pour créer un utilisateur avec les données fournies
         return repo_create_utilisateur(db, utilisateur_data)
+    except HTTPException:
+        raise  # Erreurs HTTP (ex. 400 username déjà utilisé) renvoyées telles quelles
     except Exception as e:
         # En cas d'erreur, une RuntimeError est levée
         raise RuntimeError(f"Erreur lors de la création du utilisateur : {str(e)}")
@@ -45,6 +158,8 @@ def update_utilisateur(db, id, updated_data):
     try:
         # Appel à la fonction du dépôt pour mettre à jour un utilisateur avec les données mises à jour
         return repo_update_utilisateur(db, id, updated_data)
+    except HTTPException:
+        raise  # Erreurs HTTP (ex. 400 username déjà pris) renvoyées telles quelles
     except ValueError as ve:
         # Si le utilisateur n'existe pas (id non trouvé), une ValueError est levée
         raise ValueError(f"utilisateur avec ID {id} introuvable : {str(ve)}")
@@ -52,6 +167,24 @@ def update_utilisateur(db, id, updated_data):
         # En cas d'erreur, une RuntimeError est levée
         raise RuntimeError(f"Erreur lors de la mise à jour du utilisateur : {str(e)}")
 
+# Fonction pour mettre à jour partiellement un utilisateur
+def patch_utilisateur(db, id, changes, if_match=None):
+    """
+    Met à jour uniquement les champs fournis d'un utilisateur.
+    :param db: Session de base de données
+    :param id: Identifiant du utilisateur à modifier
+    :param changes: Champs à modifier (dictionnaire)
+    :param if_match: ETag attendu (concurrence optimiste), ou None
+    :return: JSON du utilisateur modifié, ou None s'il n'existe pas
+    """
+    try:
+        return repo_patch_utilisateur(db, id, changes, if_match=if_match)
+    except HTTPException:
+        raise  # Erreurs HTTP (ex. 412) renvoyées telles quelles
+    except Exception as e:
+        # En cas d'erreur, une RuntimeError est levée
+        raise RuntimeError(f"Erreur lors de la mise à jour du utilisateur : {str(e)}")
+
 # Fonction pour supprimer un utilisateur
 def delete_utilisateur(db, id):
     try:
@@ -0,0 +1,107 @@
+from src.repositories.utilisateurs_repository import UTILISATEUR_COLUMNS_BY_NAME, utilisateur_cache_key  # Colonnes et clé de cache
+from src.repositories.utilisateurs_repository_async import (
+    get_utilisateurs_page,          # Fonction pour récupérer une page d'utilisateurs
+    get_utilisateur_rows_page,      # Fonction pour récupérer une page d'utilisateurs en colonnes (sérialisation rapide)
+    find_utilisateur_by_id,         # Fonction pour récupérer un utilisateur (ou None) par son identifiant
+    find_utilisateurs_by_ids,       # Fonction pour récupérer plusieurs utilisateurs par leurs identifiants
+    find_utilisateur_by_username,   # Fonction pour récupérer un utilisateur (ou None) par son username
+    create_utilisateur,             # Fonction pour créer un nouveau utilisateur
+    update_utilisateur,             # Fonction pour mettre à jour un utilisateur existant
+    delete_utilisateur              # Fonction pour supprimer un utilisateur
+)
+from src.schemas.utilisateur import UtilisateurResponse  # Schéma de réponse mis en cache
+from src.services.cache import etag_cache_key, get_cache, set_if_current  # Cache en lecture des utilisateurs et de leurs ETags
+from src.services.batch_lookup import get_json_by_ids_async  # Lecture groupée : cache d'abord, puis requêtes IN par lots
+from src.services.serialization import dumps, entity_json, fast_serialization_enabled  # Sérialisation rapide des listes
+from src.services.single_flight import single_flight  # Lectures identiques simultanées regroupées
+from src.services.sparse_fields import sparse_json  # Sérialisation des listes réduites aux champs demandés
+from src.services.utilisateurs_services import UTILISATEUR_FIELDS  # Tous les champs d'un utilisateur
+from src.services.versions import entity_etag, table_version  # ETag mis en cache ; version de la table (clé des lectures regroupées)
+
+
+# Fonction pour récupérer une page d'utilisateurs réduite à certains champs
+async def get_utilisateurs_sparse_page(db, fields, limit, after=None, username=None):
+    """
+    Version asynchrone de `get_utilisateurs_sparse_page`.
+    :return: Tuple (liste de dictionnaires colonne -> valeur, curseur suivant ou None)
+    """
+    columns = tuple(UTILISATEUR_COLUMNS_BY_NAME[name] for name in fields)
+    return await get_utilisateur_rows_page(db, limit, after=after, username=username, columns=columns)
+
+
+# Fonction pour récupérer une page d'utilisateurs déjà sérialisée
+async def get_utilisateurs_page_json(db, fields, limit, after=None, username=None):
+    """
+    Version asynchrone de `get_utilisateurs_page_json` (lectures identiques simultanées regroupées).
+    :return: Tuple (JSON de la page, curseur suivant ou None)
+    """
+    async def load():
+        if fields is not None:
+            utilisateurs, next_cursor = await get_utilisateurs_sparse_page(db, fields, limit, after=after, username=username)
+            return sparse_json(UtilisateurResponse, fields, utilisateurs), next_cursor
+        if fast_serialization_enabled():
+            rows, next_cursor = await get_utilisateur_rows_page(db, limit, after=after, username=username)
+            return dumps(rows), next_cursor  # Lignes déjà prêtes : pas de validation Pydantic
+        utilisateurs, next_cursor = await get_utilisateurs_page(db, limit, after=after, username=username)
+        return sparse_json(UtilisateurResponse, UTILISATEUR_FIELDS, utilisateurs), next_cursor
+
+    key = ("utilisateurs", "list", table_version("utilisateurs"), fields, limit, after, username)
+    return await single_flight.do_async(key, load)
+
+
+# Fonction pour récupérer un utilisateur sérialisé, en passant par le cache
+async def get_utilisateur_json(db, id):
+    """
+    Version asynchrone de `get_utilisateur_json`.
+    :param db: Session asynchrone
+    :param id: Identifiant de l'utilisateur
+    :return: Le JSON de l'utilisateur ou None s'il n'existe pas
+    """
+    async def load():
+        utilisateur = await find_utilisateur_by_id(db, id)  # Lecture en base uniquement en cas d'absence dans le cache
+        if utilisateur is None:
+            return None
+        utilisateur_json = entity_json(UtilisateurResponse, utilisateur)
+        set_if_current(etag_cache_key(key), entity_etag(utilisateur_json), "utilisateurs", version)
+        return utilisateur_json
+
+    cache = get_cache()
+    key = utilisateur_cache_key(id)
+    utilisateur_json = cache.get(key)
+    if utilisateur_json is None:
+        version = table_version("utilisateurs")  # Relevée avant la lecture en base
+        # Les lectures simultanées du même utilisateur n'en font qu'une
+        utilisateur_json = await single_flight.do_async(("utilisateurs", "get", version, id), load)
+        if utilisateur_json is None:
+            return None
+        set_if_current(key, utilisateur_json, "utilisateurs", version)
+    return utilisateur_json
+
+
+# Fonction pour récupérer plusieurs utilisateurs sérialisés, en passant par le cache
+async def get_utilisateurs_json_by_ids(db, ids):
+    """
+    Version asynchrone de `get_utilisateurs_json_by_ids`.
+    :param db: Session asynchrone
+    :param ids: Identifiants des utilisateurs
+    :return: Dictionnaire identifiant -> JSON de l'utilisateur, ou None s'il n'existe pas
+    """
+    async def load_chunk(chunk):
+        return {
+            utilisateur.code_utilisateur: entity_json(UtilisateurResponse, utilisateur)
+            for utilisateur in await find_utilisateurs_by_ids(db, chunk)
+        }
+
+    return await get_json_by_ids_async(ids, utilisateur_cache_key, load_chunk, "utilisateurs")
+
+
+# Fonction pour récupérer un utilisateur sérialisé à partir de son username
+async def get_utilisateur_by_username_json(db, username):
+    """
+    Version asynchrone de `get_utilisateur_by_username_json`.
+    :param db: Session asynchrone
+    :param username: Username recherché
+    :return: Le JSON de l'utilisateur ou None s'il n'existe pas
+    """
+    utilisateur = await find_utilisateur_by_username(db, username)
+    return entity_json(UtilisateurResponse, utilisateur) if utilisateur else None
@@ -0,0 +1,191 @@
+# services/versions.py
+import hashlib  # Empreinte courte des paramètres de requête dans l'ETag
+import os  # Lecture de la configuration depuis les variables d'environnement
+import threading  # Verrou : les routes synchrones s'exécutent dans un pool de threads
+import time  # Date de dernière modification des tables
+import uuid  # Identifiant de démarrage, pour ne pas réutiliser un ETag après un redémarrage
+from datetime import timezone  # Dates HTTP sans fuseau : UTC
+from email.utils import formatdate, parsedate_to_datetime  # Format des dates HTTP
+
+
+class TableVersions:
+    """
+    Compteurs de version par table, en mémoire du processus.
+    Chaque écriture sur une table incrémente sa version : la version suffit à construire un ETag
+    sans relire les données.
+    """
+
+    def __init__(self):
+        self.boot_id = uuid.uuid4().hex[:8]  # Distingue les ETags émis avant et après un redémarrage
+        self._started_at = time.time()
+        self._versions = {}  # table -> (version, date de dernière modification)
+        self._lock = threading.Lock()
+
+    def bump(self, table: str):
+        """
+        Incrémente la version d'une table après une écriture.
+        :param table: Nom de la table
+        """
+        with self._lock:
+            version, _ = self._versions.get(table, (0, self._started_at))
+            self._versions[table] = (version + 1, time.time())
+
+    def get(self, table: str) -> tuple[str, float]:
+        """
+        :param table: Nom de la table
+        :return: Tuple (version, date de dernière modification en secondes)
+        """
+        version, modified_at = self._versions.get(table, (0, self._started_at))
+        return f"{self.boot_id}.{version}", modified_at
+
+
+class RedisTableVersions:
+    """
+    Compteurs de version partagés entre les workers, stockés dans un serveur compatible Redis.
+    """
+
+    def __init__(self, client, prefix: str = "tp7:version:"):
+        """
+        :param client: Client compatible Redis (méthodes incr, set, get, mget)
+        :param prefix: Préfixe ajouté à toutes les clés
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def bump(self, table: str):
+        """
+        Incrémente la version d'une table après une écriture.
+        :param table: Nom de la table
+        """
+        self.client.incr(self.prefix + table)
+        self.client.set(self.prefix + table + ":modified", time.time())
+
+    def get(self, table: str) -> tuple[str, float]:
+        """
+        :param table: Nom de la table
+        :return: Tuple (version, date de dernière modification en secondes)
+        """
+        version, modified_at = self.client.mget(self.prefix + table, self.prefix + table + ":modified")
+        if isinstance(version, bytes):
+            version = version.decode()
+        return str(version or 0), float(modified_at) if modified_at else time.time()
+
+
+_versions = None  # Instance partagée (créée à la première utilisation)
+
+
+def get_versions():
+    """
+    Construit (une seule fois) les compteurs de version selon VERSION_BACKEND ("memory" ou "redis").
+    :return: L'instance des compteurs de version
+    """
+    global _versions
+    if _versions is None:
+        if os.getenv("VERSION_BACKEND", "memory") == "redis":
+            try:
+                import redis  # Dépendance optionnelle, uniquement pour le backend Redis
+            except ImportError as e:
+                raise RuntimeError("Le backend de versions 'redis' nécessite le paquet redis.") from e
+            _versions = RedisTableVersions(redis.Redis.from_url(os.getenv("VERSION_REDIS_URL", "redis://localhost:6379/0")))
+        else:
+            _versions = TableVersions()
+    return _versions
+
+
+def set_versions(versions):
+    """
+    Remplace l'instance des compteurs de version (utile dans les tests).
+    :param versions: Nouvelle instance
+    """
+    global _versions
+    _versions = versions
+
+
+def bump_version(table: str):
+    """
+    Signale une écriture sur une table : les ETags et Last-Modified associés changent.
+    :param table: Nom de la table ("objets" ou "utilisateurs")
+    """
+    get_versions().bump(table)
+
+
+def table_version(table: str) -> str:
+    """
+    :param table: Nom de la table
+    :return: Version courante de la table (change à chaque écriture)
+    """
+    return get_versions().get(table)[0]
+
+
+def conditional_headers(table: str, *parts) -> dict:
+    """
+    Calcule les en-têtes ETag et Last-Modified d'une réponse à partir de la version de la table.
+    Aucune lecture en base n'est nécessaire.
+    :param table: Nom de la table
+    :param parts: Éléments qui distinguent la représentation (identifiant, paramètres de requête...)
+    :return: Dictionnaire des en-têtes
+    """
+    version, modified_at = get_versions().get(table)
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:12]
+    return {
+        "ETag": f'"{table}-{version}-{digest}"',
+        "Last-Modified": formatdate(modified_at, usegmt=True),
+    }
+
+
+def entity_etag(payload: str) -> str:
+    """
+    ETag fort d'une entité, calculé à partir de sa représentation JSON.
+    Il change dès qu'une colonne de l'entité change et sert aussi à la concurrence optimiste (If-Match).
+    :param payload: JSON de l'entité (tel que renvoyé au client)
+    :return: Valeur de l'en-tête ETag
+    """
+    return f'"{hashlib.sha1(payload.encode()).hexdigest()[:20]}"'
+
+
+def entity_headers(table: str, payload: str | None = None, etag: str | None = None) -> dict:
+    """
+    En-têtes ETag et Last-Modified d'une entité.
+    :param table: Nom de la table
+    :param payload: JSON de l'entité
+    :param etag: ETag déjà calculé (en cache), à la place de `payload`
+    :return: Dictionnaire des en-têtes
+    """
+    _, modified_at = get_versions().get(table)
+    return {"ETag": etag or entity_etag(payload), "Last-Modified": formatdate(modified_at, usegmt=True)}
+
+
+def etag_matches(if_match: str, etag: str) -> bool:
+    """
+    Indique si l'en-tête If-Match correspond à l'ETag courant.
+    :param if_match: Valeur de l'en-tête If-Match
+    :param etag: ETag courant de l'entité
+    :return: True si la précondition est satisfaite
+    """
+    tags = [tag.strip() for tag in if_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def is_not_modified(request_headers, headers: dict) -> bool:
+    """
+    Indique si le client possède déjà la représentation courante (réponse 304).
+    If-None-Match est prioritaire sur If-Modified-Since.
+    :param request_headers: En-têtes de la requête
+    :param headers: En-têtes calculés par `conditional_headers`
+    :return: True si une réponse 304 peut être renvoyée
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or headers["ETag"] in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            modified = parsedate_to_datetime(headers["Last-Modified"])
+        except (TypeError, ValueError):
+            return False  # Date invalide : on ignore l'en-tête
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)  # "-0000" ou date sans fuseau : les dates HTTP sont en GMT
+        return modified <= since
+    return False
@@ -0,0 +1,225 @@
+# services/write_behind.py
+import threading  # Thread d'écriture en arrière-plan et verrou du tampon
+import time  # Intervalle d'écriture et durée des écritures
+from sqlalchemy import bindparam, func, update
+from src.config import get_settings  # Intervalle et seuils d'écriture
+from src.models import Objet  # Table des compteurs
+from src.services.objets_services import objets_changed  # Invalidation du cache et version de la table
+from src.services.change_feed import objet_changes  # Flux des modifications (compteurs écrits)
+
+COUNTER_COLUMNS = ("points", "o_imp", "o_aff")  # Colonnes modifiées par incréments
+FLUSH_BATCH_SIZE = 500  # Objets par envoi de l'UPDATE (executemany)
+
+# Un seul UPDATE paramétré, exécuté pour tous les objets en attente : colonne = colonne + incrément
+FLUSH_STATEMENT = (
+    update(Objet.__table__)
+    .where(Objet.__table__.c.codobj == bindparam("b_codobj"))
+    .values({
+        column: func.coalesce(Objet.__table__.c[column], 0) + bindparam(f"d_{column}")
+        for column in COUNTER_COLUMNS
+    })
+)
+
+
+class BufferFull(Exception):
+    """
+    Levée quand trop d'objets sont en attente d'écriture (base indisponible) : l'incrément est refusé.
+    """
+
+
+class WriteBehindBuffer:
+    """
+    Tampon d'écriture différée des compteurs des objets (write-behind).
+    Les incréments sont cumulés en mémoire par objet, puis écrits par lots (un UPDATE par lot de
+    FLUSH_BATCH_SIZE objets) par un thread, toutes les `interval` secondes ou dès que `max_pending` objets
+    sont en attente. Cent incréments d'un même objet entre deux écritures coûtent une seule ligne d'UPDATE.
+    Durabilité : à l'arrêt (lifespan), le tampon est vidé ; en cas d'arrêt brutal, au plus `interval` secondes
+    d'incréments sont perdues (`interval` = 0 : écriture immédiate dans la requête). Si une écriture échoue,
+    les incréments sont remis dans le tampon et réessayés à l'écriture suivante (avec `interval` = 0 :
+    au prochain incrément ou à l'arrêt) ; l'incrément reste accepté.
+    Chaque processus (worker) a son propre tampon ; les incréments s'additionnent en base.
+    """
+
+    def __init__(self, interval: float | None = None, max_pending: int | None = None, max_depth: int | None = None):
+        """
+        :param interval: Secondes entre deux écritures (par défaut : WRITE_BEHIND_INTERVAL)
+        :param max_pending: Objets en attente déclenchant une écriture anticipée (par défaut : WRITE_BEHIND_MAX_PENDING)
+        :param max_depth: Objets en attente au-delà desquels les incréments sont refusés (par défaut : WRITE_BEHIND_MAX_DEPTH)
+        """
+        settings = get_settings()
+        self.interval = settings.write_behind_interval if interval is None else interval
+        self.max_pending = settings.write_behind_max_pending if max_pending is None else max_pending
+        self.max_depth = settings.write_behind_max_depth if max_depth is None else max_depth
+        self.engine = None  # Engine utilisé pour les écritures (par défaut : celui de l'application)
+        self._pending = {}  # codobj -> {colonne: incrément cumulé}
+        self._oldest = None  # Date (monotone) du plus ancien incrément en attente
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Une seule écriture à la fois
+        self._wake = threading.Event()  # Réveille le thread avant la fin de l'intervalle
+        self._stopping = threading.Event()
+        self._thread = None
+        # Compteurs
+        self.increments = 0  # Incréments acceptés
+        self.rejected = 0  # Incréments refusés (tampon plein)
+        self.flushes = 0  # Écritures réussies
+        self.flushed_rows = 0  # Lignes d'UPDATE envoyées
+        self.flush_errors = 0  # Écritures échouées (incréments remis dans le tampon)
+        self.last_flush_s = 0.0  # Durée de la dernière écriture
+        self.max_flush_s = 0.0  # Durée maximale d'une écriture
+        self.flush_seconds = 0.0  # Durée cumulée des écritures
+
+    def add(self, codobj: int, deltas: dict) -> dict:
+        """
+        Cumule des incréments pour un objet.
+        :param codobj: Identifiant de l'objet
+        :param deltas: Colonne -> incrément (colonnes de COUNTER_COLUMNS)
+        :return: Incréments de l'objet en attente d'écriture
+        :raises BufferFull: Si trop d'objets sont déjà en attente
+        """
+        with self._lock:
+            pending = self._pending.get(codobj)
+            if pending is None:
+                if len(self._pending) >= self.max_depth:
+                    self.rejected += 1
+                    raise BufferFull(f"{len(self._pending)} objets en attente d'écriture")
+                pending = self._pending[codobj] = dict.fromkeys(COUNTER_COLUMNS, 0)
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+            for column in COUNTER_COLUMNS:
+                pending[column] += deltas.get(column, 0)
+            self.increments += 1
+            snapshot = dict(pending)
+            depth = len(self._pending)
+        if self.interval <= 0:
+            try:
+                self.flush()  # Écriture immédiate : aucun incrément n'est perdu en cas d'arrêt
+            except Exception:
+                # L'incrément est accepté et reste dans le tampon (remis par `flush`) : il sera écrit
+                # par l'écriture suivante. Lever l'erreur ferait réessayer le client, qui l'ajouterait deux fois.
+                pass
+        elif depth >= self.max_pending:
+            self._wake.set()  # Écriture anticipée par le thread
+        return snapshot
+
+    def flush(self) -> int:
+        """
+        Écrit en base tous les incréments en attente, par lots, dans une transaction.
+        :return: Nombre d'objets écrits
+        :raises Exception: Erreur de la base (les incréments sont remis dans le tampon)
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                oldest, self._oldest = self._oldest, None
+            if not pending:
+                return 0
+            params = [{"b_codobj": codobj, **{f"d_{column}": value for column, value in deltas.items()}}
+                      for codobj, deltas in pending.items()]
+            start = time.perf_counter()
+            try:
+                with self._engine().begin() as conn:
+                    for i in range(0, len(params), FLUSH_BATCH_SIZE):
+                        conn.execute(FLUSH_STATEMENT, params[i:i + FLUSH_BATCH_SIZE])
+            except Exception:
+                self._requeue(pending, oldest)
+                self.flush_errors += 1
+                raise
+            duration = time.perf_counter() - start
+            self.flushes += 1
+            self.flushed_rows += len(pending)
+            self.last_flush_s = duration
+            self.max_flush_s = max(self.max_flush_s, duration)
+            self.flush_seconds += duration
+        objets_changed(*pending)  # Les objets et les listes en cache ne sont plus à jour
+        objet_changes.publish("updated", *pending)  # Un seul événement par écriture groupée
+        return len(pending)
+
+    def _requeue(self, pending: dict, oldest: float | None):
+        """
+        Remet dans le tampon des incréments dont l'écriture a échoué (cumulés avec ceux arrivés entre-temps).
+        """
+        with self._lock:
+            for codobj, deltas in pending.items():
+                current = self._pending.setdefault(codobj, dict.fromkeys(COUNTER_COLUMNS, 0))
+                for column, value in deltas.items():
+                    current[column] += value
+            if oldest is not None and (self._oldest is None or oldest < self._oldest):
+                self._oldest = oldest
+
+    def _engine(self):
+        """
+        :return: Engine des écritures (celui de l'application si `start` n'en a pas fourni)
+        """
+        if self.engine is None:
+            from src.database import engine  # Import local : l'engine n'est utilisé qu'à la première écriture
+            self.engine = engine
+        return self.engine
+
+    def start(self, engine=None):
+        """
+        Démarre le thread d'écriture (lifespan).
+        :param engine: Engine de la base de données
+        """
+        if engine is not None:
+            self.engine = engine
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Arrête le thread d'écriture puis écrit les derniers incréments (arrêt de l'application).
+        """
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        """
+        Boucle du thread : une écriture par intervalle, ou plus tôt si le tampon atteint `max_pending`.
+        """
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # Compté dans flush_errors ; les incréments sont réessayés à l'écriture suivante
+
+    def stats(self) -> dict:
+        """
+        :return: Profondeur du tampon, ancienneté du plus vieil incrément et compteurs des écritures
+        """
+        with self._lock:
+            depth = len(self._pending)
+            oldest = self._oldest
+        return {
+            "depth": depth,
+            "oldest_pending_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest is not None else 0,
+            "increments": self.increments,
+            "rejected": self.rejected,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": round(self.last_flush_s * 1000, 3),
+            "max_flush_ms": round(self.max_flush_s * 1000, 3),
+            "flush_seconds_total": round(self.flush_seconds, 6),
+        }
+
+
+_objet_counters = None  # Tampon des compteurs des objets (créé à la première utilisation)
+
+
+def get_objet_counters() -> WriteBehindBuffer:
+    """
+    :return: Le tampon des compteurs des objets, partagé par les routes et le lifespan
+    """
+    global _objet_counters
+    if _objet_counters is None:
+        _objet_counters = WriteBehindBuffer()
+    return _objet_counters
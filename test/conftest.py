@@ -0,0 +1,46 @@
+# Outils partagés par les tests
+from contextlib import contextmanager
+import pytest  # Importation de pytest pour la gestion des tests
+from sqlalchemy import event  # Événements d'exécution des requêtes SQL
+from src.database import engine  # Engine utilisé par l'application
+from src.migrate import migrate  # Création du schéma (l'application ne le crée plus au démarrage)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    """
+    Crée les tables et les index avant les tests, comme `python -m src.migrate` avant un déploiement.
+    """
+    migrate(engine)
+
+
+# Compteur des requêtes SQL envoyées à la base pendant un bloc de code
+class QueryCounter:
+    def __init__(self):
+        self.statements = []  # Texte des requêtes exécutées
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Fixture qui compte les allers-retours vers la base de données.
+    Utilisation : `with count_queries() as queries: ...` puis `queries.count`.
+    """
+    @contextmanager
+    def counter():
+        queries = QueryCounter()
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            queries.statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield queries
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
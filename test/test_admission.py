@@ -0,0 +1,91 @@
+# Tests du contrôle d'admission (AdmissionMiddleware) : limites de débit et plafond de concurrence
+import asyncio
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.middlewares.admission_middleware import AdmissionMiddleware
+from src.services.admission import RedisRateLimiter, TokenBucketLimiter, request_class
+
+
+# Faux client Redis en mémoire, utilisé à la place d'un vrai serveur
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        pass
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+def build_app(**options) -> FastAPI:
+    """
+    Application minimale : une liste ("heavy"), une entité ("light") et une route lente.
+    """
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, **options)
+
+    @app.get("/items/")
+    def list_items():
+        return []
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/slow/")
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {}
+
+    return app
+
+
+# Test : classes de budget des routes de l'API
+def test_request_class():
+    assert request_class("GET", "/objets/") == "heavy"
+    assert request_class("GET", "/objets/search") == "heavy"
+    assert request_class("GET", "/objets/12") == "light"
+    assert request_class("GET", "/utilisateurs/by-username/alice") == "light"
+    assert request_class("POST", "/objets/") == "light"
+    assert request_class("GET", "/objets/changes") == "stream"
+    assert request_class("GET", "/metrics") is None
+
+
+# Test : budgets séparés par classe et par client, 429 avec Retry-After
+def test_rate_limit_per_class_and_client():
+    now = [0.0]
+    limiter = TokenBucketLimiter(clock=lambda: now[0])
+    client = TestClient(build_app(limiter=limiter, budgets={"heavy": (1, 2), "light": (100, 100)}, max_concurrency=0))
+    assert [client.get("/items/").status_code for _ in range(3)] == [200, 200, 429]
+    rejected = client.get("/items/")
+    assert rejected.headers["retry-after"] == "1"
+    assert client.get("/items/1").status_code == 200  # Budget des lectures unitaires intact
+    assert client.get("/items/", headers={"X-API-Key": "other"}).status_code == 200  # Autre client, autre seau
+    now[0] += 1.0  # Un jeton de plus après une seconde
+    assert client.get("/items/").status_code == 200
+
+
+# Test : backend partagé, avec un faux client Redis
+def test_shared_rate_limit():
+    limiter = RedisRateLimiter(FakeRedis(), clock=lambda: 100.0)
+    client = TestClient(build_app(limiter=limiter, budgets={"heavy": (1, 2)}, max_concurrency=0))
+    assert [client.get("/items/").status_code for _ in range(3)] == [200, 200, 429]
+
+
+# Test : plafond de concurrence, file d'attente bornée puis refus immédiat en 503
+def test_concurrency_cap_and_queue():
+    app = build_app(budgets={}, max_concurrency=1, max_heavy_concurrency=0, queue_size=1, queue_timeout=5)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/slow/") for _ in range(3)))
+
+    statuses = sorted(response.status_code for response in asyncio.run(run()))
+    assert statuses == [200, 200, 503]  # Une en cours, une en attente, la troisième refusée
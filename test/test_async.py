@@ -0,0 +1,85 @@
+# Tests des routes en mode asynchrone (DB_MODE=async) : AsyncSession avec aiosqlite, repositories et routes async
+import uuid  # Libellés et usernames uniques d'une exécution à l'autre
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select  # Identifiants des utilisateurs créés (non renvoyés par l'API)
+from sqlalchemy.orm import Session
+from src.config import get_settings
+from src.database import engine
+from src.main import create_app
+from src.models import Utilisateur
+
+# Dépendances du mode asynchrone (requirements-optional.txt)
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+
+UNKNOWN_ID = 999999999  # Identifiant absent de la base
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    """
+    Application créée en mode asynchrone ; le lifespan ferme l'engine asynchrone à la fin du test.
+    Le client garde une seule boucle d'événements pour toutes les requêtes (connexions aiosqlite du pool).
+    """
+    monkeypatch.setenv("DB_MODE", "async")
+    get_settings.cache_clear()
+    try:
+        with TestClient(create_app()) as client:
+            yield client
+    finally:
+        monkeypatch.delenv("DB_MODE")
+        get_settings.cache_clear()
+
+
+# Test : création, lecture, liste, mise à jour et suppression d'un objet par les routes asynchrones
+def test_async_objets_crud(async_client):
+    from src.database_async import get_async_engine
+    libobj = f"Async {uuid.uuid4().hex[:8]}"
+    response = async_client.post("/objets/", json={"libobj": libobj, "puobj": 2.5})
+    assert response.status_code == 201, f"Expected status code 201, got {response.status_code}"
+    codobj = response.json()["codobj"]
+    assert get_async_engine().url.drivername == "sqlite+aiosqlite"  # Requêtes envoyées par l'engine asynchrone
+
+    response = async_client.get(f"/objets/{codobj}")
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json()["libobj"] == libobj
+    assert async_client.get(f"/objets/{codobj}", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    assert [objet["codobj"] for objet in async_client.get("/objets/", params={"libobj": libobj}).json()] == [codobj]
+
+    response = async_client.put(f"/objets/{codobj}", json={"libobj": f"{libobj} modifié", "puobj": 3.0})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json()["libobj"] == f"{libobj} modifié"
+    assert async_client.get(f"/objets/{codobj}").json()["puobj"] == 3.0  # Cache invalidé par la mise à jour
+
+    assert async_client.delete(f"/objets/{codobj}").status_code == 204
+    assert async_client.get(f"/objets/{codobj}").status_code == 404
+
+
+# Test : objet inexistant en lecture, mise à jour et suppression : 404
+def test_async_objets_not_found(async_client):
+    assert async_client.get(f"/objets/{UNKNOWN_ID}").status_code == 404
+    assert async_client.put(f"/objets/{UNKNOWN_ID}", json={"libobj": "absent"}).status_code == 404
+    assert async_client.delete(f"/objets/{UNKNOWN_ID}").status_code == 404
+
+
+# Test : création, lecture, liste, mise à jour et suppression d'un utilisateur par les routes asynchrones, puis 404
+def test_async_utilisateurs_crud(async_client):
+    username = f"async-{uuid.uuid4().hex[:8]}"
+    response = async_client.post("/utilisateurs/", json={"nom_utilisateur": "Async", "username": username})
+    assert response.status_code == 201, f"Expected status code 201, got {response.status_code}"
+    with Session(engine) as db:
+        id = db.execute(select(Utilisateur.code_utilisateur).where(Utilisateur.username == username)).scalar_one()
+
+    assert async_client.get(f"/utilisateurs/{id}").json()["username"] == username
+    assert [utilisateur["username"] for utilisateur in async_client.get("/utilisateurs/", params={"username": username}).json()] == [username]
+    assert async_client.get(f"/utilisateurs/by-username/{username}").status_code == 200
+
+    response = async_client.put(f"/utilisateurs/{id}", json={"nom_utilisateur": "Async modifié", "username": username})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert async_client.get(f"/utilisateurs/{id}").json()["nom_utilisateur"] == "Async modifié"
+
+    assert async_client.delete(f"/utilisateurs/{id}").status_code == 204
+    assert async_client.get(f"/utilisateurs/{id}").status_code == 404
+    assert async_client.put(f"/utilisateurs/{UNKNOWN_ID}", json={"nom_utilisateur": "absent"}).status_code == 404
+    assert async_client.delete(f"/utilisateurs/{UNKNOWN_ID}").status_code == 404
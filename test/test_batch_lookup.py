@@ -0,0 +1,60 @@
+# Tests des lectures groupées par identifiants (GET /objets/?ids=..., POST /objets/batch-get)
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.database import engine
+from src.main import app
+from src.models import Utilisateur
+from src.services.admission import request_class
+from src.services.cache import get_cache
+
+client = TestClient(app)
+UNKNOWN_ID = 999999999  # Identifiant qui n'existe pas dans la base
+
+
+# Test : un panier de plusieurs objets coûte un nombre fixe de requêtes, puis aucune une fois les objets en cache
+def test_objets_batch_get_round_trips(count_queries):
+    codobjs = [client.post("/objets/", json={"libobj": f"Panier {i}"}).json()["codobj"] for i in range(5)]
+    get_cache().clear()
+
+    with count_queries() as queries:
+        response = client.post("/objets/batch-get", json=[*codobjs, UNKNOWN_ID, codobjs[0]])
+    assert response.status_code == 200
+    assert queries.count <= 2, queries.statements  # Objets, plus `condit` avec CONDIT_LOADING=selectin
+    body = response.json()
+    assert list(body["results"]) == [str(codobj) for codobj in codobjs] + [str(UNKNOWN_ID)]  # Ordre de la requête, sans doublon
+    assert body["results"][str(codobjs[2])]["libobj"] == "Panier 2"
+    assert body["results"][str(UNKNOWN_ID)] is None
+    assert body["not_found"] == [UNKNOWN_ID]
+
+    with count_queries() as queries:
+        response = client.get("/objets/", params={"ids": ",".join(map(str, codobjs))})
+    assert response.status_code == 200
+    assert queries.count == 0, queries.statements  # Tous en cache
+    assert response.json()["not_found"] == []
+    assert client.get(f"/objets/{codobjs[3]}").json() == response.json()["results"][str(codobjs[3])]
+
+
+# Test : même lecture groupée pour les utilisateurs
+def test_utilisateurs_batch_get(count_queries):
+    usernames = [f"lot-{i}-{uuid.uuid4().hex[:8]}" for i in range(3)]
+    for i, username in enumerate(usernames):
+        client.post("/utilisateurs/", json={"nom_utilisateur": f"Lot {i}", "username": username})
+    with Session(engine) as db:  # L'identifiant n'est pas renvoyé par l'API
+        ids = [db.execute(select(Utilisateur.code_utilisateur).where(Utilisateur.username == username)).scalar_one()
+               for username in usernames]
+    get_cache().clear()
+    with count_queries() as queries:
+        response = client.get("/utilisateurs/", params={"ids": ",".join(map(str, [*ids, UNKNOWN_ID]))})
+    assert response.status_code == 200
+    assert queries.count == 1, queries.statements
+    assert response.json()["not_found"] == [UNKNOWN_ID]
+    assert client.post("/utilisateurs/batch-get", json=ids).json()["results"][str(ids[1])]["nom_utilisateur"] == "Lot 1"
+
+
+# Test : identifiants invalides et classe de budget des lectures groupées
+def test_batch_get_validation():
+    assert client.get("/objets/", params={"ids": "1,abc"}).status_code == 400
+    assert client.post("/objets/batch-get", json=[]).status_code == 422
+    assert request_class("POST", "/objets/batch-get") == "heavy"
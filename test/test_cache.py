@@ -0,0 +1,80 @@
+# Importation des modules nécessaires pour les tests du cache
+import time  # Pour attendre l'expiration des entrées
+from src.services.cache import LRUCache, RedisCache, get_cache, invalidate, read_through, set_cache
+from src.services.versions import bump_version
+
+
+# Faux client Redis en mémoire, utilisé à la place d'un vrai serveur
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        return [key for key in self.data if key.startswith(match.rstrip("*"))]
+
+
+# Test de l'éviction LRU lorsque le cache est plein
+def test_lru_eviction():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" devient la clé la plus récemment utilisée
+    cache.set("c", 3)  # "b" est évincée
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+# Test de l'expiration des entrées (TTL)
+def test_lru_ttl():
+    cache = LRUCache(max_size=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None, "Expired entries should not be returned"
+
+
+# Test du cache en lecture et de l'invalidation, avec le backend Redis simulé
+def test_read_through_and_invalidate():
+    previous = get_cache()
+    set_cache(RedisCache(FakeRedis()))
+    try:
+        calls = []
+        loader = lambda: calls.append(1) or '{"codobj": 1}'
+        assert read_through("objet:1", loader, "objets") == '{"codobj": 1}'
+        assert read_through("objet:1", loader, "objets") == '{"codobj": 1}'
+        assert len(calls) == 1, "The second read should be served from the cache"
+
+        invalidate("objet:1")
+        read_through("objet:1", loader, "objets")
+        assert len(calls) == 2, "An invalidated entry should be reloaded"
+        assert get_cache().stats()["hits"] == 1
+    finally:
+        set_cache(previous)
+
+
+# Test : une écriture validée pendant la lecture en base n'est pas masquée par la mise en cache de l'ancienne valeur
+def test_read_through_skips_stale_value():
+    previous = get_cache()
+    set_cache(LRUCache(max_size=10, ttl=60))
+    try:
+        def loader():
+            value = '{"codobj": 1, "libobj": "ancien"}'  # Lu avant l'écriture concurrente
+            bump_version("objets")  # Écriture concurrente : version incrémentée puis invalidation
+            invalidate("objet:1")
+            return value
+
+        assert read_through("objet:1", loader, "objets") == '{"codobj": 1, "libobj": "ancien"}'
+        assert get_cache().get("objet:1") is None, "A value read before a write should not be cached"
+        assert read_through("objet:1", lambda: '{"codobj": 1}', "objets") == '{"codobj": 1}'
+        assert get_cache().get("objet:1") == '{"codobj": 1}'
+    finally:
+        set_cache(previous)
@@ -0,0 +1,73 @@
+# Tests du flux des modifications (GET /objets/changes, /utilisateurs/changes) : long-poll, reprise, SSE, abonnés lents
+import asyncio
+import threading
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src.services.change_feed import ChangeFeed, SubscriberOverflow, sse_events
+
+client = TestClient(app)
+
+
+# Test : écritures publiées dans le flux, relues en long-poll à partir d'un numéro
+def test_long_poll_after_writes():
+    start = client.get("/objets/changes").json()  # Sans `after` : position courante, sans attendre
+    assert start["events"] == [] and start["reset"] is False
+
+    codobj = client.post("/objets/", json={"libobj": "Flux"}).json()["codobj"]
+    assert client.put(f"/objets/{codobj}", json={"libobj": "Flux modifié"}).status_code == 200
+    assert client.delete(f"/objets/{codobj}").status_code == 204
+
+    changes = client.get("/objets/changes", params={"after": start["last_seq"], "timeout": 1}).json()
+    assert [(event["type"], event["ids"]) for event in changes["events"]] == [
+        ("created", [codobj]), ("updated", [codobj]), ("deleted", [codobj])
+    ]
+    assert changes["last_seq"] == changes["events"][-1]["seq"] and changes["reset"] is False
+
+    after = client.get("/utilisateurs/changes").json()["last_seq"]
+    client.post("/utilisateurs/", json={"nom_utilisateur": "Flux", "username": f"flux-{uuid.uuid4().hex[:8]}"})
+    events = client.get("/utilisateurs/changes", params={"after": after, "timeout": 1}).json()["events"]
+    assert [event["type"] for event in events] == ["created"]
+
+    # Numéro inconnu (autre processus, redémarrage) : relecture complète demandée
+    assert client.get("/objets/changes", params={"after": 10 ** 9}).json()["reset"] is True
+    assert client.get("/changes/stats").json()["objets"]["subscribers"] == 0
+
+
+# Test : abonnés en attente dans la boucle, événements publiés depuis un autre thread, file bornée
+def test_subscribers_and_overflow():
+    async def scenario():
+        feed = ChangeFeed("test", history=3, buffer=2)
+        idle = [feed.subscribe()[0] for _ in range(1000)]  # Abonnés inactifs : aucune tâche ni thread
+        subscription, backlog, reset = feed.subscribe()
+        waiting = asyncio.create_task(subscription.next_events(5))
+        await asyncio.sleep(0)
+        threading.Thread(target=feed.publish, args=("updated", 1, 2)).start()
+        events = await waiting
+        assert [(event.seq, event.ids) for event in events] == [(1, [1, 2])]
+
+        for codobj in (3, 4, 5):
+            feed.publish("deleted", codobj)
+        await asyncio.sleep(0)
+        with pytest.raises(SubscriberOverflow):  # File pleine : l'abonné est prévenu, rien n'est perdu en silence
+            await subscription.next_events(1)
+        assert subscription.last_seq == 3  # Le client reprend après le dernier événement reçu
+
+        resumed, backlog, reset = feed.subscribe(after=subscription.last_seq)
+        assert [event.seq for event in backlog] == [4] and not reset
+        reset_subscription, backlog, reset = feed.subscribe(after=0)
+        assert reset and not backlog  # Événement 1 sorti de l'historique
+
+        for other in idle + [subscription, resumed, reset_subscription]:
+            feed.unsubscribe(other)
+
+        stream = sse_events(feed, *feed.subscribe(after=2), heartbeat=0.01)
+        assert await anext(stream) == b'id: 2\nevent: ready\ndata: {"seq": 2}\n\n'
+        assert (await anext(stream)).count(b"\nevent: deleted\n") == 2  # Événements 3 et 4 manqués
+        assert await anext(stream) == b": keepalive\n\n"
+        await stream.aclose()
+        # Les abonnés inactifs, qui ne lisaient pas leur file, ont aussi débordé
+        assert feed.stats()["subscribers"] == 0 and feed.stats()["overflows"] == 1001
+
+    asyncio.run(scenario())
@@ -0,0 +1,78 @@
+# Tests de la compression des réponses (CompressionMiddleware)
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from src.middlewares.compression_middleware import CompressionMiddleware
+from src.services.compression import compression_stats, negotiate
+
+BIG_BODY = b'[' + b",".join(b'{"codobj": %d, "libobj": "Mug"}' % i for i in range(200)) + b']'
+
+# Application minimale : réponses de différentes tailles, avec ou sans ETag, et en streaming
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, encodings=("gzip",), minimum_size=1024)
+
+
+@app.get("/big")
+def big(request: Request):
+    if request.headers.get("if-none-match") == '"big-1"':  # L'application ne connaît que son propre ETag
+        return Response(status_code=304, headers={"ETag": '"big-1"'})
+    return Response(BIG_BODY, media_type="application/json", headers={"ETag": '"big-1"'})
+
+
+@app.get("/small")
+def small():
+    return Response(b'{"ok": true}', media_type="application/json")
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse((b'{"i": %d}\n' % i for i in range(500)), media_type="application/x-ndjson")
+
+
+client = TestClient(app)
+
+
+# Test : négociation de l'encodage d'après Accept-Encoding
+def test_negotiate_accept_encoding():
+    encodings = ("zstd", "br", "gzip")
+    assert negotiate("gzip, br", encodings) == "br"  # À poids égal, préférence du serveur
+    assert negotiate("gzip;q=1.0, br;q=0.5", encodings) == "gzip"  # Poids du client
+    assert negotiate("*", encodings) == "zstd"
+    assert negotiate("gzip;q=0", encodings) is None
+    assert negotiate("identity", encodings) is None
+    assert negotiate(None, encodings) is None
+
+
+# Test : compression au-delà du seuil, corps compressé réutilisé pour un même ETag
+def test_compression_threshold_and_cache():
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] == '"big-1-gzip"'  # Représentation compressée : ETag distinct
+    assert int(response.headers["content-length"]) < len(BIG_BODY)
+    assert response.content == BIG_BODY  # Décompressé par le client
+
+    hits = compression_stats.as_dict()["cache_hits"]
+    assert client.get("/big", headers={"Accept-Encoding": "gzip"}).content == BIG_BODY
+    assert compression_stats.as_dict()["cache_hits"] == hits + 1  # Pas de nouvelle compression
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+# Test : une réponse en streaming est compressée morceau par morceau
+def test_streaming_compression():
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content.splitlines()[-1] == b'{"i": 499}'
+
+
+# Test : requête conditionnelle avec l'ETag d'une réponse compressée (suffixe retiré pour l'application)
+def test_conditional_request_with_encoded_etag():
+    response = client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": '"big-1-gzip"'})
+    assert response.status_code == 304 and response.headers["etag"] == '"big-1-gzip"'
+    response = client.get("/big", headers={"Accept-Encoding": "identity", "If-None-Match": '"big-1"'})
+    assert response.status_code == 304 and response.headers["etag"] == '"big-1"'
+    response = client.get("/big", headers={"If-None-Match": '"big-0-gzip"'})
+    assert response.status_code == 200
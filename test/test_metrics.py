@@ -0,0 +1,50 @@
+# Tests des métriques Prometheus (/metrics) : séries par modèle de route, événements SQL des moteurs
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from src.main import app
+from src.services import metrics
+from src.services.metrics import QueryStats, current_query_stats, registry
+from src.services.profiling import SlowQueryLog
+
+client = TestClient(app)
+
+
+# Test : une série par modèle complet de route (préfixe du routeur compris), pas par chemin brut
+def test_metrics_route_labels():
+    registry.reset()
+    client.get("/objets/")
+    client.get("/utilisateurs/")
+    client.get("/objets/999999999")
+    client.get("/objets/999999998")
+    client.get("/absent")
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/objets/",status="200"} 1' in body
+    assert 'http_requests_total{method="GET",route="/utilisateurs/",status="200"} 1' in body
+    assert 'http_requests_total{method="GET",route="/objets/{codobj}",status="404"} 2' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in body
+    assert 'route="/"' not in body and 'route="/{codobj}"' not in body
+
+
+# Test : requêtes SQL comptées pour la requête HTTP en cours, requêtes lentes journalisées, échecs sans trace
+def test_query_listeners(monkeypatch):
+    slow_log = SlowQueryLog(threshold_ms=0.000001, explain=False)
+    monkeypatch.setattr(metrics, "slow_query_log", slow_log)
+    engine = create_engine("sqlite://")
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM table_absente"))
+            assert conn.info["query_start_time"] == []
+    finally:
+        current_query_stats.reset(token)
+    assert stats.count == 2 and stats.duration > 0  # Requête en échec non comptée
+    assert [entry["sql"] for entry in slow_log.entries()] == ["SELECT 2", "SELECT 1"]  # Plus récente en premier
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))  # En dehors d'une requête HTTP : seulement le journal des requêtes lentes
+    assert stats.count == 2 and slow_log.stats()["count"] == 3
@@ -0,0 +1,214 @@
+# Importation des modules nécessaires pour les tests
+from fastapi.testclient import TestClient  # TestClient de FastAPI pour envoyer des requêtes HTTP à l'application
+from src.main import app  # Importation de l'application FastAPI depuis le fichier principal
+import uuid  # Libellés uniques d'une exécution à l'autre
+from sqlalchemy import select  # Lecture des conditionnements
+from sqlalchemy.orm import Session
+from src.database import engine
+from src.models import Objet
+from src.services.cache import get_cache
+from src.services.objets_services import objet_cache_key
+from src.services.change_feed import objet_changes
+from src.services.versions import table_version
+
+# Initialisation du client de test
+client = TestClient(app)
+
+# Identifiant qui n'existe pas dans la base de données
+UNKNOWN_ID = 999999999
+
+
+# Test du nombre d'allers-retours vers la base pour le cycle de vie complet d'un objet
+def test_objet_write_round_trips(count_queries):
+    # Création : un seul INSERT ... RETURNING
+    with count_queries() as queries:
+        response = client.post("/objets/", json={"libobj": "Objet de test", "puobj": 1.5})
+    assert response.status_code == 201, f"Expected status code 201, got {response.status_code}"
+    assert queries.count == 1, queries.statements
+    codobj = response.json()["codobj"]
+
+    # Mise à jour : un UPDATE ... RETURNING (pas de SELECT avant), puis la lecture des conditionnements
+    with count_queries() as queries:
+        response = client.put(f"/objets/{codobj}", json={"libobj": "Objet modifié", "puobj": 2.0})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json()["libobj"] == "Objet modifié"
+    assert queries.count == 2, queries.statements
+
+    # Lecture : au plus une requête, puis servie depuis le cache
+    with count_queries() as queries:
+        assert client.get(f"/objets/{codobj}").status_code == 200
+        assert client.get(f"/objets/{codobj}").status_code == 200
+    assert queries.count <= 2, queries.statements
+
+    # Suppression : les conditionnements détachés (ou supprimés), puis un seul DELETE
+    with count_queries() as queries:
+        response = client.delete(f"/objets/{codobj}")
+    assert response.status_code == 204, f"Expected status code 204, got {response.status_code}"
+    assert queries.count == 2, queries.statements
+
+
+# Test : un objet inexistant est détecté à partir du nombre de lignes touchées, en une seule requête
+def test_objet_not_found_round_trips(count_queries):
+    with count_queries() as queries:
+        assert client.put(f"/objets/{UNKNOWN_ID}", json={"libobj": "x"}).status_code == 404
+    assert queries.count == 1, queries.statements
+
+    with count_queries() as queries:
+        assert client.delete(f"/objets/{UNKNOWN_ID}").status_code == 404
+    assert queries.count == 2, queries.statements  # Conditionnements (aucun), puis DELETE sans ligne
+
+
+# Test : même budget pour les utilisateurs
+def test_utilisateur_not_found_round_trips(count_queries):
+    with count_queries() as queries:
+        assert client.put(f"/utilisateurs/{UNKNOWN_ID}", json={"prenom_utilisateur": "x"}).status_code == 404
+    assert queries.count == 1, queries.statements
+
+    with count_queries() as queries:
+        assert client.delete(f"/utilisateurs/{UNKNOWN_ID}").status_code == 404
+    assert queries.count == 1, queries.statements
+
+
+# Test de la mise à jour partielle avec concurrence optimiste (If-Match)
+def test_patch_objet_if_match():
+    codobj = client.post("/objets/", json={"libobj": "Objet à modifier", "puobj": 3.0}).json()["codobj"]
+    etag = client.get(f"/objets/{codobj}").headers["etag"]
+
+    # Seule la colonne envoyée est modifiée
+    response = client.patch(f"/objets/{codobj}", json={"points": 5}, headers={"If-Match": etag})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json()["points"] == 5
+    assert response.json()["puobj"] == 3.0
+    assert response.headers["etag"] != etag
+
+    # L'ancien ETag n'est plus valide : 412
+    response = client.patch(f"/objets/{codobj}", json={"points": 6}, headers={"If-Match": etag})
+    assert response.status_code == 412, f"Expected status code 412, got {response.status_code}"
+
+    client.delete(f"/objets/{codobj}")
+
+
+# Test : une mise à jour partielle qui ne change rien (corps vide, mêmes valeurs) n'invalide rien et ne publie rien
+def test_patch_objet_without_change():
+    codobj = client.post("/objets/", json={"libobj": "Objet inchangé", "points": 2}).json()["codobj"]
+    version, seq = table_version("objets"), objet_changes.seq
+    for changes in ({}, {"points": 2}):
+        response = client.patch(f"/objets/{codobj}", json=changes)
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert response.json()["libobj"] == "Objet inchangé" and response.json()["points"] == 2
+    assert table_version("objets") == version and objet_changes.seq == seq
+
+    assert client.patch(f"/objets/{codobj}", json={"points": 3}).json()["points"] == 3
+    assert table_version("objets") != version and objet_changes.seq == seq + 1
+    client.delete(f"/objets/{codobj}")
+
+
+# Test : GET conditionnel servi par l'ETag en cache, sans relire l'objet, même si son JSON a été évincé
+def test_get_objet_not_modified_without_load(count_queries):
+    codobj = client.post("/objets/", json={"libobj": "Objet conditionnel"}).json()["codobj"]
+    etag = client.get(f"/objets/{codobj}").headers["etag"]
+    get_cache().delete(objet_cache_key(codobj))  # JSON évincé, ETag conservé
+
+    with count_queries() as queries:
+        response = client.get(f"/objets/{codobj}", headers={"If-None-Match": etag})
+    assert response.status_code == 304 and response.headers["etag"] == etag
+    assert queries.count == 0, queries.statements
+
+    client.patch(f"/objets/{codobj}", json={"points": 1})  # L'ETag en cache est invalidé avec l'objet
+    response = client.get(f"/objets/{codobj}", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    client.delete(f"/objets/{codobj}")
+
+
+# Test de la pagination par curseur et du filtre sur le préfixe du libellé, sur des objets créés pour le test
+def test_get_objets_pagination():
+    prefix = f"Page {uuid.uuid4().hex[:8]}"
+    codobjs = [client.post("/objets/", json={"libobj": f"{prefix} {i}"}).json()["codobj"] for i in range(3)]
+
+    first = client.get("/objets/", params={"limit": 2, "libobj": prefix})
+    assert [objet["codobj"] for objet in first.json()] == codobjs[:2]
+    assert first.headers["X-Next-Cursor"] == str(codobjs[1])
+    last = client.get("/objets/", params={"limit": 2, "libobj": prefix, "after": first.headers["X-Next-Cursor"]})
+    assert [objet["codobj"] for objet in last.json()] == codobjs[2:]
+    assert "X-Next-Cursor" not in last.headers  # Dernière page
+    for codobj in codobjs:
+        client.delete(f"/objets/{codobj}")
+
+
+# Test du paramètre fields= : seules les colonnes demandées sont lues et renvoyées
+def test_get_objets_sparse_fields(count_queries):
+    with count_queries() as queries:
+        response = client.get("/objets/", params={"limit": 5, "fields": "codobj,libobj,puobj"})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    for objet in response.json():
+        assert set(objet) == {"codobj", "libobj", "puobj"}
+    assert queries.count == 1, queries.statements
+    assert "poidsobj" not in queries.statements[0]
+
+    # Un champ inconnu est refusé
+    response = client.get("/objets/", params={"fields": "codobj,inconnu"})
+    assert response.status_code == 400, f"Expected status code 400, got {response.status_code}"
+
+
+# Test de non-régression du N+1 : le nombre de requêtes ne dépend pas du nombre d'objets renvoyés
+def test_get_objets_condit_constant_queries(count_queries):
+    with count_queries() as small:
+        response = client.get("/objets/", params={"limit": 1, "include": "condit"})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    with count_queries() as large:
+        response = client.get("/objets/", params={"limit": 50, "include": "condit"})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert all("condit" in objet for objet in response.json())
+    assert large.count == small.count <= 2, large.statements
+
+    # Sans include=condit, la relation n'est pas chargée : une seule requête
+    with count_queries() as queries:
+        response = client.get("/objets/", params={"limit": 50})
+    assert all("condit" not in objet for objet in response.json())
+    assert queries.count == 1, queries.statements
+
+
+# Test de la recherche : préfixes, accents ignorés, index tenu à jour par les écritures
+def test_search_objets(count_queries):
+    marker = f"zq{uuid.uuid4().hex[:8]}"  # Mot propre à ce test
+    created = client.post("/objets/", json={"libobj": f"Écharpe bleue {marker}"}).json()
+    client.post("/objets/", json={"libobj": f"Écharpe rouge {marker}"})
+    client.get("/objets/search", params={"q": marker})  # Construit l'index (le client de test ne lance pas le lifespan)
+
+    with count_queries() as queries:
+        response = client.get("/objets/search", params={"q": f"ECH bleu {marker[:6]}"})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert [objet["codobj"] for objet in response.json()] == [created["codobj"]]
+    assert queries.count == 1, queries.statements  # Seule la lecture des objets trouvés, par clé primaire
+
+    # Le mot exact passe avant le simple préfixe
+    client.post("/objets/", json={"libobj": f"Echarpes {marker}"})
+    ranked = client.get("/objets/search", params={"q": f"echarpe {marker}"}).json()
+    assert [objet["libobj"] for objet in ranked][-1] == f"Echarpes {marker}"
+
+    # Modification puis suppression : l'index suit
+    client.patch(f"/objets/{created['codobj']}", json={"libobj": f"Bonnet {marker}"})
+    assert client.get("/objets/search", params={"q": f"bleu {marker}"}).json() == []
+    assert len(client.get("/objets/search", params={"q": f"bonnet {marker}"}).json()) == 1
+    client.delete(f"/objets/{created['codobj']}")
+    assert client.get("/objets/search", params={"q": f"bonnet {marker}"}).json() == []
+
+
+# Test : PUT renvoie les conditionnements de l'objet ; DELETE (simple ou en masse) ne laisse aucun conditionnement le référencer
+def test_objet_condit_on_update_and_delete():
+    condit_class = Objet.condit.property.mapper.class_
+    ((_, foreign_key),) = Objet.condit.property.synchronize_pairs
+    codobjs = [client.post("/objets/", json={"libobj": "Conditionné"}).json()["codobj"] for _ in range(2)]
+    with Session(engine) as session:
+        for codobj in codobjs:
+            session.add(condit_class(**{foreign_key.key: codobj}))
+        session.commit()
+
+    response = client.put(f"/objets/{codobjs[0]}", json={"libobj": "Conditionné modifié"})
+    assert response.status_code == 200
+    assert [condit[foreign_key.key] for condit in response.json()["condit"]] == [codobjs[0]]
+
+    assert client.delete(f"/objets/{codobjs[0]}").status_code == 204
+    assert client.request("DELETE", "/objets/bulk", json=[codobjs[1]]).json()["results"][0]["status"] == "deleted"
+    with Session(engine) as session:
+        assert session.execute(select(foreign_key).where(foreign_key.in_(codobjs))).all() == []
@@ -0,0 +1,75 @@
+# Tests des opérations en masse sur les objets (POST/PUT/DELETE /objets/bulk)
+import uuid  # Libellés uniques d'une exécution à l'autre
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event  # Erreur simulée pendant une opération en masse
+from src.database import engine
+from src.main import app
+from src.services import objets_services
+
+client = TestClient(app)
+UNKNOWN_ID = 999999999  # Identifiant d'objet absent de la base
+
+
+# Test des opérations en masse : résultat de chaque ligne, nombre de requêtes, doublons
+def test_bulk_objets(count_queries):
+    prefix = f"Masse {uuid.uuid4().hex[:8]}"
+    with count_queries() as queries:
+        response = client.post("/objets/bulk", json=[{"libobj": f"{prefix} {i}", "puobj": i} for i in range(3)])
+    assert response.status_code == 201, f"Expected status code 201, got {response.status_code}"
+    results = response.json()["results"]
+    assert [(result["index"], result["status"], result["objet"]["libobj"]) for result in results] == [
+        (i, "created", f"{prefix} {i}") for i in range(3)
+    ]
+    # Un seul INSERT multi-lignes ... RETURNING ; SQLite ne garantit pas l'ordre des lignes renvoyées
+    # par un INSERT multi-lignes : SQLAlchemy y envoie alors un INSERT par ligne, sans aucun SELECT
+    assert all(statement.startswith("INSERT") for statement in queries.statements), queries.statements
+    assert queries.count == (3 if engine.dialect.name == "sqlite" else 1), queries.statements
+    codobjs = [result["codobj"] for result in results]
+
+    # Mise à jour : un SELECT des objets existants, puis un UPDATE exécuté en lot
+    updates = [{"codobj": codobj, "libobj": f"{prefix} modifié"} for codobj in codobjs[:2]]
+    with count_queries() as queries:
+        response = client.put("/objets/bulk", json=updates + [{"codobj": UNKNOWN_ID, "libobj": "absent"}])
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert [(result["index"], result["status"]) for result in response.json()["results"]] == [
+        (0, "updated"), (1, "updated"), (2, "not_found")
+    ]
+    assert queries.count == 2, queries.statements
+    assert client.get(f"/objets/{codobjs[0]}").json()["libobj"] == f"{prefix} modifié"
+
+    # Suppression : un identifiant répété n'est supprimé (et signalé "deleted") qu'une fois
+    with count_queries() as queries:
+        response = client.request("DELETE", "/objets/bulk", json=[codobjs[0], codobjs[0], UNKNOWN_ID, codobjs[1], codobjs[2]])
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert [result["status"] for result in response.json()["results"]] == ["deleted", "not_found", "not_found", "deleted", "deleted"]
+    assert len([statement for statement in queries.statements if statement.lstrip().upper().startswith("DELETE")]) == 1
+    assert client.get("/objets/", params={"libobj": prefix}).json() == []
+
+
+# Test : une ligne invalide ou une erreur en cours d'opération n'enregistre rien (une seule transaction)
+def test_bulk_objets_rollback(monkeypatch):
+    prefix = f"Annulé {uuid.uuid4().hex[:8]}"
+    response = client.post("/objets/bulk", json=[{"libobj": f"{prefix} 0"}, {"libobj": f"{prefix} 1", "puobj": "invalide"}])
+    assert response.status_code == 422, f"Expected status code 422, got {response.status_code}"
+    assert client.get("/objets/", params={"libobj": prefix}).json() == []  # Aucune ligne créée
+
+    codobjs = [result["codobj"] for result in client.post("/objets/bulk", json=[{"libobj": f"{prefix} {i}"} for i in range(2)]).json()["results"]]
+    monkeypatch.setattr(objets_services, "BULK_CHUNK_SIZE", 1)  # Un DELETE par identifiant
+    deletes = []
+
+    def fail_second_delete(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("DELETE"):
+            deletes.append(statement)
+            if len(deletes) == 2:
+                raise RuntimeError("Erreur simulée pendant la suppression en masse")
+
+    event.listen(engine, "before_cursor_execute", fail_second_delete)
+    try:
+        with pytest.raises(RuntimeError):
+            client.request("DELETE", "/objets/bulk", json=codobjs)
+    finally:
+        event.remove(engine, "before_cursor_execute", fail_second_delete)
+    # Le premier DELETE, déjà exécuté, a été annulé avec le reste de la transaction
+    assert [objet["codobj"] for objet in client.get("/objets/", params={"libobj": prefix}).json()] == codobjs
+    client.request("DELETE", "/objets/bulk", json=codobjs)
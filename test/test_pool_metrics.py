@@ -0,0 +1,38 @@
+# Tests des compteurs du pool de connexions (/pool/stats)
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from src.config import get_settings
+from src.database_engine import create_pooled_engine
+from src.database_replicas import create_replica
+from src.services.pool_metrics import instrument_pool
+
+
+# Test : emprunts, saturation et détention comptés par les événements du pool, conservés après recréation du pool
+def test_pool_metrics_survive_dispose(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0)
+    metrics = instrument_pool(engine, name="test-pool")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.dispose()  # Nouveau pool : les écouteurs de l'engine y sont reportés
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    stats = metrics.snapshot()
+    assert stats["checkouts"] == 2 and stats["connections_created"] == 2
+    assert stats["checked_out_max"] == 1 and stats["saturated_checkouts"] == 2  # Une seule connexion permise
+    assert stats["pool"]["checkedout"] == 0 and stats["hold_total_seconds"] > 0
+
+
+# Test : les variables DB_POOL_* de l'environnement arrivent jusqu'au pool de l'engine (et des réplicas)
+def test_pool_settings_from_env(tmp_path, monkeypatch):
+    for name, value in {"DB_POOL_SIZE": "3", "DB_MAX_OVERFLOW": "4", "DB_POOL_TIMEOUT": "7.5",
+                        "DB_POOL_RECYCLE": "60", "DB_POOL_PRE_PING": "false"}.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    try:
+        engine = create_pooled_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+        replica = create_replica(f"sqlite:///{tmp_path / 'replica.db'}", "test-pool-replica")
+    finally:
+        get_settings.cache_clear()  # Configuration relue sans les variables du test
+    for pool in (engine.pool, replica.engine.pool):
+        assert isinstance(pool, QueuePool)
+        assert (pool.size(), pool._max_overflow, pool._timeout, pool._recycle, pool._pre_ping) == (3, 4, 7.5, 60, False)
@@ -0,0 +1,68 @@
+# Tests du profilage à la demande (en-tête X-Profile) et du journal des requêtes SQL lentes
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from src.config import get_settings
+from src.main import app
+from src.services.cache import get_cache
+from src.services.profiling import SlowQueryLog
+
+client = TestClient(app)
+TOKEN = "test-profiling-token"
+
+
+@pytest.fixture
+def profiling_token(monkeypatch):
+    monkeypatch.setattr(get_settings(), "profiling_token", TOKEN)
+
+
+# Test : requête profilée (Server-Timing, détail des requêtes SQL sur /profiles/{id}), sinon rien
+def test_profiled_request(profiling_token):
+    get_cache().clear()
+    response = client.get("/objets/", params={"limit": 5}, headers={"X-Profile": TOKEN})
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert all(f"{name};dur=" in timing for name in ("sql", "orm", "validation", "serialization", "total"))
+
+    profile_id = response.headers["x-profile-id"]
+    assert client.get(f"/profiles/{profile_id}").status_code == 404  # Jeton requis
+    profile = client.get(f"/profiles/{profile_id}", headers={"X-Profile": TOKEN}).json()
+    assert profile["path"] == "/objets/" and profile["status"] == 200
+    assert profile["queries"] == len(profile["statements"]) >= 1
+    assert "SELECT" in profile["statements"][0]["sql"].upper()
+
+    for headers in ({}, {"X-Profile": "wrong"}):
+        response = client.get("/objets/", params={"limit": 5}, headers=headers)
+        assert "server-timing" not in response.headers and "x-profile-id" not in response.headers
+
+
+# Test : requêtes au-dessus du seuil conservées avec leur plan d'exécution (SQLite : EXPLAIN QUERY PLAN)
+def test_slow_query_log():
+    engine = create_engine("sqlite://")
+    log = SlowQueryLog(threshold_ms=0.000001, explain=True, size=2)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def observe(conn, cursor, statement, parameters, context, executemany):
+        log.observe(cursor, conn.dialect.name, statement, parameters, 1.0, executemany)
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+        conn.execute(text("SELECT v FROM t WHERE id = :id"), {"id": 1})
+    entries = log.entries()
+    assert entries[0]["sql"].startswith("SELECT") and entries[0]["plan"]
+    assert entries[1]["plan"] is None  # Pas d'EXPLAIN hors SELECT
+    assert log.stats()["count"] == 2 and log.stats()["explain_errors"] == 0
+
+    assert SlowQueryLog(threshold_ms=0).threshold == 0  # Seuil nul : journal désactivé
+    assert "slow_queries_count" in client.get("/metrics").text
+
+
+# Test : une requête en échec ne laisse pas son début mesuré sur la connexion
+def test_failed_statement_clears_start_time():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM table_absente"))
+        assert conn.info.get("query_start_time") == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
@@ -0,0 +1,109 @@
+# Tests de la répartition des lectures entre réplicas (deux bases SQLite locales) et de l'épinglage après écriture
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from src.database_replicas import ReplicaRouter, create_replica, set_replica_router
+from src.main import app
+from src.migrate import migrate
+from src.models import Objet
+from src.services.cache import get_cache
+from src.services.objets_services import objet_cache_key
+
+client = TestClient(app)
+REPLICA_ONLY_ID = 888888888  # Objet présent sur les réplicas seulement : indique d'où vient la lecture
+
+
+def build_replicas(tmp_path, count=2):
+    """
+    Réplicas SQLite avec le schéma et un objet propre à chacun.
+    """
+    replicas = []
+    for i in range(1, count + 1):
+        replica = create_replica(f"sqlite:///{tmp_path}/replica{i}.db", f"test-replica{i}")
+        migrate(replica.engine)
+        with Session(replica.engine) as db:
+            db.add(Objet(codobj=REPLICA_ONLY_ID, libobj=f"replica{i}"))
+            db.commit()
+        replicas.append(replica)
+    return replicas
+
+
+# Test : répartition chacun son tour, moins occupé, réplica en échec écarté puis réintégré
+def test_balancing_and_health(tmp_path):
+    first, second = build_replicas(tmp_path)
+    router = ReplicaRouter([first, second])
+    chosen = [router.acquire() for _ in range(4)]
+    assert [replica.name for replica in chosen] == ["test-replica1", "test-replica2"] * 2
+    for replica in chosen:
+        router.release(replica)
+
+    busy = ReplicaRouter([first, second], balancing="least_busy")
+    held = busy.acquire()
+    for _ in range(3):
+        other = busy.acquire()
+        assert other is not held  # Le réplica occupé n'est plus choisi
+        busy.release(other)
+    busy.release(held)
+
+    broken = create_replica(f"sqlite:///{tmp_path}/absent/replica.db", "test-broken")
+    router = ReplicaRouter([broken, first])
+    router.check_health()
+    assert not broken.healthy and broken.failures == 1
+    assert {router.acquire().name for _ in range(3)} == {"test-replica1"}
+    router.replicas = [first]
+    first.healthy = False
+    assert router.acquire() is None  # Aucun réplica disponible : base principale
+
+
+# Test : lectures servies par les réplicas, puis par la base principale juste après une écriture du client
+def test_read_your_writes(tmp_path):
+    now = [0.0]
+    router = ReplicaRouter(build_replicas(tmp_path), pin_seconds=5, clock=lambda: now[0])
+    set_replica_router(router)
+    try:
+        labels = []
+        for _ in range(2):
+            get_cache().clear()
+            labels.append(client.get(f"/objets/{REPLICA_ONLY_ID}").json()["libobj"])
+        assert labels == ["replica1", "replica2"]
+
+        assert client.post("/objets/", json={"libobj": "Écriture"}).status_code == 201
+        get_cache().clear()
+        assert client.get(f"/objets/{REPLICA_ONLY_ID}").status_code == 404  # Base principale
+        assert client.get(f"/objets/{REPLICA_ONLY_ID}", headers={"X-API-Key": "other"}).status_code == 200  # Autre client
+
+        now[0] += 6  # Fin de l'épinglage
+        get_cache().clear()
+        assert client.get(f"/objets/{REPLICA_ONLY_ID}").status_code == 200
+        stats = client.get("/replicas/stats").json()
+        assert stats["pinned_reads"] == 1 and stats["replicas"]["test-replica1"]["healthy"] == 1
+    finally:
+        set_replica_router(None)
+        router.stop()
+        get_cache().clear()
+
+
+# Test : une lecture sur un réplica en retard n'est pas mise en cache, le client qui vient d'écrire lit sa valeur
+def test_stale_replica_not_cached(tmp_path):
+    replicas = build_replicas(tmp_path)
+    router = ReplicaRouter(replicas, pin_seconds=5)
+    set_replica_router(router)
+    try:
+        writer, reader = {"X-API-Key": "writer"}, {"X-API-Key": "reader"}
+        codobj = client.post("/objets/", json={"libobj": "Frais"}, headers=writer).json()["codobj"]
+        for replica in replicas:  # Réplicas en retard : ancienne valeur de l'objet
+            with Session(replica.engine) as db:
+                db.add(Objet(codobj=codobj, libobj="Périmé"))
+                db.commit()
+        get_cache().clear()
+
+        assert client.get(f"/objets/{codobj}", headers=reader).json()["libobj"] == "Périmé"
+        assert get_cache().get(objet_cache_key(codobj)) is None  # Lu sur un réplica : pas mis en cache
+        batch = client.post("/objets/batch-get", json=[codobj], headers=reader).json()
+        assert batch["results"][str(codobj)]["libobj"] == "Périmé" and get_cache().get(objet_cache_key(codobj)) is None
+        assert client.get(f"/objets/{codobj}", headers=writer).json()["libobj"] == "Frais"  # Épinglé : base principale
+        # Lu sur la base principale : mis en cache, servi ensuite à tous les clients
+        assert client.get(f"/objets/{codobj}", headers=reader).json()["libobj"] == "Frais"
+    finally:
+        set_replica_router(None)
+        router.stop()
+        get_cache().clear()
@@ -0,0 +1,34 @@
+# Tests de la sérialisation rapide des listes (SERIALIZATION=fast) et des réponses réduites (fields=)
+import json
+from datetime import date
+from decimal import Decimal
+from src.schemas.objet import ObjetResponse
+from src.schemas.utilisateur import UtilisateurResponse
+from src.services.serialization import FastJSONResponse
+from src.services.sparse_fields import parse_fields, sparse_model
+
+
+# Test : les lignes encodées directement donnent le même JSON que le response_model
+def test_fast_response_matches_response_model():
+    row = {"nom_utilisateur": "Martin", "prenom_utilisateur": "Léa", "username": "lmartin", "date_insc_utilisateur": date(2024, 5, 17)}
+    response = FastJSONResponse([row], headers={"X-Next-Cursor": "42"})
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["x-next-cursor"] == "42"
+    assert json.loads(response.body) == [UtilisateurResponse(**row).model_dump(mode="json")]
+
+
+# Test : une ligne d'objet lue d'une colonne NUMERIC (Decimal) est encodée en nombre, comme par ObjetResponse
+def test_fast_response_encodes_decimal():
+    row = {"codobj": 1, "libobj": "Vase", "puobj": Decimal("12.5000"), "poidsobj": Decimal("0.7500"), "indispobj": 0}
+    body = json.loads(FastJSONResponse([row]).body)
+    assert body == [ObjetResponse(**row).model_dump(mode="json", include=set(row))]
+    assert body[0]["puobj"] == 12.5
+
+
+# Test : un modèle réduit est construit une seule fois par ensemble de champs, quel que soit l'ordre demandé
+def test_sparse_model_cached_per_field_set():
+    fields = parse_fields("puobj, codobj,libobj", ObjetResponse)
+    assert fields == ("codobj", "libobj", "puobj")
+    assert sparse_model(ObjetResponse, fields) is sparse_model(ObjetResponse, parse_fields("libobj,puobj,codobj", ObjetResponse))
+    assert set(sparse_model(ObjetResponse, fields).model_fields) == {"codobj", "libobj", "puobj"}
+    assert parse_fields(None, ObjetResponse) is None
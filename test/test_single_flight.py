@@ -0,0 +1,74 @@
+# Tests du regroupement des lectures identiques simultanées (single-flight)
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.services.single_flight import SingleFlight
+
+
+# Test : des threads qui demandent la même clé en même temps partagent une seule exécution
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b'[{"codobj": 1}]'
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flight.do, "objets:list", load)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "objets:list", load) for _ in range(3)]
+        while flight.coalesced < 3:  # Les trois requêtes attendent la lecture en cours
+            threading.Event().wait(0.001)
+        release.set()
+        results = [future.result(5) for future in [leader, *followers]]
+    assert results == [b'[{"codobj": 1}]'] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 3, "errors": 0, "in_flight": 0}
+    assert flight.do("objets:list", lambda: b"[]") == b"[]"  # Rien n'est conservé après la lecture
+
+
+# Test : en asynchrone, mêmes regroupements, et l'erreur de la lecture est transmise à toutes les requêtes
+def test_async_share_one_call_and_error():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("base indisponible")
+
+    async def run():
+        results = await asyncio.gather(*(flight.do_async(("objets", "get", 1), load) for _ in range(5)))
+        errors = await asyncio.gather(*(flight.do_async("k", failing) for _ in range(3)), return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(run())
+    assert results == ["ok"] * 5 and len(calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flight.stats()["errors"] == 1 and flight.stats()["coalesced"] == 6
+
+
+# Test : une requête en attente reprend la lecture si la requête qui l'exécutait est annulée
+def test_async_leader_cancelled():
+    flight = SingleFlight()
+
+    async def run():
+        leader = asyncio.create_task(flight.do_async("k", lambda: asyncio.sleep(1, "leader")))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do_async("k", lambda: asyncio.sleep(0, "follower")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "follower"
@@ -0,0 +1,48 @@
+# Tests du démarrage de l'application (fabrique, lifespan) et de la construction de l'index de recherche
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from src.main import create_app
+from src.services.search_index import SearchIndex, objet_search_index
+
+
+# Test : créer l'application n'envoie aucune requête à la base (ni schéma, ni index de recherche)
+def test_create_app_without_database(count_queries):
+    with count_queries() as queries:
+        app = create_app()
+    assert queries.count == 0
+    assert "/objets/search" in app.openapi()["paths"]
+
+
+# Test : importer src.main ne crée pas l'application ; elle l'est au premier accès à `src.main.app`
+def test_app_created_on_first_access():
+    probe = (
+        "import sys, src.main\n"
+        "assert 'src.router.objets_router' not in sys.modules\n"
+        "assert src.main.app is src.main.app\n"
+        "assert 'src.router.objets_router' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
+
+
+# Test : le lifespan construit l'index de recherche au démarrage
+def test_lifespan_builds_search_index():
+    objet_search_index.ready = False
+    with TestClient(create_app()) as client:
+        assert client.get("/objets/search", params={"q": "zz"}).status_code == 200
+    assert objet_search_index.ready
+
+
+# Test : une écriture reçue pendant une reconstruction n'est pas perdue
+def test_build_replays_concurrent_writes():
+    index = SearchIndex()
+
+    def rows():
+        yield 1, "Mug bleu"
+        index.add(2, "Tasse rouge")  # Écritures pendant la lecture de la table
+        index.remove(1)
+        yield 2, "Tasse"
+
+    index.build(rows())
+    assert index.search("tasse rouge", 10) == [2]
+    assert index.search("mug", 10) == []
@@ -2,6 +2,13 @@
 from fastapi.testclient import TestClient  # TestClient de FastAPI pour envoyer des requêtes HTTP à l'application
 from src.main import app  # Importation de l'application FastAPI depuis le fichier principal
 import pytest  # Importation de pytest pour la gestion des tests
+import json  # Décodage des lignes NDJSON
+import uuid  # Usernames uniques d'une exécution à l'autre
+from sqlalchemy import create_engine, select  # Identifiants des utilisateurs créés (non renvoyés par l'API)
+from sqlalchemy.orm import Session
+from src.database import engine, get_db
+from src.migrate import migrate
+from src.models import Utilisateur
 
 # Initialisation du client de test, qui permet d'effectuer des requêtes à l'application FastAPI dans un environnement de test
 client = TestClient(app)
@@ -17,6 +24,55 @@ def test_get_all_utilisateurs():
     # Vérification que la réponse est une liste (devrait l'être si la route retourne tous les utilisateurs)
     assert isinstance(response.json(), list), "Response should be a list of utilisateurs"
 
+# Test pour la pagination par curseur de la liste des utilisateurs
+def test_get_utilisateurs_pagination():
+    # Trois utilisateurs créés pour le test : les pages parcourues ne dépendent pas du contenu de la base
+    usernames = [f"page-{i}-{uuid.uuid4().hex[:8]}" for i in range(3)]
+    for username in usernames:
+        assert client.post("/utilisateurs/", json={"nom_utilisateur": "Page", "username": username}).status_code == 201
+    with Session(engine) as db:
+        first_id = db.execute(select(Utilisateur.code_utilisateur).where(Utilisateur.username == usernames[0])).scalar_one()
+
+    # Première page de deux utilisateurs, à partir du premier utilisateur créé
+    response = client.get("/utilisateurs", params={"limit": 2, "after": first_id - 1})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert [utilisateur["username"] for utilisateur in response.json()] == usernames[:2]
+
+    # Le curseur permet de récupérer la page suivante, qui ne répète pas la première
+    next_cursor = response.headers.get("X-Next-Cursor")
+    assert next_cursor is not None, "A full page should return a cursor"
+    next_page = client.get("/utilisateurs", params={"limit": 2, "after": next_cursor})
+    assert next_page.status_code == 200, f"Expected status code 200, got {next_page.status_code}"
+    assert next_page.json()[0]["username"] == usernames[2]
+
+# Test pour l'export en streaming (NDJSON) des utilisateurs
+def test_export_utilisateurs_ndjson():
+    response = client.get("/utilisateurs/export", params={"format": "ndjson", "batch_size": 10})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    # Chaque ligne non vide doit être un objet JSON contenant un username
+    lines = [line for line in response.text.splitlines() if line]
+    assert all("username" in json.loads(line) for line in lines), "Each line should be an utilisateur"
+
+# Test : l'export reçoit sa session par injection de dépendances (dependency_overrides respecté)
+def test_export_uses_injected_session(tmp_path):
+    empty = create_engine(f"sqlite:///{tmp_path}/empty.db")
+    migrate(empty)
+
+    def get_empty_db():
+        with Session(empty) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_empty_db
+    try:
+        response = client.get("/utilisateurs/export", params={"format": "json"})
+    finally:
+        del app.dependency_overrides[get_db]
+        empty.dispose()
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json() == [], "The export should read the overridden (empty) database"
+
 # Test pour récupérer un utilisateur par son ID
 def test_get_utilisateur_by_id():
     # Remplace "1" par un ID valide présent dans ta base de données pour ce test
@@ -79,6 +135,34 @@ def test_update_utilisateur():
     assert response_json["prenom_utilisateur"] == data["prenom_utilisateur"], "Updated 'prenom_utilisateur' should match the input"
     # assert response_json["couleur_fond_utilisateur"] == data["couleur_fond_utilisateur"], "Updated 'couleur_fond_utilisateur' should match the input"
 
+# Test de l'unicité du username (index unique) et de la recherche par username
+def test_username_unique_and_lookup(count_queries):
+    username = f"test-unique-{uuid.uuid4().hex[:8]}"
+    response = client.post("/utilisateurs/", json={"nom_utilisateur": "Doe", "username": username})
+    assert response.status_code == 201, f"Expected status code 201, got {response.status_code}"
+
+    # Le doublon est refusé par la base : une seule requête INSERT, sans SELECT préalable
+    with count_queries() as queries:
+        duplicate = client.post("/utilisateurs/", json={"nom_utilisateur": "Doe", "username": username})
+    assert duplicate.status_code == 400, f"Expected status code 400, got {duplicate.status_code}"
+    assert username in duplicate.json()["detail"]
+    assert [statement for statement in queries.statements if statement.lstrip().upper().startswith("SELECT")] == []
+
+    # Le doublon est aussi refusé lors d'une mise à jour complète (PUT) d'un autre utilisateur
+    assert client.post("/utilisateurs/", json={"nom_utilisateur": "Doe", "username": f"{username}-autre"}).status_code == 201
+    with Session(engine) as db:
+        other_id = db.execute(select(Utilisateur.code_utilisateur).where(Utilisateur.username == f"{username}-autre")).scalar_one()
+    duplicate = client.put(f"/utilisateurs/{other_id}", json={"nom_utilisateur": "Doe", "username": username})
+    assert duplicate.status_code == 400, f"Expected status code 400, got {duplicate.status_code}"
+    assert username in duplicate.json()["detail"]
+
+    # Recherche par username, avec le même ETag que la lecture par ID
+    found = client.get(f"/utilisateurs/by-username/{username}")
+    assert found.status_code == 200, f"Expected status code 200, got {found.status_code}"
+    assert found.json()["username"] == username
+    assert client.get(f"/utilisateurs/by-username/{username}", headers={"If-None-Match": found.headers["ETag"]}).status_code == 304
+    assert client.get(f"/utilisateurs/by-username/{username}-absent").status_code == 404
+
 # Test pour la suppression d'un utilisateur
 # def test_delete_utilisateur():
 #     utilisateur_id = 2  # Remplacer par un ID valide
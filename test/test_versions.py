@@ -0,0 +1,47 @@
+# Tests des ETags calculés à partir de la version des tables
+from src.services.versions import (
+    TableVersions,
+    bump_version,
+    conditional_headers,
+    entity_etag,
+    etag_matches,
+    is_not_modified,
+    set_versions,
+)
+
+
+# Test : l'ETag reste stable tant que la table n'est pas modifiée, puis change après une écriture
+def test_etag_changes_after_write():
+    set_versions(TableVersions())
+    headers = conditional_headers("objets", 1)
+    assert conditional_headers("objets", 1) == headers
+    assert is_not_modified({"if-none-match": headers["ETag"]}, headers)
+
+    bump_version("objets")
+    new_headers = conditional_headers("objets", 1)
+    assert new_headers["ETag"] != headers["ETag"]
+    assert not is_not_modified({"if-none-match": headers["ETag"]}, new_headers)
+
+
+# Test : If-Modified-Since n'est utilisé qu'en l'absence d'If-None-Match
+def test_if_modified_since():
+    set_versions(TableVersions())
+    headers = conditional_headers("utilisateurs", "list", "")
+    assert is_not_modified({"if-modified-since": headers["Last-Modified"]}, headers)
+    assert not is_not_modified({"if-none-match": '"other"', "if-modified-since": headers["Last-Modified"]}, headers)
+    assert not is_not_modified({"if-modified-since": "not a date"}, headers)
+    # Dates sans fuseau ("-0000" ou fuseau absent) : lues en UTC
+    assert is_not_modified({"if-modified-since": "Sun, 18 Oct 2099 10:00:00 -0000"}, headers)
+    assert is_not_modified({"if-modified-since": "Sun, 18 Oct 2099 10:00:00"}, headers)
+    assert not is_not_modified({"if-modified-since": "Mon, 01 Jan 1990 10:00:00 -0000"}, headers)
+
+
+# Test : l'ETag d'une entité dépend de son contenu et sert à la précondition If-Match
+def test_entity_etag_if_match():
+    etag = entity_etag('{"codobj":1,"points":0}')
+    assert entity_etag('{"codobj":1,"points":0}') == etag
+    assert entity_etag('{"codobj":1,"points":1}') != etag
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
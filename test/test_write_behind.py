@@ -0,0 +1,75 @@
+# Tests de l'écriture différée des compteurs des objets (POST /objets/{codobj}/increment)
+import pytest
+from fastapi.testclient import TestClient
+from src.database import engine
+from src.main import app
+from src.services.write_behind import BufferFull, WriteBehindBuffer, get_objet_counters
+
+client = TestClient(app)
+UNKNOWN_ID = 999999990  # Objets qui n'existent pas dans la base
+
+
+# Test : les incréments sont cumulés sans accès à la base, puis écrits en une seule requête
+def test_increments_coalesced_and_flushed(count_queries):
+    codobj = client.post("/objets/", json={"libobj": "Compteurs", "points": 10}).json()["codobj"]
+    counters = get_objet_counters()
+    counters.flush()  # Part d'un tampon vide
+
+    with count_queries() as queries:
+        for _ in range(5):
+            response = client.post(f"/objets/{codobj}/increment", json={"points": 2, "o_aff": 1})
+    assert response.status_code == 202
+    assert response.json() == {"codobj": codobj, "pending": {"points": 10, "o_imp": 0, "o_aff": 5}}
+    assert queries.count == 0, queries.statements
+    assert client.get(f"/objets/{codobj}").json()["points"] == 10  # Pas encore écrit
+
+    with count_queries() as queries:
+        assert counters.flush() == 1
+    assert len([s for s in queries.statements if s.startswith("UPDATE")]) == 1, queries.statements
+    objet = client.get(f"/objets/{codobj}").json()  # Cache invalidé par l'écriture
+    assert (objet["points"], objet["o_aff"]) == (20, 5)
+    stats = client.get("/write-behind/stats").json()
+    assert stats["depth"] == 0 and stats["flushes"] >= 1 and stats["flush_errors"] == 0
+
+
+class BrokenEngine:
+    def begin(self):
+        raise ConnectionError("base indisponible")
+
+
+# Test : une écriture en échec remet les incréments dans le tampon ; le tampon plein refuse les nouveaux objets
+def test_failed_flush_requeues_and_depth_limit():
+    buffer = WriteBehindBuffer(interval=60, max_pending=100, max_depth=2)
+    buffer.start(BrokenEngine())
+    try:
+        buffer.add(UNKNOWN_ID, {"points": 1})
+        buffer.add(UNKNOWN_ID + 1, {"points": 1})
+        with pytest.raises(BufferFull):
+            buffer.add(UNKNOWN_ID + 2, {"points": 1})
+        assert buffer.add(UNKNOWN_ID, {"points": 1})["points"] == 2  # Objet déjà en attente : toujours accepté
+        with pytest.raises(ConnectionError):
+            buffer.flush()
+        buffer.add(UNKNOWN_ID, {"o_imp": 1})
+        assert buffer.stats()["depth"] == 2 and buffer.flush_errors == 1 and buffer.rejected == 1
+        assert buffer._pending[UNKNOWN_ID] == {"points": 2, "o_imp": 1, "o_aff": 0}
+    finally:
+        buffer.engine = engine
+        buffer.stop()  # Écrit les incréments restants : objets inexistants, ignorés sans erreur
+    assert buffer.stats()["depth"] == 0
+
+
+# Test : écriture immédiate (interval = 0) en échec : l'incrément reste accepté, il n'est écrit qu'une fois
+def test_immediate_flush_failure_keeps_increment(monkeypatch):
+    codobj = client.post("/objets/", json={"libobj": "Compteurs immédiats", "points": 0}).json()["codobj"]
+    buffer = WriteBehindBuffer(interval=0, max_pending=100, max_depth=100)
+    buffer.start(BrokenEngine())
+    monkeypatch.setattr("src.router.objets_router.get_objet_counters", lambda: buffer)
+
+    response = client.post(f"/objets/{codobj}/increment", json={"points": 3})
+    assert response.status_code == 202 and response.json()["pending"]["points"] == 3  # Pas de 500 : pas de nouvel essai du client
+    assert buffer.flush_errors == 1 and buffer.stats()["depth"] == 1
+
+    buffer.engine = engine  # Base de nouveau disponible : l'incrément suivant écrit aussi le précédent
+    assert client.post(f"/objets/{codobj}/increment", json={"points": 1}).status_code == 202
+    assert buffer.stats()["depth"] == 0
+    assert client.get(f"/objets/{codobj}").json()["points"] == 4